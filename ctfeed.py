@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+from typing import Optional
 import logging
 import asyncio
 import glob
@@ -10,41 +11,100 @@ from discord.ext import commands
 
 from src.config import settings
 from src.database.database import init_db
+from src import crud
+from src.utils.event_catalog import event_catalog
+from src.utils.event_views import register_persistent_views
+from src.utils.guild_config import guild_configs
+from src.utils.leader import leader
+from src.utils.log_pipeline import setup_logging
+from src.utils.warm_state import load_warm_state, save_warm_state
 
-# logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
+# logging, written by a background thread
+setup_logging(
+    level=settings.LOG_LEVEL,
+    fmt=settings.LOG_FORMAT,
+    rate_limit=settings.LOG_RATE_LIMIT,
+    rate_window=settings.LOG_RATE_WINDOW,
+    queue_size=settings.LOG_QUEUE_SIZE,
 )
 logging.getLogger("discord.client").setLevel(logging.ERROR)
 logger = logging.getLogger(__name__)
 
 # bot
 intents = discord.Intents.default()
-intents.members = True
+intents.members = settings.MEMBER_CACHE != "lazy"
 intents.guilds = True
 intents.reactions = True
 intents.message_content = True
 
-bot = commands.Bot(intents=intents)
+# full mode chunks every guild on connect so the member cache is complete, lazy mode
+# skips chunking and keeps only the bot's own member, see src/utils/member_resolver.py
+options = {"intents": intents, "chunk_guilds_at_startup": settings.MEMBER_CACHE != "lazy"}
+if settings.MEMBER_CACHE == "lazy":
+    options["member_cache_flags"] = discord.MemberCacheFlags.none()
+if settings.SHARDED:
+    bot = commands.AutoShardedBot(shard_count=settings.SHARD_COUNT or None, **options)
+else:
+    bot = commands.Bot(**options)
 
 @bot.event
 async def on_ready():
-    logger.info(f"Bot logged in: {bot.user}")
+    logger.info(f"Bot logged in: {bot.user} ({len(bot.guilds)} guilds, {bot.shard_count or 1} shards)")
+
+
+async def load_catalog():
+    # persistent views, bound to the in-memory event catalog
+    event_catalog.load(await crud.read_all_event())
+    register_persistent_views(bot)
+
+
+async def init_database():
+    # initializing database, guild settings are small and needed by the first interaction
+    logger.info("Initializing database...")
+    await init_db()
+    guild_configs.load(await crud.read_all_guild_config())
+
+
+async def load_database():
+    await init_database()
+    await load_catalog()
+
+
+async def startup(warm:bool) -> Optional[asyncio.Task]:
+    """Everything before the gateway connects, returns the catalog load still running."""
+    if warm:
+        # the warm catalog serves interactions while the database copy loads behind the gateway,
+        # its views are registered while the login request is in flight
+        async def register_warm_views():
+            register_persistent_views(bot)
+        await asyncio.gather(bot.login(settings.DISCORD_BOT_TOKEN), init_database(), register_warm_views())
+        return asyncio.create_task(load_catalog())
+    
+    # database setup overlaps the gateway login
+    await asyncio.gather(load_database(), bot.login(settings.DISCORD_BOT_TOKEN))
+    return None
 
 
 async def main():
     # setup
     
-    # initializing database    
-    logger.info("Initializing database...")
-    await init_db()
+    # event catalog and caches saved by the last run
+    warm = load_warm_state()
     
     # start
     logger.info(f"Starting CTF Bot...")
     async with bot:
-        await bot.start(settings.DISCORD_BOT_TOKEN)
+        catalog_load = None
+        try:
+            catalog_load = await startup(warm)
+            # decides which replica polls, before the jobs start on ready
+            await leader.start()
+            await bot.connect()
+        finally:
+            await leader.stop()
+            await save_warm_state()
+            if not (catalog_load is None):
+                catalog_load.cancel()
 
 
 # cogs
@@ -0,0 +1,36 @@
+import logging
+
+from discord.ext import commands
+
+from src.config import settings
+from src.utils.http_server import http_server
+from src.utils.ical import handle_calendar
+from src.utils.metrics import handle_metrics
+
+# logging
+logger = logging.getLogger(__name__)
+
+# cog
+class HttpBGTask(commands.Cog):
+    def __init__(self, bot:commands.Bot):
+        self.bot:commands.Bot = bot
+        http_server.add_route(settings.CALENDAR_PATH, handle_calendar)
+        http_server.add_route(settings.METRICS_PATH, handle_metrics)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        if settings.HTTP_PORT > 0 and not http_server.running:
+            try:
+                await http_server.start(settings.HTTP_HOST, settings.HTTP_PORT)
+            except Exception as e:
+                logger.error("Failed to start HTTP server: %s", e)
+
+
+    def cog_unload(self):
+        http_server.remove_route(settings.CALENDAR_PATH)
+        http_server.remove_route(settings.METRICS_PATH)
+        self.bot.loop.create_task(http_server.stop())
+
+
+def setup(bot:commands.Bot):
+    bot.add_cog(HttpBGTask(bot))
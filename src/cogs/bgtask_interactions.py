@@ -1,141 +1,166 @@
-from typing import List, Dict, Any
-from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List, Optional, Tuple
+import asyncio
 import logging
+import time
 
 import discord
 from discord.ext import commands, tasks
 
 from src.config import settings
-from src.database.database import get_db
+from src import crud
 from src.database.model import Event
-from src.utils.ctf_api import fetch_ctf_events
 from src.utils.embed_creator import create_event_embed
-from src.utils.join_channel import join_request, join_channel, set_private
-from src.utils.join_channel import get_info_channel_for_category
-from src.utils.get_channel import get_announcement_channel
-import src.crud.event as crud_event
-import src.crud.custom_event as crud_custom_event
+from src.utils.join_channel import join_request, join_channel, set_private, resolve_join_context
+from src.utils.join_channel import get_info_channel_for_category, forget_guild_roles
+from src.utils.get_channel import get_announcement_channels, forget_guild
+from src.utils.workspace import workspace_pool
+from src.utils.reconcile import reconcile_events
+from src.utils.event_catalog import event_catalog
+from src.utils.guild_config import guild_configs, GuildSettings
+from src.utils.event_views import EventAnnouncementView, EventInfoView, register_persistent_views
+from src.utils.interaction_router import interaction_router, JoinButtonId, AnnouncePrivacyButtonId, InfoPrivacyButtonId
+from src.utils.interaction_router import ApproveJoinId, RejectJoinId
+from src.utils.leader import leader
+from src.utils.member_resolver import member_resolver
+from src.utils.metrics import CHECK_DURATION, CHECK_CHANGES, DISCORD_SEND_FAILURES, observe_ack
 
 # logging
 logger = logging.getLogger(__name__)
 
+# announcement sends in flight at once, py-cord queues the rest behind Discord's rate limits
+ANNOUNCE_CONCURRENCY = 10
+
+# renders an announcement for a guild's timezone
+EmbedRenderer = Callable[[str], Awaitable[discord.Embed]]
+
+
+def _event_embed(event_api:dict, title:str) -> EmbedRenderer:
+    async def embed_for(timezone:str) -> discord.Embed:
+        return await create_event_embed(event_api, title, timezone)
+    return embed_for
+
+
+def _fixed_embed(embed:discord.Embed) -> EmbedRenderer:
+    async def embed_for(timezone:str) -> discord.Embed:
+        return embed
+    return embed_for
+
 # cog
 class CTFBGTask(commands.Cog):
     def __init__(self, bot:commands.Bot):
         self.bot:commands.Bot = bot
         
+        interaction_router.add(JoinButtonId, self.on_join_button)
+        interaction_router.add(AnnouncePrivacyButtonId, self.on_announce_privacy_button)
+        interaction_router.add(InfoPrivacyButtonId, self.on_info_privacy_button)
+        interaction_router.add(ApproveJoinId, self.on_approve_join_button)
+        interaction_router.add(RejectJoinId, self.on_reject_join_button)
+        leader.add_listener(self.on_leadership_change)
+        
     @commands.Cog.listener()
     async def on_ready(self):
         # start background task
-        self.task_checks.start()
+        if not self.task_checks.is_running():
+            self.task_checks.start()
+
+    def on_leadership_change(self, is_leader:bool):
+        # a new leader polls right away instead of waiting out the follower interval
+        if is_leader and self.task_checks.is_running():
+            self.task_checks.restart()
         
     # background task
     @tasks.loop(minutes=settings.CHECK_INTERVAL_MINUTES)
     async def task_checks(self):
-        # get channel
-        channel:discord.TextChannel = await get_announcement_channel(self.bot)
+        if not leader.is_leader:
+            await self._refresh_catalog()
+            return
+        start = time.perf_counter()
+        try:
+            await self._check_events()
+        finally:
+            CHECK_DURATION.observe(time.perf_counter() - start)
+
+    async def _refresh_catalog(self):
+        # followers serve interactions from the catalog, the leader's writes reach them through the database
+        guild_configs.load(await crud.read_all_guild_config())
+        event_catalog.load(await crud.read_all_event())
+        register_persistent_views(self.bot)
+
+    async def _check_events(self):
+        # /ctf_config may have been used on another replica
+        guild_configs.load(await crud.read_all_guild_config())
+        result = await reconcile_events()
+        for change, events in (("new", result.new), ("restored", result.restored), ("updated", result.updated), ("removed", result.removed)):
+            if len(events) > 0:
+                CHECK_CHANGES.labels(change).inc(len(events))
         
-        # 1. get new events
-        async with get_db() as session:
-            all_events = await fetch_ctf_events()
-            
-            known_events = await crud_event.read_event(session)
-            known_events_id = [ event.event_id for event in known_events ]
+        # announcement channel of every guild, with its settings
+        targets = await get_announcement_channels(self.bot)
         
-            new_events_db:List[Event] = [] # new events data for database
-            new_events_ctftime:List[Dict[str, Any]] = [] # new events data from CTFTime
-            for event in all_events:
-                event_id = event["id"]
-                if event_id not in known_events_id: # new event
-                    new_events_db.append(Event(
-                        event_id=event_id,
-                        title=event["title"],
-                        start=datetime.fromisoformat(event["start"]).timestamp(),
-                        finish=datetime.fromisoformat(event["finish"]).timestamp(),
-                    ))
-                    
-                    new_events_ctftime.append(event)
-                    
-            if len(new_events_db) > 0:
-                await crud_event.create_events(session, new_events_db)
-            
-            for event in new_events_ctftime:
-                embed = await create_event_embed(event, "有新的 CTF 競賽！")
-
-                view = discord.ui.View(timeout=None)
-                view.add_item(
-                    discord.ui.Button(
-                        label='Join',
-                        style=discord.ButtonStyle.blurple,
-                        custom_id=f"ctf_join_channel:event:event:{event['id']}",
-                        emoji=settings.EMOJI,
-                    )
-                )
-                view.add_item(
-                    discord.ui.Button(
-                        label='Set Private',
-                        style=discord.ButtonStyle.gray,
-                        custom_id=f"ctf_join_channel:private:event:{event['id']}",
-                        )
-                )
-                try:
-                    await channel.send(embed=embed, view=view)
-                    logger.info(f"Sent new event notification: {event['title']}")
-                except Exception as e:
-                    logger.error(f"Failed to send notification: {e}")
-            
-        # 2. detect updates
-        # - event updates
-        # - event removed
-        # - custom channel removed
-        known_events.extend(new_events_db)
-        async with get_db() as session:
-            # check events
-            for event in known_events:
-                events_api = await fetch_ctf_events(event.event_id)
-                if len(events_api) != 1:
-                    # event removed
-                    logger.info(f"Detected: {event.title} (event_id={event.event_id}) was removed")
-                    
-                    await crud_event.delete_event(session, event_id=[event.event_id])
-                    
-                    embed = discord.Embed(
-                        color=discord.Color.red(),
-                        title=f"{event.title} was removed",
-                        footer=discord.EmbedFooter(text=f"Event ID: {event.event_id} | CTFtime.org")
-                    )
-                    # send notification to announcement channel
-                    await channel.send(embed=embed)
-                    # send notification to event info channel if category exists
-                    if event.category_id:
-                        info_ch = await get_info_channel_for_category(self.bot, event.category_id)
-                        if info_ch:
-                            await info_ch.send(embed=embed)
-                else: 
-                    # check update
-                    event_api = events_api[0]
-                    ntitle = event_api["title"]
-                    nstart = datetime.fromisoformat(event_api["start"]).timestamp()
-                    nfinish = datetime.fromisoformat(event_api["finish"]).timestamp()
-                    
-                    if event.title != ntitle or \
-                        event.start != nstart or event.finish != nfinish:
-                        # update detected
-                        logger.info(f"Detected: {ntitle} (old: {event.title}) (event_id={event.event_id}) was updated")
-                        
-                        await crud_event.update_event(session, event_id=event.event_id,
-                                          title=ntitle,
-                                          start=nstart,
-                                          finish=nfinish)
-                        
-                        embed = await create_event_embed(event_api, title="Update detected")
-                        # send notification to announcement channel
-                        await channel.send(embed=embed)
-                        # send notification to event info channel if category exists
-                        if event.category_id:
-                            info_ch = await get_info_channel_for_category(self.bot, event.category_id)
-                            if info_ch:
-                                await info_ch.send(embed=embed)
+        for event, event_api in result.restored:
+            embed_for = _event_embed(event_api, "Event restored")
+            await self._announce(targets, "restored", embed_for, view=lambda config, event=event: EventAnnouncementView("event", event.event_id, bool(event.is_private), config.emoji))
+            await self._send_to_info_channel(event, embed_for)
+        
+        for event in result.new:
+            embed_for = _event_embed(event, "有新的 CTF 競賽！")
+
+            if await self._announce(targets, "new", embed_for, view=lambda config, event=event: EventAnnouncementView("event", event["id"], emoji=config.emoji)):
+                logger.info("Sent new event notification: %s", event['title'])
+        
+        for event in result.removed:
+            embed_for = _fixed_embed(discord.Embed(
+                color=discord.Color.red(),
+                title=f"{event.title} was removed",
+                footer=discord.EmbedFooter(text=f"Event ID: {event.event_id} | CTFtime.org")
+            ))
+            # send notification to announcement channels
+            await self._announce(targets, "removed", embed_for)
+            # send notification to event info channel if category exists
+            await self._send_to_info_channel(event, embed_for)
+        
+        for event, event_api in result.updated:
+            embed_for = _event_embed(event_api, "Update detected")
+            # send notification to announcement channels
+            await self._announce(targets, "updated", embed_for)
+            # send notification to event info channel if category exists
+            await self._send_to_info_channel(event, embed_for)
+    
+    async def _announce(
+        self,
+        targets:List[Tuple[discord.TextChannel, GuildSettings]],
+        kind:str,
+        embed_for:EmbedRenderer,
+        view:Optional[Callable[[GuildSettings], discord.ui.View]]=None,
+    ) -> int:
+        """Send to every guild's announcement channel concurrently, returns how many sends succeeded."""
+        # rendered once per timezone, not once per guild
+        embeds = {timezone: await embed_for(timezone) for timezone in {config.timezone for _, config in targets}}
+        semaphore = asyncio.Semaphore(ANNOUNCE_CONCURRENCY)
+
+        async def send_guild(channel:discord.TextChannel, config:GuildSettings) -> bool:
+            async with semaphore:
+                # a view is bound to the message it is sent with
+                extra = {"view": view(config)} if view else {}
+                return await self._send(channel, kind, embed=embeds[config.timezone], **extra)
+        return sum(await asyncio.gather(*(send_guild(channel, config) for channel, config in targets)))
+
+    async def _send(self, channel:discord.abc.Messageable, kind:str, **kwargs) -> bool:
+        # one failed notification should not drop the rest of the check
+        try:
+            await channel.send(**kwargs)
+            return True
+        except Exception as e:
+            DISCORD_SEND_FAILURES.labels(kind).inc()
+            logger.error("Failed to send %s notification: %s", kind, e)
+            return False
+
+    async def _send_to_info_channel(self, event:Event, embed_for:EmbedRenderer):
+        if event.category_id:
+            info_ch = await get_info_channel_for_category(self.bot, event.category_id)
+            if info_ch:
+                embed = await embed_for(guild_configs.get(info_ch.guild.id).timezone)
+                await self._send(info_ch, "info", embed=embed)
                     
     @task_checks.before_loop
     async def before_task_checks(self):
@@ -144,143 +169,81 @@ class CTFBGTask(commands.Cog):
 
     def cog_unload(self):
         self.task_checks.cancel()
+        leader.remove_listener(self.on_leadership_change)
+        for codec in (JoinButtonId, AnnouncePrivacyButtonId, InfoPrivacyButtonId, ApproveJoinId, RejectJoinId):
+            interaction_router.remove(codec)
     
 
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild:discord.Guild):
+        # caches are partitioned by guild, drop what belonged to a guild the bot left
+        forget_guild(guild.id)
+        forget_guild_roles(guild.id)
+        workspace_pool.forget(guild.id)
+        member_resolver.forget(guild.id)
+
     # interaction handler
     @commands.Cog.listener()
     async def on_interaction(self, interaction:discord.Interaction):
         if interaction.type != discord.InteractionType.component:
             return
         
-        custom_id = interaction.data.get("custom_id")
-        if custom_id is None:
+        # already dispatched to a registered view
+        if interaction.view is not None:
             return
         
-        if custom_id.startswith("ctf_join_channel:event:"):
-            try:
-                _ = custom_id.split(":")
-                event_type = str(_[2])
-                event_id:int = int(_[3])
-            except:
-                await interaction.response.send_message("Invalid arguments", ephemeral=True)
-                return
-            
-            await join_request(self.bot, interaction, f"{event_type}:{event_id}")
-
-        if custom_id.startswith("ctf_join_channel:private:"):
-            try:
-                _ = custom_id.split(":")
-                event_type = str(_[2])
-                event_id:int = int(_[3])
-            except:
-                await interaction.response.send_message("Invalid arguments", ephemeral=True)
-                return
-            
-            if not await set_private(self.bot, interaction, f"{event_type}:{event_id}"):
-                return
-
-            async with get_db() as session:
-                events = []
-                if event_type == "event":
-                    events = await crud_event.read_event(session, event_id=[event_id])
-                elif event_type == "custom":
-                    events = await crud_custom_event.read_event(session, event_id=[event_id])
-                if len(events) != 1:
-                    await interaction.followup.send(content="Invalid event", ephemeral=True)
-                    return
-                event = events[0]
-
-                view = discord.ui.View(timeout=None)
-                view.add_item(
-                    discord.ui.Button(
-                        label='Join',
-                        style=discord.ButtonStyle.blurple,
-                        custom_id=f"ctf_join_channel:event:{event_type}:{event_id}",
-                        emoji=settings.EMOJI,
-                    )
-                )
-                view.add_item(
-                    discord.ui.Button(
-                        label=f'Set {"Public" if event.is_private else "Private"}',
-                        style=discord.ButtonStyle.gray,
-                        custom_id=f"ctf_join_channel:private:{event_type}:{event_id}",
-                        )
-                )
-                await interaction.response.edit_message(view=view)
-    
-        if custom_id.startswith("ctf_info:private:"):
-            try:
-                _ = custom_id.split(":")
-                event_type = str(_[2])
-                event_id:int = int(_[3])
-            except:
-                await interaction.response.send_message("Invalid arguments", ephemeral=True)
-                return
-            
-            if not await set_private(self.bot, interaction, f"{event_type}:{event_id}"):
-                return
-
-            async with get_db() as session:
-                events = []
-                if event_type == "event":
-                    events = await crud_event.read_event(session, event_id=[event_id])
-                elif event_type == "custom":
-                    events = await crud_custom_event.read_event(session, event_id=[event_id])
-                if len(events) != 1:
-                    await interaction.followup.send(content="Invalid event", ephemeral=True)
-                    return
-                event = events[0]
-
-                view = discord.ui.View(timeout=None)
-                view.add_item(
-                    discord.ui.Button(
-                        label=f'Set {"Public" if event.is_private else "Private"}',
-                        style=discord.ButtonStyle.gray,
-                        custom_id=f"ctf_info:private:{event_type}:{event_id}",
-                        )
-                )
-                await interaction.response.edit_message(view=view)
-
-        # Admin approval handlers
-        if custom_id.startswith("ctf_admin_approve:join:"):
-            try: # custom_id=f"ctf_admin_approve:join:{event_type}:{event_id}:{guild_id}:{user_id}",
-                _ = custom_id.split(":")
-                event_type = _[2]  # event/custom
-                event_id = int(_[3])
-                guild_id = int(_[4])
-                user_id = int(_[5])
-            except Exception:
-                await interaction.response.send_message("Invalid arguments", ephemeral=True)
-                return
-
-            # Only admins can approve
-            try:
-                if not getattr(interaction.user, "guild_permissions", None) or not interaction.user.guild_permissions.administrator:
-                    await interaction.response.send_message(content="你沒有權限使用此功能（需要 Administrator）", ephemeral=True)
-                    return
-            except Exception:
-                await interaction.response.send_message(content="權限檢查失敗，請於伺服器中使用此功能", ephemeral=True)
-                return
-
-            await join_channel(self.bot, interaction, f"{event_type}:{event_id}", guild_id, user_id, True)
-
-        if custom_id.startswith("ctf_admin_reject:join:"):
-            # Only admins can reject
-            try:
-                if not getattr(interaction.user, "guild_permissions", None) or not interaction.user.guild_permissions.administrator:
-                    await interaction.response.send_message(content="你沒有權限使用此功能（需要 Administrator）", ephemeral=True)
-                    return
-            except Exception:
-                await interaction.response.send_message(content="權限檢查失敗，請於伺服器中使用此功能", ephemeral=True)
-                return
-
-            try:
-                await interaction.response.edit_message(content="Rejected by admin", view=None)
-            except Exception:
-                await interaction.followup.send(content="Rejected by admin")
+        # buttons of events missing from the catalog and approval requests sent before a restart
+        await interaction_router.dispatch(interaction)
+
+    async def on_join_button(self, interaction:discord.Interaction, custom_id:JoinButtonId):
+        await join_request(self.bot, interaction, custom_id.event_data)
+
+    async def on_announce_privacy_button(self, interaction:discord.Interaction, custom_id:AnnouncePrivacyButtonId):
+        entry = await set_private(self.bot, interaction, custom_id.event_data)
+        if entry is None:
             return
-    
-        return
+
+        view = EventAnnouncementView(entry.event_type, entry.event_id, entry.is_private, guild_configs.get(interaction.guild_id).emoji)
+        await interaction.edit_original_response(view=view)
+
+    async def on_info_privacy_button(self, interaction:discord.Interaction, custom_id:InfoPrivacyButtonId):
+        entry = await set_private(self.bot, interaction, custom_id.event_data)
+        if entry is None:
+            return
+
+        view = EventInfoView(entry.event_type, entry.event_id, entry.is_private)
+        await interaction.edit_original_response(view=view)
+
+    async def _check_admin(self, interaction:discord.Interaction) -> bool:
+        try:
+            if not getattr(interaction.user, "guild_permissions", None) or not interaction.user.guild_permissions.administrator:
+                await interaction.response.send_message(content="你沒有權限使用此功能（需要 Administrator）", ephemeral=True)
+                return False
+        except Exception:
+            await interaction.response.send_message(content="權限檢查失敗，請於伺服器中使用此功能", ephemeral=True)
+            return False
+        return True
+
+    # Admin approval handlers
+    async def on_approve_join_button(self, interaction:discord.Interaction, custom_id:ApproveJoinId):
+        # Only admins can approve
+        if not await self._check_admin(interaction):
+            return
+
+        await interaction.response.defer()
+        observe_ack(interaction, "approve")
+        ctx = await resolve_join_context(self.bot, custom_id.event_data, custom_id.guild_id, custom_id.user_id)
+        await join_channel(self.bot, interaction, ctx, True)
+
+    async def on_reject_join_button(self, interaction:discord.Interaction, custom_id:RejectJoinId):
+        # Only admins can reject
+        if not await self._check_admin(interaction):
+            return
+
+        try:
+            await interaction.response.edit_message(content="Rejected by admin", view=None)
+        except Exception:
+            await interaction.followup.send(content="Rejected by admin")
     
 
 def setup(bot:commands.Bot):
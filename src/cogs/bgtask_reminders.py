@@ -0,0 +1,72 @@
+from typing import Optional
+import logging
+
+import discord
+from discord.ext import commands
+
+from src.config import settings
+from src.utils.leader import leader
+from src.utils.event_catalog import event_catalog, CatalogEntry
+from src.utils.join_channel import get_info_channel_for_category
+from src.utils.reminder import reminder_scheduler, REMIND_START
+
+# logging
+logger = logging.getLogger(__name__)
+
+# cog
+class ReminderBGTask(commands.Cog):
+    def __init__(self, bot:commands.Bot):
+        self.bot:commands.Bot = bot
+        # catalog writes (crud write-through) keep the schedule current
+        event_catalog.add_listener(self.on_catalog_change)
+        for entry in event_catalog.all():
+            reminder_scheduler.sync(entry, settings.NOTIFY_BEFORE_EVENT)
+
+    def on_catalog_change(self, event_type:str, event_id:int, entry:Optional[CatalogEntry]):
+        if event_type != "event":
+            return
+        if entry is None:
+            reminder_scheduler.cancel(event_id)
+        else:
+            reminder_scheduler.sync(entry, settings.NOTIFY_BEFORE_EVENT)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        reminder_scheduler.start(self.send_reminder)
+        logger.info("Reminder scheduler started with %d reminders", len(reminder_scheduler))
+
+    async def send_reminder(self, event_id:int, kind:str):
+        # every replica keeps the schedule, only the leader posts
+        if not leader.is_leader:
+            return
+        entry = event_catalog.get("event", event_id)
+        if entry is None or entry.category_id is None:
+            return
+        info_ch = await get_info_channel_for_category(self.bot, entry.category_id)
+        if info_ch is None:
+            return
+
+        if kind == REMIND_START:
+            embed = discord.Embed(
+                color=discord.Color.blue(),
+                title=f"{entry.title} starts soon",
+                description=f"Starts <t:{int(entry.start)}:R> (<t:{int(entry.start)}:f>)",
+                footer=discord.EmbedFooter(text=f"Event ID: {entry.event_id} | CTFtime.org")
+            )
+        else:
+            embed = discord.Embed(
+                color=discord.Color.dark_gray(),
+                title=f"{entry.title} has ended",
+                footer=discord.EmbedFooter(text=f"Event ID: {entry.event_id} | CTFtime.org")
+            )
+        await info_ch.send(embed=embed)
+        logger.info("Sent %s reminder for %s (event_id=%s)", kind, entry.title, entry.event_id)
+
+
+    def cog_unload(self):
+        event_catalog.remove_listener(self.on_catalog_change)
+        reminder_scheduler.stop()
+
+
+def setup(bot:commands.Bot):
+    bot.add_cog(ReminderBGTask(bot))
@@ -0,0 +1,42 @@
+from datetime import datetime
+import logging
+
+from discord.ext import commands, tasks
+
+from src.config import settings
+from src.utils.leader import leader
+from src.utils.teams import refresh_stale_teams
+
+# logging
+logger = logging.getLogger(__name__)
+
+# cog
+class TeamBGTask(commands.Cog):
+    def __init__(self, bot:commands.Bot):
+        self.bot:commands.Bot = bot
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # start background task
+        if not self.task_refresh_teams.is_running():
+            self.task_refresh_teams.start()
+
+    # background task
+    @tasks.loop(hours=1)
+    async def task_refresh_teams(self):
+        if not leader.is_leader:
+            return
+        stale_before = int(datetime.now().timestamp()) - settings.TEAM_STALE_HOURS * 60 * 60
+        await refresh_stale_teams(stale_before, settings.TEAM_REFRESH_BATCH)
+
+    @task_refresh_teams.before_loop
+    async def before_task_refresh_teams(self):
+        await self.bot.wait_until_ready()
+
+
+    def cog_unload(self):
+        self.task_refresh_teams.cancel()
+
+
+def setup(bot:commands.Bot):
+    bot.add_cog(TeamBGTask(bot))
@@ -0,0 +1,37 @@
+import logging
+
+from discord.ext import commands, tasks
+
+from src.config import settings
+from src.utils.warm_state import save_warm_state
+
+# logging
+logger = logging.getLogger(__name__)
+
+# cog
+class WarmStateBGTask(commands.Cog):
+    def __init__(self, bot:commands.Bot):
+        self.bot:commands.Bot = bot
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # start background task
+        if settings.WARM_STATE_PATH and not self.task_save_warm_state.is_running():
+            self.task_save_warm_state.start()
+
+    # background task
+    @tasks.loop(minutes=settings.WARM_STATE_SAVE_MINUTES)
+    async def task_save_warm_state(self):
+        await save_warm_state()
+
+    @task_save_warm_state.before_loop
+    async def before_task_save_warm_state(self):
+        await self.bot.wait_until_ready()
+
+
+    def cog_unload(self):
+        self.task_save_warm_state.cancel()
+
+
+def setup(bot:commands.Bot):
+    bot.add_cog(WarmStateBGTask(bot))
@@ -0,0 +1,44 @@
+import logging
+
+from discord.ext import commands, tasks
+
+from src.config import settings
+from src.utils.leader import leader
+from src.utils.get_channel import get_announcement_channels
+from src.utils.workspace import workspace_pool
+
+# logging
+logger = logging.getLogger(__name__)
+
+# cog
+class WorkspacePoolBGTask(commands.Cog):
+    def __init__(self, bot:commands.Bot):
+        self.bot:commands.Bot = bot
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # start background task
+        if workspace_pool.enabled and not self.task_replenish.is_running():
+            self.task_replenish.start()
+
+    # background task
+    @tasks.loop(minutes=settings.WORKSPACE_POOL_REFILL_MINUTES)
+    async def task_replenish(self):
+        # pool channels are created by one replica only
+        if not leader.is_leader:
+            return
+        # every guild that gets announcements gets its own pool
+        for channel, _ in await get_announcement_channels(self.bot):
+            await workspace_pool.replenish(channel.guild)
+
+    @task_replenish.before_loop
+    async def before_task_replenish(self):
+        await self.bot.wait_until_ready()
+
+
+    def cog_unload(self):
+        self.task_replenish.cancel()
+
+
+def setup(bot:commands.Bot):
+    bot.add_cog(WorkspacePoolBGTask(bot))
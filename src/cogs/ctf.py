@@ -1,6 +1,8 @@
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 from zoneinfo import ZoneInfo
+import io
+import json
 import logging
 
 import discord
@@ -12,35 +14,76 @@ from src.database.model import BaseEvent, Event
 from src import crud
 import src.crud.event as crud_event
 import src.crud.custom_event as crud_custom_event
+import src.crud.event_change as crud_event_change
 from src.utils.join_channel import join_request
 from src.utils.join_channel import create_custom_channel
+from src.utils.event_pager import EventPager
+from src.utils.guild_config import guild_configs, GuildSettings
+from src.utils.ical import ical_feed
 
 # logging
 logger = logging.getLogger(__name__)
 
 async def event_join_autocomplete(ctx: discord.AutocompleteContext) -> List[str]:
-    events:List[BaseEvent] = await crud.read_all_event()
-    result = []
-    for e in events:
-        if ctx.value.lower() in e.title.lower():
-            result.append(e.title)
-    return result[:25]
+    events, _ = await crud.read_event_page(limit=25, title_contains=ctx.value or None)
+    return [e.title for e in events]
+
+
+def create_menu_embed(pager:EventPager, config:GuildSettings) -> discord.Embed:
+    embed = discord.Embed(
+        title=f"{config.emoji} CTF events tracked",
+        color=discord.Color.green()
+    )
+    for event in pager.events:
+        embed.add_field(
+            name=f"[event id={event.event_id}] {event.title}",
+            value=f"start at {datetime.fromtimestamp(event.start).astimezone(ZoneInfo(config.timezone))}\n\
+            finish at {datetime.fromtimestamp(event.finish).astimezone(ZoneInfo(config.timezone))}" if isinstance(event, Event) else "",
+            inline=False
+        )
+    footer = f"Page {pager.page}"
+    if pager.title_contains:
+        footer += f" | filter: {pager.title_contains}"
+    embed.set_footer(text=footer)
+    return embed
 
 # ui - ctf menu
 class CTFMenuView(discord.ui.View):
-    def __init__(self, bot:commands.Bot):
+    def __init__(self, bot:commands.Bot, pager:Optional[EventPager]=None):
         super().__init__(timeout=None)
         
         self.bot = bot
+        self.pager = pager or EventPager(page_size=10)
+        self._update_buttons()
+
+    def _update_buttons(self):
+        self.ctf_menu_prev_callback.disabled = not self.pager.has_prev
+        self.ctf_menu_next_callback.disabled = not self.pager.has_next
+
+    async def _show_page(self, interaction:discord.Interaction):
+        self._update_buttons()
+        await interaction.response.edit_message(embed=create_menu_embed(self.pager, guild_configs.get(interaction.guild_id)), view=self)
+
+    # no fixed custom_id: each menu pages its own pager, a shared id would route clicks to the latest menu
+    @discord.ui.button(label="Prev", style=discord.ButtonStyle.gray, emoji="◀️", row=1)
+    async def ctf_menu_prev_callback(self, button:discord.ui.Button, interaction:discord.Interaction):
+        await self.pager.prev()
+        await self._show_page(interaction)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.gray, emoji="▶️", row=1)
+    async def ctf_menu_next_callback(self, button:discord.ui.Button, interaction:discord.Interaction):
+        await self.pager.next()
+        await self._show_page(interaction)
 
     @discord.ui.button(label="Join a channel", custom_id="ctf_select_channel", style=discord.ButtonStyle.blurple, emoji=settings.EMOJI)
     async def ctf_select_channel_callback(self, button:discord.ui.Button, interaction:discord.Interaction):
-        known_events:List[BaseEvent] = await crud.read_all_event()
-        if len(known_events) == 0:
+        pager = EventPager()
+        await pager.load()
+        if len(pager.events) == 0:
             await interaction.response.send_message(content="目前沒有可加入的活動或自訂類別", ephemeral=True)
             return
-        view = JoinSelectPrompt(self.bot, known_events)
-        await interaction.response.send_message(content="請選擇要加入的項目", view=view, ephemeral=True)
+        view = PagedSelectPrompt(self.bot, pager, JoinSelect, "請選擇要加入的項目")
+        await interaction.response.send_message(content=view.content, view=view, ephemeral=True)
 
     @discord.ui.button(label="Remove from database", custom_id="ctf_remove_db", style=discord.ButtonStyle.red, emoji="🗑️")
     async def ctf_remove_db_callback(self, button:discord.ui.Button, interaction:discord.Interaction):
@@ -53,13 +96,14 @@ class CTFMenuView(discord.ui.View):
             await interaction.response.send_message(content="權限檢查失敗，請於伺服器中使用此功能", ephemeral=True)
             return
 
-        known_events:List[BaseEvent] = await crud.read_all_event(filter=True)
+        pager = EventPager(with_category=True)
+        await pager.load()
 
-        if len(known_events) == 0:
+        if len(pager.events) == 0:
             await interaction.response.send_message(content="目前沒有可移除的活動或自訂類別", ephemeral=True)
             return
-        view = RemoveSelectPrompt(self.bot, known_events)
-        await interaction.response.send_message(content="請選擇要移除的資料", view=view, ephemeral=True)
+        view = PagedSelectPrompt(self.bot, pager, RemoveSelect, "請選擇要移除的資料")
+        await interaction.response.send_message(content=view.content, view=view, ephemeral=True)
 
 
     @discord.ui.button(label="Create CTF", custom_id="ctf_create_custom", style=discord.ButtonStyle.green, emoji="🆕")
@@ -87,32 +131,87 @@ class CreateCTFModal(discord.ui.Modal):
         return
 
 # ---- Select-based prompts (dropdowns) ----
-class JoinSelectPrompt(discord.ui.View):
-    def __init__(self, bot:commands.Bot, known_events:List[BaseEvent]):
+class PagedSelectPrompt(discord.ui.View):
+    """A select over one page of events with prev/next/filter controls."""
+
+    def __init__(self, bot:commands.Bot, pager:EventPager, select_cls:type, prompt:str):
         super().__init__(timeout=180)
-        self.add_item(JoinSelect(bot, known_events))
+        self.bot = bot
+        self.pager = pager
+        self.select_cls = select_cls
+        self.prompt = prompt
+        self._render()
+
+    @property
+    def content(self) -> str:
+        content = f"{self.prompt} (第 {self.pager.page} 頁)"
+        if self.pager.title_contains:
+            content += f"，篩選：{self.pager.title_contains}"
+        if len(self.pager.events) == 0:
+            content += "\n沒有符合的項目"
+        return content
+
+    def _render(self):
+        self.clear_items()
+        if len(self.pager.events) > 0:
+            self.add_item(self.select_cls(self.bot, self.pager.events))
+
+        prev_button = discord.ui.Button(label="Prev", emoji="◀️", style=discord.ButtonStyle.gray, disabled=not self.pager.has_prev, row=1)
+        prev_button.callback = self._on_prev
+        next_button = discord.ui.Button(label="Next", emoji="▶️", style=discord.ButtonStyle.gray, disabled=not self.pager.has_next, row=1)
+        next_button.callback = self._on_next
+        filter_button = discord.ui.Button(label="Filter", emoji="🔍", style=discord.ButtonStyle.gray, row=1)
+        filter_button.callback = self._on_filter
+        self.add_item(prev_button)
+        self.add_item(next_button)
+        self.add_item(filter_button)
+
+    async def show(self, interaction:discord.Interaction):
+        self._render()
+        await interaction.response.edit_message(content=self.content, view=self)
+
+    async def _on_prev(self, interaction:discord.Interaction):
+        await self.pager.prev()
+        await self.show(interaction)
+
+    async def _on_next(self, interaction:discord.Interaction):
+        await self.pager.next()
+        await self.show(interaction)
+
+    async def _on_filter(self, interaction:discord.Interaction):
+        await interaction.response.send_modal(FilterModal(self, title="Filter by title"))
+
+class FilterModal(discord.ui.Modal):
+    def __init__(self, prompt:PagedSelectPrompt, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        
+        self.prompt = prompt
+        
+        self.add_item(discord.ui.InputText(
+            label="Title contains (empty to clear)",
+            style=discord.InputTextStyle.short,
+            required=False,
+            value=prompt.pager.title_contains,
+        ))
+
+    async def callback(self, interaction: discord.Interaction):
+        await self.prompt.pager.set_filter((self.children[0].value or "").strip())
+        await self.prompt.show(interaction)
 
 class JoinSelect(discord.ui.Select):
     def __init__(self, bot:commands.Bot, known_events:List[BaseEvent]):
         self.bot = bot
         options:List[discord.SelectOption] = [discord.SelectOption(label=e.title[:100], value=f"{e.event_type}:{e.event_id}", description=f"event id={e.event_id}") for e in known_events]
-        options = options[:25]
         super().__init__(placeholder="選擇要加入的項目", min_values=1, max_values=1, options=options, custom_id="ctf_select_join")
 
     async def callback(self, interaction:discord.Interaction):
         choice = self.values[0]
         await join_request(self.bot, interaction, choice)
 
-class RemoveSelectPrompt(discord.ui.View):
-    def __init__(self, bot:commands.Bot, known_events:List[BaseEvent]):
-        super().__init__(timeout=180)
-        self.add_item(RemoveSelect(bot, known_events))
-
 class RemoveSelect(discord.ui.Select):
     def __init__(self, bot:commands.Bot, known_events:List[BaseEvent]):
         self.bot = bot
         options:List[discord.SelectOption] = [discord.SelectOption(label=e.title[:100], value=f"{e.event_type}:{e.event_id}", description=f"event id={e.event_id}") for e in known_events]
-        options = options[:25]
         super().__init__(placeholder="選擇要移除的資料", min_values=1, max_values=1, options=options, custom_id="ctf_select_remove")
 
     async def callback(self, interaction:discord.Interaction):
@@ -138,6 +237,28 @@ class RemoveSelect(discord.ui.Select):
             return        
 
 # cog
+def _format_change_value(field:str, value) -> str:
+    if value is None:
+        return "-"
+    if field in ("start", "finish"):
+        return f"<t:{int(value)}:f>"
+    return str(value)
+
+
+def create_history_embed(title:str, changes) -> discord.Embed:
+    embed = discord.Embed(title=f"History of {title}", color=discord.Color.blue())
+    lines = []
+    for change in changes:
+        delta = json.loads(change.delta)
+        fields = ", ".join(
+            f"{field}: {_format_change_value(field, old)} → {_format_change_value(field, new)}"
+            for field, (old, new) in delta.items()
+        )
+        lines.append(f"<t:{change.changed_at}:R> **{change.kind}** {fields}".rstrip())
+    embed.description = "\n".join(lines) if lines else "No recorded changes"
+    return embed
+
+
 class CTF(commands.Cog):
     def __init__(self, bot:commands.Bot):
         self.bot:commands.Bot = bot
@@ -145,22 +266,12 @@ class CTF(commands.Cog):
     
     @discord.slash_command(name="ctf_menu", description="list CTF events")
     async def ctf_menu(self, ctx:discord.ApplicationContext):
-        known_events:List[BaseEvent] = await crud.read_all_event()
-        
-        # embed
-        embed = discord.Embed(
-            title=f"{settings.EMOJI} CTF events tracked",
-            color=discord.Color.green()
-        )
-        for event in known_events:
-            embed.add_field(
-                name=f"[event id={event.event_id}] {event.title}",
-                value=f"start at {datetime.fromtimestamp(event.start).astimezone(ZoneInfo(settings.TIMEZONE))}\n\
-                finish at {datetime.fromtimestamp(event.finish).astimezone(ZoneInfo(settings.TIMEZONE))}" if isinstance(event, Event) else "",
-                inline=False
-            )
+        # embeds are capped at 6000 characters, keep menu pages small
+        pager = EventPager(page_size=10)
+        await pager.load()
+        embed = create_menu_embed(pager, guild_configs.get(ctx.guild_id))
                 
-        await ctx.response.send_message(embed=embed, view=CTFMenuView(self.bot), ephemeral=True)
+        await ctx.response.send_message(embed=embed, view=CTFMenuView(self.bot, pager), ephemeral=True)
 
     @discord.slash_command(name="join_ctf", description="Join a CTF event channel")
     async def join_event(self, ctx:discord.ApplicationContext,
@@ -175,5 +286,31 @@ class CTF(commands.Cog):
             return
         await join_request(self.bot, ctx.interaction, f"{event[0].event_type}:{event[0].event_id}")
 
+    @discord.slash_command(name="ctf_history", description="Show recent changes of a CTF event")
+    async def ctf_history(self, ctx:discord.ApplicationContext,
+        event_title: str = discord.Option(
+            description="請選擇要查詢的項目",
+            autocomplete=event_join_autocomplete
+        )
+    ):
+        async with get_db() as session:
+            event = await crud_event.read_event(session, title=[event_title])
+            if len(event) == 0:
+                await ctx.response.send_message(content="找不到指定的活動", ephemeral=True)
+                return
+            changes = await crud_event_change.read_event_changes(session, event_id=[event[0].event_id], limit=15)
+        await ctx.response.send_message(embed=create_history_embed(event[0].title, changes), ephemeral=True)
+
+    @discord.slash_command(name="ctf_calendar", description="Export tracked CTF events as an iCalendar file")
+    async def ctf_calendar(self, ctx:discord.ApplicationContext):
+        content = f"{len(ical_feed)} events"
+        if settings.HTTP_PORT > 0:
+            content += f", subscribe at http://{settings.HTTP_HOST}:{settings.HTTP_PORT}{settings.CALENDAR_PATH}"
+        await ctx.response.send_message(
+            content=content,
+            file=discord.File(io.BytesIO(ical_feed.body), filename="ctfeed.ics"),
+            ephemeral=True,
+        )
+
 def setup(bot:commands.Bot):
     bot.add_cog(CTF(bot))
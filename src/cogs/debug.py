@@ -0,0 +1,70 @@
+import io
+import logging
+
+import discord
+from discord.ext import commands
+
+from src.utils.get_channel import is_admin_channel
+from src.utils.profiler import loop_profiler, describe_tasks
+
+# logging
+logger = logging.getLogger(__name__)
+
+# cog
+class Debug(commands.Cog):
+    def __init__(self, bot:commands.Bot):
+        self.bot:commands.Bot = bot
+
+    ctf_debug = discord.SlashCommandGroup(
+        "ctf_debug", "Runtime diagnostics (admin channel only)",
+        default_member_permissions=discord.Permissions(administrator=True),
+    )
+
+    async def _check_admin_channel(self, ctx:discord.ApplicationContext) -> bool:
+        # reports expose internals, keep them in the admin channel
+        is_admin = getattr(ctx.author, "guild_permissions", None) and ctx.author.guild_permissions.administrator
+        if not is_admin or not is_admin_channel(ctx.channel):
+            await ctx.response.send_message(content="請於管理頻道使用此功能（需要 Administrator）", ephemeral=True)
+            return False
+        return True
+
+    @ctf_debug.command(name="profile", description="Profile the event loop and upload the report")
+    async def profile(self, ctx:discord.ApplicationContext,
+        seconds: int = discord.Option(int, description="profile length", default=30, min_value=1, max_value=600),
+        slow_ms: int = discord.Option(int, description="report callbacks slower than this (ms)", default=100, min_value=1),
+    ):
+        if not await self._check_admin_channel(ctx):
+            return
+        if loop_profiler.running:
+            await ctx.response.send_message(content="A profile is already running, use /ctf_debug stop", ephemeral=True)
+            return
+
+        await ctx.response.send_message(content=f"Profiling for {seconds}s (slow callbacks > {slow_ms}ms)...")
+        logger.info(f"User {ctx.author.display_name}(id={ctx.author.id}) started a {seconds}s profile")
+        report = await loop_profiler.run(seconds, slow_ms)
+        await ctx.followup.send(
+            content=f"Profile done: {report.samples} samples in {report.duration:.1f}s, {len(report.slow_callbacks)} slow callbacks",
+            file=discord.File(io.BytesIO(report.render().encode()), filename=f"profile-{report.started_at:%Y%m%d-%H%M%S}.txt"),
+        )
+
+    @ctf_debug.command(name="stop", description="End the running profile early")
+    async def stop(self, ctx:discord.ApplicationContext):
+        if not await self._check_admin_channel(ctx):
+            return
+        if not loop_profiler.running:
+            await ctx.response.send_message(content="No profile is running", ephemeral=True)
+            return
+        loop_profiler.stop()
+        await ctx.response.send_message(content="Stopping, the report follows", ephemeral=True)
+
+    @ctf_debug.command(name="tasks", description="Dump pending asyncio tasks and where they wait")
+    async def tasks(self, ctx:discord.ApplicationContext):
+        if not await self._check_admin_channel(ctx):
+            return
+        await ctx.response.send_message(
+            file=discord.File(io.BytesIO(describe_tasks().encode()), filename="tasks.txt"),
+        )
+
+
+def setup(bot:commands.Bot):
+    bot.add_cog(Debug(bot))
@@ -0,0 +1,161 @@
+from typing import List, Optional
+from zoneinfo import ZoneInfo, available_timezones
+import logging
+import unicodedata
+
+import discord
+from discord.ext import commands
+
+from src.config import settings
+from src.database.database import get_db
+import src.crud.guild_config as crud_guild_config
+from src.utils.guild_config import guild_configs, GuildSettings
+from src.utils.get_channel import find_announcement_channel, find_admin_channel
+
+# logging
+logger = logging.getLogger(__name__)
+
+
+async def timezone_autocomplete(ctx:discord.AutocompleteContext) -> List[str]:
+    value = (ctx.value or "").lower()
+    return sorted(name for name in available_timezones() if value in name.lower())[:25]
+
+
+def _valid_timezone(name:str) -> bool:
+    # embeds render with pytz and the menu with zoneinfo, the name has to load in both
+    import pytz
+    try:
+        pytz.timezone(name)
+        ZoneInfo(name)
+    except Exception:
+        return False
+    return True
+
+
+# joiners, variation selectors, skin tones, keycaps and tag sequences inside one emoji
+_EMOJI_COMPONENTS = {"\u200d", "\ufe0e", "\ufe0f", "\u20e3"}
+
+def _is_unicode_emoji(value:str) -> bool:
+    if not any(unicodedata.category(ch) == "So" or ch == "\u20e3" for ch in value):
+        return False
+    for ch in value:
+        code = ord(ch)
+        if unicodedata.category(ch) == "So" or ch in _EMOJI_COMPONENTS:
+            continue
+        if 0x1F3FB <= code <= 0x1F3FF or 0xE0020 <= code <= 0xE007F or ch in "0123456789#*":
+            continue
+        return False
+    return True
+
+
+def _valid_emoji(value:str) -> bool:
+    # used as a button emoji, Discord rejects the whole message for anything else
+    if not (discord.PartialEmoji.from_str(value).id is None):
+        return True
+    return _is_unicode_emoji(value)
+
+
+def create_config_embed(guild:discord.Guild, config:GuildSettings) -> discord.Embed:
+    announcement = find_announcement_channel(guild)
+    admin = find_admin_channel(guild)
+    embed = discord.Embed(title=f"{config.emoji} CTFeed settings", color=discord.Color.blurple())
+    embed.add_field(
+        name="Announcement channel",
+        value=f"{announcement.mention if announcement else 'not found'}" + ("" if config.announcement_channel_id else f" (default #{settings.ANNOUNCEMENT_CHANNEL_NAME})"),
+        inline=False,
+    )
+    embed.add_field(
+        name="Admin channel",
+        value=f"{admin.mention if admin else 'not found'}" + ("" if config.admin_channel_id else f" (default #{settings.ADMIN_CHANNEL_NAME})"),
+        inline=False,
+    )
+    embed.add_field(name="Timezone", value=config.timezone, inline=True)
+    embed.add_field(name="Emoji", value=config.emoji, inline=True)
+    return embed
+
+
+# cog
+class GuildConfigCog(commands.Cog):
+    def __init__(self, bot:commands.Bot):
+        self.bot:commands.Bot = bot
+
+    ctf_config = discord.SlashCommandGroup(
+        "ctf_config", "Per-server settings (omit the value to go back to the default)",
+        default_member_permissions=discord.Permissions(administrator=True),
+        contexts={discord.InteractionContextType.guild},
+    )
+
+    async def _check_admin(self, ctx:discord.ApplicationContext) -> bool:
+        if ctx.guild is None or not getattr(ctx.author, "guild_permissions", None) or not ctx.author.guild_permissions.administrator:
+            await ctx.response.send_message(content="你沒有權限使用此功能（需要 Administrator）", ephemeral=True)
+            return False
+        return True
+
+    async def _update(self, ctx:discord.ApplicationContext, **fields):
+        async with get_db() as session:
+            config = await crud_guild_config.update_guild_config(session, ctx.guild.id, **fields)
+        if config is None:
+            await ctx.response.send_message(content="Failed to save the settings", ephemeral=True)
+            return
+        logger.info("User %s(id=%s) updated guild %s settings: %s", ctx.author.display_name, ctx.author.id, ctx.guild.id, fields)
+        await ctx.response.send_message(embed=create_config_embed(ctx.guild, guild_configs.get(ctx.guild.id)), ephemeral=True)
+
+    @ctf_config.command(name="show", description="Show this server's settings")
+    async def show(self, ctx:discord.ApplicationContext):
+        if not await self._check_admin(ctx):
+            return
+        await ctx.response.send_message(embed=create_config_embed(ctx.guild, guild_configs.get(ctx.guild.id)), ephemeral=True)
+
+    @ctf_config.command(name="announcement_channel", description="Channel new CTF events are announced in")
+    async def announcement_channel(self, ctx:discord.ApplicationContext,
+        channel: Optional[discord.TextChannel] = discord.Option(discord.TextChannel, description="announcement channel", default=None),
+    ):
+        if not await self._check_admin(ctx):
+            return
+        await self._update(ctx, announcement_channel_id=channel.id if channel else None)
+
+    @ctf_config.command(name="admin_channel", description="Channel private join requests and diagnostics go to")
+    async def admin_channel(self, ctx:discord.ApplicationContext,
+        channel: Optional[discord.TextChannel] = discord.Option(discord.TextChannel, description="admin channel", default=None),
+    ):
+        if not await self._check_admin(ctx):
+            return
+        await self._update(ctx, admin_channel_id=channel.id if channel else None)
+
+    @ctf_config.command(name="timezone", description="Timezone event times are shown in")
+    async def timezone(self, ctx:discord.ApplicationContext,
+        name: Optional[str] = discord.Option(str, description="IANA name, e.g. Asia/Taipei", default=None, autocomplete=timezone_autocomplete),
+    ):
+        if not await self._check_admin(ctx):
+            return
+        if name and not _valid_timezone(name):
+            await ctx.response.send_message(content=f"Unknown timezone: {name}", ephemeral=True)
+            return
+        await self._update(ctx, timezone=name or None)
+
+    @ctf_config.command(name="emoji", description="Emoji on the Join button and menus")
+    async def emoji(self, ctx:discord.ApplicationContext,
+        value: Optional[str] = discord.Option(str, description="unicode or custom emoji", default=None, max_length=64),
+    ):
+        if not await self._check_admin(ctx):
+            return
+        value = value.strip() if value else None
+        if value and not _valid_emoji(value):
+            await ctx.response.send_message(content=f"Not an emoji: {value}", ephemeral=True)
+            return
+        await self._update(ctx, emoji=value)
+
+    @ctf_config.command(name="reset", description="Drop every setting of this server")
+    async def reset(self, ctx:discord.ApplicationContext):
+        if not await self._check_admin(ctx):
+            return
+        async with get_db() as session:
+            if not await crud_guild_config.delete_guild_config(session, ctx.guild.id):
+                await ctx.response.send_message(content="Failed to reset the settings", ephemeral=True)
+                return
+        logger.info("User %s(id=%s) reset guild %s settings", ctx.author.display_name, ctx.author.id, ctx.guild.id)
+        await ctx.response.send_message(embed=create_config_embed(ctx.guild, guild_configs.get(ctx.guild.id)), ephemeral=True)
+
+
+def setup(bot:commands.Bot):
+    bot.add_cog(GuildConfigCog(bot))
@@ -1,3 +1,5 @@
+from typing import List
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -12,12 +14,52 @@ class Settings(BaseSettings):
     DATABASE_SEARCH_DAYS:int=-90 # known events: finish > now_day+(-90)
     ANNOUNCEMENT_CHANNEL_NAME:str
     CHECK_INTERVAL_MINUTES:int
+    EVENT_REMOVAL_GRACE:int=3 # consecutive checks an event must be missing before it is removed
+    
+    # Event workspace configuration ("name:type", type is text or forum)
+    EVENT_CHANNEL_TEMPLATES:List[str]=["資訊:text", "聊天:text", "題目:forum"]
+    WORKSPACE_POOL_SIZE:int=0 # hidden pre-provisioned workspaces, 0 to disable
+    WORKSPACE_POOL_PREFIX:str="ctfeed-pool"
+    WORKSPACE_POOL_REFILL_MINUTES:int=10
+    
+    # Team cache, refreshed from CTFtime once older than TEAM_STALE_HOURS
+    TEAM_STALE_HOURS:int=7*24
+    TEAM_REFRESH_BATCH:int=20
     
     # Database configuration
     DATABASE_URL:str="sqlite+aiosqlite:///data/database.db"
+    EVENT_HISTORY_RETENTION_DAYS:int=180
+    EVENT_HISTORY_MAX_PER_EVENT:int=50
+    WARM_STATE_PATH:str="data/warm_state.json" # in-memory caches kept across restarts, empty to disable
+    WARM_STATE_SAVE_MINUTES:int=10
+    
+    # Sharding (one process runs every shard, SHARD_COUNT 0 uses the count Discord recommends)
+    SHARDED:bool=False
+    SHARD_COUNT:int=0
+    
+    # Members: "full" caches every member (members intent), "lazy" resolves them on demand into an LRU
+    MEMBER_CACHE:str="full"
+    MEMBER_LRU_SIZE:int=1024
+    
+    # Replicas: only the holder of the database lease polls CTFtime and runs the scheduled jobs
+    LEASE_TTL_SECONDS:int=30
+    INSTANCE_ID:str="" # defaults to hostname-pid
+    
+    # Notification (seconds before an event starts, 0 to disable)
+    NOTIFY_BEFORE_EVENT:int = 1 * 24 * 60 * 60
+    
+    # Local HTTP endpoints (calendar feed, metrics), port 0 to disable
+    HTTP_HOST:str="127.0.0.1"
+    HTTP_PORT:int=0
+    CALENDAR_PATH:str="/calendar.ics"
+    METRICS_PATH:str="/metrics"
     
-    # Notification (todo)
-    #NOTIFY_BEFORE_EVENT:int = 1 * 24 * 60 * 60
+    # Logging (LOG_FORMAT is text or json, at most LOG_RATE_LIMIT identical messages per LOG_RATE_WINDOW seconds)
+    LOG_LEVEL:str="INFO"
+    LOG_FORMAT:str="text"
+    LOG_RATE_LIMIT:int=20
+    LOG_RATE_WINDOW:int=60
+    LOG_QUEUE_SIZE:int=10000
     
     # Misc
     TIMEZONE:str
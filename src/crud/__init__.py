@@ -1,8 +1,9 @@
-from src.database.model import BaseEvent, Event, CustomEvent
+from src.database.model import BaseEvent, Event, CustomEvent, GuildConfig
 from src.database.database import get_db
 import src.crud.event as event
 import src.crud.custom_event as custom_event
-from typing import List, Optional
+import src.crud.guild_config as guild_config
+from typing import List, Optional, Tuple
 
 async def read_event(
     event_id:Optional[List[int]]=None,
@@ -35,3 +36,52 @@ async def read_all_event(filter:bool=False) -> List[BaseEvent]:
     return known_events + custom_events
 
 
+async def read_all_guild_config() -> List[GuildConfig]:
+    async with get_db() as session:
+        return await guild_config.read_guild_config(session)
+
+
+# page cursor: ("event", finish, event_id) or ("custom", event_id), None for the first page
+PageCursor = Tuple
+
+async def read_event_page(
+    cursor:Optional[PageCursor]=None,
+    limit:int=25,
+    title_contains:Optional[str]=None,
+    with_category:bool=False,
+) -> Tuple[List[BaseEvent], Optional[PageCursor]]:
+    """One page of events (latest finish first) followed by custom events (newest first).
+
+    Returns the page and the cursor of the next page, or None on the last page.
+    """
+    async with get_db() as session:
+        page:List[BaseEvent] = []
+        if cursor is None or cursor[0] == "event":
+            before = tuple(cursor[1:]) if cursor else None
+            page = await event.read_event_page(
+                session,
+                limit=limit + 1,
+                before=before,
+                title_contains=title_contains,
+                with_category=with_category,
+            )
+            if len(page) > limit:
+                last = page[limit - 1]
+                return page[:limit], ("event", last.finish, last.event_id)
+            before_id = None
+        else:
+            before_id = cursor[1]
+
+        # events exhausted, continue with custom events
+        remaining = limit - len(page)
+        custom_events = await custom_event.read_event_page(
+            session,
+            limit=remaining + 1,
+            before_id=before_id,
+            title_contains=title_contains,
+        )
+        next_cursor = None
+        if len(custom_events) > remaining:
+            custom_events = custom_events[:remaining]
+            next_cursor = ("custom", custom_events[-1].event_id if custom_events else None)
+        return page + custom_events, next_cursor
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 import sqlalchemy
 
 from src.database.model import CustomEvent
+from src.utils.event_catalog import event_catalog
 
 logger = logging.getLogger("database")
 
@@ -22,6 +23,7 @@ async def create_event(
         await db.rollback()
         logger.error(f"failed to write database : {str(e)}")
         return None
+    event_catalog.put(data)
     return data
 
 
@@ -50,6 +52,29 @@ async def read_event(
         logger.error(f"failed to read database : {str(e)}")
         return []
 
+async def read_event_page(
+    db: AsyncSession,
+    limit: int,
+    before_id: Optional[int]=None,
+    title_contains: Optional[str]=None,
+) -> List[CustomEvent]:
+    # keyset pagination on event_id descending
+    try:
+        query = sqlalchemy.select(CustomEvent)
+        
+        if not (before_id is None):
+            query = query.where(CustomEvent.event_id < before_id)
+        
+        if not (title_contains is None):
+            query = query.where(CustomEvent.title.icontains(title_contains, autoescape=True))
+        
+        query = query.order_by(sqlalchemy.desc(CustomEvent.event_id)).limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+    except Exception as e:
+        logger.error(f"failed to read database : {str(e)}")
+        return []
+
 async def update_event(
     db:AsyncSession,
     event_id:int,
@@ -75,8 +100,30 @@ async def update_event(
             event.is_private = private
         
         # commit
+        # expire_on_commit is off, the instance already holds the new values
+        await db.commit()
+        event_catalog.put(event)
+        return event
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"failed to update database : {str(e)}")
+        return None
+
+
+async def toggle_event_private(
+    db:AsyncSession,
+    event_id:int,
+) -> Optional[CustomEvent]:
+    """Flip is_private in the database, so replicas with an older catalog cannot write the same value twice."""
+    try:
+        stmt = sqlalchemy.update(CustomEvent).where(CustomEvent.event_id == event_id)
+        stmt = stmt.values(is_private=sqlalchemy.not_(CustomEvent.is_private)).returning(CustomEvent)
+        event = (await db.execute(stmt)).scalar_one_or_none()
+        if event is None:
+            return None
+        
         await db.commit()
-        await db.refresh(event)
+        event_catalog.put(event)
         return event
     except Exception as e:
         await db.rollback()
@@ -97,4 +144,6 @@ async def delete_event(
         await db.rollback()
         logger.error(f"failed to write database : {str(e)}")
         return 0
+    for eid in event_id:
+        event_catalog.remove("custom", eid)
     return 1
@@ -1,12 +1,14 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple, Dict, Any
 from datetime import datetime, timedelta
 import logging
 
 from sqlalchemy.ext.asyncio import AsyncSession
 import sqlalchemy
 
-from src.database.model import Event
+from src.database.model import Event, EventOrganizer
 from src.config import settings
+from src.utils.event_catalog import event_catalog
+from src.utils.event_snapshot import pack_event, unpack_event
 
 # logger
 logger = logging.getLogger("database")
@@ -26,6 +28,8 @@ async def create_events(
         logger.error(f"failed to write database : {str(e)}")
         return 0
 
+    for event in events:
+        event_catalog.put(event)
     return 1
 
 
@@ -36,10 +40,14 @@ async def read_event(
     category_id:Optional[List[int]]=None,
     title:Optional[List[str]]=None,
     finish_after:Optional[int]=None,
+    include_removed:bool=False,
 ) -> List[Event]:
     try:
         query = sqlalchemy.select(Event)
         
+        if not include_removed:
+            query = query.where(Event.removed_at.is_(None))
+        
         if not (event_id is None):
             query = query.where(Event.event_id.in_(event_id))
         
@@ -60,6 +68,51 @@ async def read_event(
         return []
 
 
+async def read_event_page(
+    db:AsyncSession,
+    limit:int,
+    before:Optional[Tuple[int, int]]=None,
+    title_contains:Optional[str]=None,
+    with_category:bool=False,
+) -> List[Event]:
+    # keyset pagination on (finish, event_id) descending, before=(finish, event_id) of the previous page's last row
+    try:
+        query = sqlalchemy.select(Event).where(Event.removed_at.is_(None))
+        
+        if not (before is None):
+            finish, event_id = before
+            query = query.where(sqlalchemy.or_(
+                Event.finish < finish,
+                sqlalchemy.and_(Event.finish == finish, Event.event_id < event_id),
+            ))
+        
+        if not (title_contains is None):
+            query = query.where(Event.title.icontains(title_contains, autoescape=True))
+        
+        if with_category:
+            query = query.where(Event.category_id.is_not(None))
+        
+        query = query.order_by(sqlalchemy.desc(Event.finish), sqlalchemy.desc(Event.event_id)).limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+    except Exception as e:
+        logger.error(f"failed to read database : {str(e)}")
+        return []
+
+
+async def read_event_snapshot(
+    db:AsyncSession,
+    event_id:int
+) -> Optional[Dict[str, Any]]:
+    """Stored CTFtime payload of an event, None if the event has no snapshot yet."""
+    try:
+        query = sqlalchemy.select(Event.snapshot).where(Event.event_id == event_id)
+        return unpack_event((await db.execute(query)).scalar_one_or_none())
+    except Exception as e:
+        logger.error(f"failed to read database : {str(e)}")
+        return None
+
+
 # update
 async def update_event(
     db:AsyncSession,
@@ -68,7 +121,8 @@ async def update_event(
     start:Optional[int]=None,
     finish:Optional[int]=None,
     private:Optional[bool]=None,
-    category_id:Optional[int]=None
+    category_id:Optional[int]=None,
+    snapshot:Optional[Dict[str, Any]]=None
 ) -> Optional[Event]:
     try:
         # find
@@ -93,9 +147,13 @@ async def update_event(
         if not(category_id is None):
             event.category_id = category_id
         
+        if not(snapshot is None):
+            event.snapshot = pack_event(snapshot)
+        
         # commit
+        # expire_on_commit is off, the instance already holds the new values
         await db.commit()
-        await db.refresh(event)
+        _sync_catalog(event)
         return event
     except Exception as e:
         await db.rollback()
@@ -103,12 +161,68 @@ async def update_event(
         return None
 
 
+async def toggle_event_private(
+    db:AsyncSession,
+    event_id:int,
+) -> Optional[Event]:
+    """Flip is_private in the database, so replicas with an older catalog cannot write the same value twice."""
+    try:
+        stmt = sqlalchemy.update(Event).where(Event.event_id == event_id)
+        stmt = stmt.values(is_private=sqlalchemy.not_(Event.is_private)).returning(Event)
+        event = (await db.execute(stmt)).scalar_one_or_none()
+        if event is None:
+            return None
+        
+        await db.commit()
+        _sync_catalog(event)
+        return event
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"failed to update database : {str(e)}")
+        return None
+
+
+async def set_event_presence(
+    db:AsyncSession,
+    event_id:int,
+    missing_count:int,
+    removed_at:Optional[int],
+) -> Optional[Event]:
+    """Set the tombstone state as given, removed_at=None restores the event."""
+    try:
+        query = sqlalchemy.select(Event).where(Event.event_id == event_id)
+        event = (await db.execute(query)).scalar_one_or_none()
+        if event is None:
+            return None
+        
+        event.missing_count = missing_count
+        event.removed_at = removed_at
+        
+        await db.commit()
+        _sync_catalog(event)
+        return event
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"failed to update database : {str(e)}")
+        return None
+
+
+def _sync_catalog(event:Event):
+    # tombstoned events are invisible outside the reconciliation
+    if event.removed_at is None:
+        event_catalog.put(event)
+    else:
+        event_catalog.remove(event.event_type, event.event_id)
+
+
 # delete
 async def delete_event(
     db:AsyncSession,
     event_id:List[int],
 ) -> bool:
     try:
+        stmt = sqlalchemy.delete(EventOrganizer).where(EventOrganizer.event_id.in_(event_id))
+        await db.execute(stmt)
         stmt = sqlalchemy.delete(Event).where(Event.event_id.in_(event_id))
         await db.execute(stmt)
         
@@ -118,4 +232,6 @@ async def delete_event(
         logger.error(f"failed to write database : {str(e)}")
         return False
 
+    for eid in event_id:
+        event_catalog.remove("event", eid)
     return True
\ No newline at end of file
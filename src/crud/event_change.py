@@ -0,0 +1,114 @@
+from typing import Optional, List, Dict, Any
+import json
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+import sqlalchemy
+
+from src.database.model import EventChange
+
+# logger
+logger = logging.getLogger("database")
+
+# kinds
+CHANGE_CREATED = "created"
+CHANGE_UPDATED = "updated"
+CHANGE_REMOVED = "removed"
+CHANGE_RESTORED = "restored"
+
+
+def diff_fields(old:Dict[str, Any], new:Dict[str, Any]) -> Dict[str, List[Any]]:
+    """Field level delta {field: [old, new]} of the fields that differ."""
+    return {key: [old.get(key), new.get(key)] for key in new if old.get(key) != new.get(key)}
+
+
+def make_change(event_id:int, kind:str, delta:Dict[str, List[Any]], changed_at:int) -> EventChange:
+    return EventChange(
+        event_id=event_id,
+        kind=kind,
+        delta=json.dumps(delta, separators=(",", ":"), ensure_ascii=False),
+        changed_at=changed_at,
+    )
+
+
+# create
+async def create_event_changes(
+    db:AsyncSession,
+    changes:List[EventChange]
+) -> int:
+    if len(changes) == 0:
+        return 1
+    try:
+        db.add_all(changes)
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"failed to write database : {str(e)}")
+        return 0
+
+    return 1
+
+
+# read
+async def read_event_changes(
+    db:AsyncSession,
+    event_id:Optional[List[int]]=None,
+    since:Optional[int]=None,
+    limit:int=20,
+) -> List[EventChange]:
+    """Newest first."""
+    try:
+        query = sqlalchemy.select(EventChange)
+        
+        if not (event_id is None):
+            query = query.where(EventChange.event_id.in_(event_id))
+        
+        if not (since is None):
+            query = query.where(EventChange.changed_at >= since)
+        
+        query = query.order_by(EventChange.changed_at.desc(), EventChange.id.desc()).limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+    except Exception as e:
+        logger.error(f"failed to read database : {str(e)}")
+        return []
+
+
+# delete
+async def compact_event_changes(
+    db:AsyncSession,
+    older_than:int,
+    keep_per_event:int,
+    event_id:Optional[List[int]]=None,
+) -> int:
+    """Drop changes older than `older_than` and all but the newest `keep_per_event` of each event.
+
+    With `event_id` the per-event cap is only applied to those events, the ones
+    that just gained rows; the age cut always covers the whole table.
+    """
+    try:
+        result = await db.execute(sqlalchemy.delete(EventChange).where(EventChange.changed_at < older_than))
+        deleted = result.rowcount
+        
+        if event_id is None or len(event_id) > 0:
+            ranked = sqlalchemy.select(
+                EventChange.id,
+                sqlalchemy.func.row_number().over(
+                    partition_by=EventChange.event_id,
+                    order_by=(EventChange.changed_at.desc(), EventChange.id.desc()),
+                ).label("rank"),
+            )
+            if not (event_id is None):
+                ranked = ranked.where(EventChange.event_id.in_(event_id))
+            ranked = ranked.subquery()
+            overflow = sqlalchemy.select(ranked.c.id).where(ranked.c.rank > keep_per_event)
+            result = await db.execute(sqlalchemy.delete(EventChange).where(EventChange.id.in_(overflow)))
+            deleted += result.rowcount
+        
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"failed to delete database : {str(e)}")
+        return 0
+
+    return deleted
@@ -0,0 +1,79 @@
+from typing import List, Optional
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+import sqlalchemy
+
+from src.database.model import GuildConfig
+from src.utils.guild_config import guild_configs
+
+logger = logging.getLogger("database")
+
+# unset marker, None is a valid value (back to the environment default)
+_UNSET = object()
+
+# create / update
+async def update_guild_config(
+    db:AsyncSession,
+    guild_id:int,
+    announcement_channel_id=_UNSET,
+    admin_channel_id=_UNSET,
+    timezone=_UNSET,
+    emoji=_UNSET,
+) -> Optional[GuildConfig]:
+    try:
+        config = await db.get(GuildConfig, guild_id)
+        if config is None:
+            config = GuildConfig(guild_id=guild_id)
+            db.add(config)
+
+        if not (announcement_channel_id is _UNSET):
+            config.announcement_channel_id = announcement_channel_id
+        if not (admin_channel_id is _UNSET):
+            config.admin_channel_id = admin_channel_id
+        if not (timezone is _UNSET):
+            config.timezone = timezone
+        if not (emoji is _UNSET):
+            config.emoji = emoji
+
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"failed to update database : {str(e)}")
+        return None
+    guild_configs.put(config)
+    return config
+
+
+# read
+async def read_guild_config(
+    db:AsyncSession,
+    guild_id:Optional[List[int]]=None,
+) -> List[GuildConfig]:
+    try:
+        query = sqlalchemy.select(GuildConfig)
+
+        if not (guild_id is None):
+            query = query.where(GuildConfig.guild_id.in_(guild_id))
+
+        result = await db.execute(query)
+        return result.scalars().all()
+    except Exception as e:
+        logger.error(f"failed to read database : {str(e)}")
+        return []
+
+
+# delete
+async def delete_guild_config(
+    db:AsyncSession,
+    guild_id:int,
+) -> bool:
+    try:
+        await db.execute(sqlalchemy.delete(GuildConfig).where(GuildConfig.guild_id == guild_id))
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"failed to write database : {str(e)}")
+        return False
+    guild_configs.remove(guild_id)
+    return True
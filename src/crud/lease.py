@@ -0,0 +1,77 @@
+from typing import Optional
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+import sqlalchemy
+
+from src.database.model import Lease
+
+# logger
+logger = logging.getLogger("database")
+
+# create / update
+async def acquire_lease(
+    db:AsyncSession,
+    name:str,
+    holder:str,
+    now:int,
+    ttl:int,
+) -> bool:
+    """Take or renew the lease if it is free, expired or already ours; one statement, so replicas cannot both win."""
+    try:
+        result = await db.execute(
+            sqlalchemy.update(Lease)
+            .where(Lease.name == name)
+            .where(sqlalchemy.or_(Lease.holder == holder, Lease.expires_at <= now))
+            .values(holder=holder, expires_at=now + ttl)
+        )
+        if result.rowcount == 0:
+            exists = (await db.execute(sqlalchemy.select(Lease.name).where(Lease.name == name))).scalar_one_or_none()
+            if not (exists is None):
+                await db.rollback()
+                return False
+            # first run, a concurrent insert fails on the primary key
+            db.add(Lease(name=name, holder=holder, expires_at=now + ttl))
+        await db.commit()
+    except sqlalchemy.exc.IntegrityError:
+        await db.rollback()
+        return False
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"failed to update database : {str(e)}")
+        return False
+
+    return True
+
+
+async def release_lease(
+    db:AsyncSession,
+    name:str,
+    holder:str,
+) -> bool:
+    try:
+        result = await db.execute(
+            sqlalchemy.update(Lease)
+            .where(Lease.name == name)
+            .where(Lease.holder == holder)
+            .values(expires_at=0)
+        )
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"failed to update database : {str(e)}")
+        return False
+
+    return result.rowcount > 0
+
+
+# read
+async def read_lease(
+    db:AsyncSession,
+    name:str,
+) -> Optional[Lease]:
+    try:
+        return (await db.execute(sqlalchemy.select(Lease).where(Lease.name == name))).scalar_one_or_none()
+    except Exception as e:
+        logger.error(f"failed to read database : {str(e)}")
+        return None
@@ -0,0 +1,149 @@
+from typing import Optional, List, Dict, Any, Tuple
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+import sqlalchemy
+
+from src.database.model import Team, EventOrganizer
+
+# logger
+logger = logging.getLogger("database")
+
+# create / update
+async def set_event_organizers(
+    db:AsyncSession,
+    event_id:int,
+    organizers:List[Dict[str, Any]],
+) -> int:
+    """Replace the organizers of an event with CTFtime's [{"id", "name"}], adding unknown teams."""
+    try:
+        team_ids = [org["id"] for org in organizers]
+        query = sqlalchemy.select(Team).where(Team.team_id.in_(team_ids))
+        teams = {team.team_id: team for team in (await db.execute(query)).scalars().all()}
+        for org in organizers:
+            team = teams.get(org["id"])
+            if team is None:
+                teams[org["id"]] = team = Team(team_id=org["id"], name=org.get("name"), updated_at=0)
+                db.add(team)
+            elif org.get("name") and team.name != org["name"]:
+                team.name = org["name"]
+
+        await db.execute(sqlalchemy.delete(EventOrganizer).where(EventOrganizer.event_id == event_id))
+        for position, team_id in enumerate(dict.fromkeys(team_ids)):
+            db.add(EventOrganizer(event_id=event_id, team_id=team_id, position=position))
+
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"failed to write database : {str(e)}")
+        return 0
+
+    return 1
+
+
+async def update_team(
+    db:AsyncSession,
+    team_id:int,
+    updated_at:int,
+    name:Optional[str]=None,
+    country:Optional[str]=None,
+) -> Optional[Team]:
+    try:
+        # find
+        query = sqlalchemy.select(Team).where(Team.team_id == team_id)
+        team = (await db.execute(query)).scalar_one_or_none()
+        if team is None:
+            return None
+        
+        # update
+        if not(name is None):
+            team.name = name
+        
+        if not(country is None):
+            team.country = country
+        
+        team.updated_at = updated_at
+        team.fetch_attempts = 0
+        team.retry_at = None
+        
+        # commit
+        await db.commit()
+        return team
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"failed to update database : {str(e)}")
+        return None
+
+
+async def update_team_retry(
+    db:AsyncSession,
+    team_id:int,
+    fetch_attempts:int,
+    retry_at:Optional[int],
+) -> Optional[Team]:
+    """Record a failed CTFtime fetch, updated_at is left alone so the team stays stale."""
+    try:
+        query = sqlalchemy.select(Team).where(Team.team_id == team_id)
+        team = (await db.execute(query)).scalar_one_or_none()
+        if team is None:
+            return None
+        
+        team.fetch_attempts = fetch_attempts
+        team.retry_at = retry_at
+        
+        await db.commit()
+        return team
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"failed to update database : {str(e)}")
+        return None
+
+
+# read
+async def read_team(
+    db:AsyncSession,
+    team_id:Optional[List[int]]=None,
+    updated_before:Optional[int]=None,
+    retry_before:Optional[int]=None,
+    limit:Optional[int]=None,
+) -> List[Team]:
+    try:
+        query = sqlalchemy.select(Team)
+        
+        if not (team_id is None):
+            query = query.where(Team.team_id.in_(team_id))
+        
+        if not (updated_before is None):
+            query = query.where(Team.updated_at < updated_before)
+        
+        if not (retry_before is None):
+            # teams backing off after failed fetches are skipped until retry_at
+            query = query.where(sqlalchemy.or_(Team.retry_at.is_(None), Team.retry_at <= retry_before))
+        
+        query = query.order_by(Team.updated_at)
+        if not (limit is None):
+            query = query.limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+    except Exception as e:
+        logger.error(f"failed to read database : {str(e)}")
+        return []
+
+
+async def read_event_organizers(
+    db:AsyncSession,
+    event_id:int,
+    limit:Optional[int]=None,
+) -> List[Tuple[int, Optional[str], Optional[str]]]:
+    """(team_id, name, country) of an event's organizers, in CTFtime's order."""
+    try:
+        query = sqlalchemy.select(Team.team_id, Team.name, Team.country)
+        query = query.join(EventOrganizer, EventOrganizer.team_id == Team.team_id)
+        query = query.where(EventOrganizer.event_id == event_id).order_by(EventOrganizer.position)
+        if not (limit is None):
+            query = query.limit(limit)
+        result = await db.execute(query)
+        return [tuple(row) for row in result.all()]
+    except Exception as e:
+        logger.error(f"failed to read database : {str(e)}")
+        return []
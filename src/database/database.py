@@ -1,24 +1,70 @@
 from contextlib import asynccontextmanager
+import logging
+import time
 
+import sqlalchemy
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
 from src.config import settings
 from src.database.model import Base
+from src.utils.metrics import DB_QUERY_DURATION, DB_ERRORS
+
+logger = logging.getLogger("database")
 
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=False,
 )
 
+# statement timing for every crud call, hooked once on the engine instead of per function
+@sqlalchemy.event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+
+@sqlalchemy.event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    DB_QUERY_DURATION.observe(time.perf_counter() - context._query_start)
+
+
+@sqlalchemy.event.listens_for(engine.sync_engine, "handle_error")
+def _handle_error(exception_context):
+    DB_ERRORS.inc()
+
+
 AsyncSessionLocal = async_sessionmaker(
     engine, 
     expire_on_commit=False, 
     class_=AsyncSession
 )
 
+def _add_missing_columns(conn):
+    # create_all only creates missing tables, columns added to existing models are added here
+    inspector = sqlalchemy.inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(conn.dialect)}"
+            default = column.default.arg if column.default is not None and column.default.is_scalar else None
+            if not (default is None):
+                ddl += f" DEFAULT {sqlalchemy.literal(default).compile(dialect=conn.dialect, compile_kwargs={'literal_binds': True})}"
+            elif not column.nullable:
+                logger.error(f"cannot add column {table.name}.{column.name} : not nullable and no default")
+                continue
+            if not column.nullable:
+                ddl += " NOT NULL"
+            
+            conn.execute(sqlalchemy.text(ddl))
+            logger.info(f"added column {table.name}.{column.name}")
+
+
 async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
 
 
 @asynccontextmanager
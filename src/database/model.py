@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, CheckConstraint
+from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, CheckConstraint, LargeBinary
+from sqlalchemy.orm import deferred
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -25,6 +26,14 @@ class Event(BaseEvent):
     # event info
     start = Column(Integer, nullable=False)
     finish = Column(Integer, nullable=False)
+    
+    # last CTFtime payload (see src/utils/event_snapshot.py), only loaded on request
+    snapshot = deferred(Column(LargeBinary, nullable=True, default=None))
+    
+    # tombstone: missing_count counts consecutive checks the event was missing from CTFtime,
+    # removed_at is set once it reaches EVENT_REMOVAL_GRACE and cleared if the event comes back
+    missing_count = Column(Integer, nullable=False, default=0)
+    removed_at = Column(Integer, nullable=True, default=None)
 
     @property
     def event_type(self) -> str:
@@ -36,4 +45,55 @@ class CustomEvent(BaseEvent):
     
     @property
     def event_type(self) -> str:
-        return "custom"
\ No newline at end of file
+        return "custom"
+
+
+class Team(Base):
+    __tablename__ = 'teams'
+
+    team_id = Column(Integer, primary_key=True, index=True, nullable=False, autoincrement=False)
+    name = Column(String, nullable=True)
+    country = Column(String, nullable=True)
+    updated_at = Column(Integer, nullable=False, default=0) # last CTFtime fetch, 0 = never fetched
+    # failed fetches in a row, and when the next one may be tried (None = any time)
+    fetch_attempts = Column(Integer, nullable=False, default=0)
+    retry_at = Column(Integer, nullable=True, default=None)
+
+
+class EventOrganizer(Base):
+    __tablename__ = 'event_organizers'
+
+    event_id = Column(Integer, ForeignKey('events.event_id'), primary_key=True, nullable=False)
+    team_id = Column(Integer, ForeignKey('teams.team_id'), primary_key=True, nullable=False)
+    position = Column(Integer, nullable=False, default=0)
+
+
+class EventChange(Base):
+    __tablename__ = 'event_changes'
+
+    id = Column(Integer, primary_key=True, index=True, nullable=False, autoincrement=True)
+    # no foreign key, history outlives removed events
+    event_id = Column(Integer, index=True, nullable=False)
+    kind = Column(String, nullable=False) # created/updated/removed/restored
+    delta = Column(String, nullable=False, default="{}") # JSON {field: [old, new]}
+    changed_at = Column(Integer, index=True, nullable=False)
+
+
+class Lease(Base):
+    __tablename__ = 'leases'
+
+    # one row per job group, see src/utils/leader.py
+    name = Column(String, primary_key=True, nullable=False)
+    holder = Column(String, nullable=False)
+    expires_at = Column(Integer, nullable=False) # epoch seconds
+
+
+class GuildConfig(Base):
+    __tablename__ = 'guild_configs'
+
+    # NULL columns fall back to the environment settings
+    guild_id = Column(Integer, primary_key=True, nullable=False)
+    announcement_channel_id = Column(Integer, nullable=True)
+    admin_channel_id = Column(Integer, nullable=True)
+    timezone = Column(String, nullable=True)
+    emoji = Column(String, nullable=True)
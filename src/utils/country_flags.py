@@ -1,167 +1,319 @@
+from types import MappingProxyType
+import re
+
+# ISO 3166-1: alpha-2, alpha-3, English short name
+_ISO_3166 = (
+    ("AD", "AND", "Andorra"),
+    ("AE", "ARE", "United Arab Emirates"),
+    ("AF", "AFG", "Afghanistan"),
+    ("AG", "ATG", "Antigua and Barbuda"),
+    ("AI", "AIA", "Anguilla"),
+    ("AL", "ALB", "Albania"),
+    ("AM", "ARM", "Armenia"),
+    ("AO", "AGO", "Angola"),
+    ("AQ", "ATA", "Antarctica"),
+    ("AR", "ARG", "Argentina"),
+    ("AS", "ASM", "American Samoa"),
+    ("AT", "AUT", "Austria"),
+    ("AU", "AUS", "Australia"),
+    ("AW", "ABW", "Aruba"),
+    ("AX", "ALA", "Aland Islands"),
+    ("AZ", "AZE", "Azerbaijan"),
+    ("BA", "BIH", "Bosnia and Herzegovina"),
+    ("BB", "BRB", "Barbados"),
+    ("BD", "BGD", "Bangladesh"),
+    ("BE", "BEL", "Belgium"),
+    ("BF", "BFA", "Burkina Faso"),
+    ("BG", "BGR", "Bulgaria"),
+    ("BH", "BHR", "Bahrain"),
+    ("BI", "BDI", "Burundi"),
+    ("BJ", "BEN", "Benin"),
+    ("BL", "BLM", "Saint Barthelemy"),
+    ("BM", "BMU", "Bermuda"),
+    ("BN", "BRN", "Brunei"),
+    ("BO", "BOL", "Bolivia"),
+    ("BQ", "BES", "Bonaire, Sint Eustatius and Saba"),
+    ("BR", "BRA", "Brazil"),
+    ("BS", "BHS", "Bahamas"),
+    ("BT", "BTN", "Bhutan"),
+    ("BV", "BVT", "Bouvet Island"),
+    ("BW", "BWA", "Botswana"),
+    ("BY", "BLR", "Belarus"),
+    ("BZ", "BLZ", "Belize"),
+    ("CA", "CAN", "Canada"),
+    ("CC", "CCK", "Cocos (Keeling) Islands"),
+    ("CD", "COD", "Democratic Republic of the Congo"),
+    ("CF", "CAF", "Central African Republic"),
+    ("CG", "COG", "Congo"),
+    ("CH", "CHE", "Switzerland"),
+    ("CI", "CIV", "Cote d'Ivoire"),
+    ("CK", "COK", "Cook Islands"),
+    ("CL", "CHL", "Chile"),
+    ("CM", "CMR", "Cameroon"),
+    ("CN", "CHN", "China"),
+    ("CO", "COL", "Colombia"),
+    ("CR", "CRI", "Costa Rica"),
+    ("CU", "CUB", "Cuba"),
+    ("CV", "CPV", "Cabo Verde"),
+    ("CW", "CUW", "Curacao"),
+    ("CX", "CXR", "Christmas Island"),
+    ("CY", "CYP", "Cyprus"),
+    ("CZ", "CZE", "Czechia"),
+    ("DE", "DEU", "Germany"),
+    ("DJ", "DJI", "Djibouti"),
+    ("DK", "DNK", "Denmark"),
+    ("DM", "DMA", "Dominica"),
+    ("DO", "DOM", "Dominican Republic"),
+    ("DZ", "DZA", "Algeria"),
+    ("EC", "ECU", "Ecuador"),
+    ("EE", "EST", "Estonia"),
+    ("EG", "EGY", "Egypt"),
+    ("EH", "ESH", "Western Sahara"),
+    ("ER", "ERI", "Eritrea"),
+    ("ES", "ESP", "Spain"),
+    ("ET", "ETH", "Ethiopia"),
+    ("FI", "FIN", "Finland"),
+    ("FJ", "FJI", "Fiji"),
+    ("FK", "FLK", "Falkland Islands"),
+    ("FM", "FSM", "Micronesia"),
+    ("FO", "FRO", "Faroe Islands"),
+    ("FR", "FRA", "France"),
+    ("GA", "GAB", "Gabon"),
+    ("GB", "GBR", "United Kingdom"),
+    ("GD", "GRD", "Grenada"),
+    ("GE", "GEO", "Georgia"),
+    ("GF", "GUF", "French Guiana"),
+    ("GG", "GGY", "Guernsey"),
+    ("GH", "GHA", "Ghana"),
+    ("GI", "GIB", "Gibraltar"),
+    ("GL", "GRL", "Greenland"),
+    ("GM", "GMB", "Gambia"),
+    ("GN", "GIN", "Guinea"),
+    ("GP", "GLP", "Guadeloupe"),
+    ("GQ", "GNQ", "Equatorial Guinea"),
+    ("GR", "GRC", "Greece"),
+    ("GS", "SGS", "South Georgia and the South Sandwich Islands"),
+    ("GT", "GTM", "Guatemala"),
+    ("GU", "GUM", "Guam"),
+    ("GW", "GNB", "Guinea-Bissau"),
+    ("GY", "GUY", "Guyana"),
+    ("HK", "HKG", "Hong Kong"),
+    ("HM", "HMD", "Heard Island and McDonald Islands"),
+    ("HN", "HND", "Honduras"),
+    ("HR", "HRV", "Croatia"),
+    ("HT", "HTI", "Haiti"),
+    ("HU", "HUN", "Hungary"),
+    ("ID", "IDN", "Indonesia"),
+    ("IE", "IRL", "Ireland"),
+    ("IL", "ISR", "Israel"),
+    ("IM", "IMN", "Isle of Man"),
+    ("IN", "IND", "India"),
+    ("IO", "IOT", "British Indian Ocean Territory"),
+    ("IQ", "IRQ", "Iraq"),
+    ("IR", "IRN", "Iran"),
+    ("IS", "ISL", "Iceland"),
+    ("IT", "ITA", "Italy"),
+    ("JE", "JEY", "Jersey"),
+    ("JM", "JAM", "Jamaica"),
+    ("JO", "JOR", "Jordan"),
+    ("JP", "JPN", "Japan"),
+    ("KE", "KEN", "Kenya"),
+    ("KG", "KGZ", "Kyrgyzstan"),
+    ("KH", "KHM", "Cambodia"),
+    ("KI", "KIR", "Kiribati"),
+    ("KM", "COM", "Comoros"),
+    ("KN", "KNA", "Saint Kitts and Nevis"),
+    ("KP", "PRK", "North Korea"),
+    ("KR", "KOR", "South Korea"),
+    ("KW", "KWT", "Kuwait"),
+    ("KY", "CYM", "Cayman Islands"),
+    ("KZ", "KAZ", "Kazakhstan"),
+    ("LA", "LAO", "Laos"),
+    ("LB", "LBN", "Lebanon"),
+    ("LC", "LCA", "Saint Lucia"),
+    ("LI", "LIE", "Liechtenstein"),
+    ("LK", "LKA", "Sri Lanka"),
+    ("LR", "LBR", "Liberia"),
+    ("LS", "LSO", "Lesotho"),
+    ("LT", "LTU", "Lithuania"),
+    ("LU", "LUX", "Luxembourg"),
+    ("LV", "LVA", "Latvia"),
+    ("LY", "LBY", "Libya"),
+    ("MA", "MAR", "Morocco"),
+    ("MC", "MCO", "Monaco"),
+    ("MD", "MDA", "Moldova"),
+    ("ME", "MNE", "Montenegro"),
+    ("MF", "MAF", "Saint Martin"),
+    ("MG", "MDG", "Madagascar"),
+    ("MH", "MHL", "Marshall Islands"),
+    ("MK", "MKD", "North Macedonia"),
+    ("ML", "MLI", "Mali"),
+    ("MM", "MMR", "Myanmar"),
+    ("MN", "MNG", "Mongolia"),
+    ("MO", "MAC", "Macao"),
+    ("MP", "MNP", "Northern Mariana Islands"),
+    ("MQ", "MTQ", "Martinique"),
+    ("MR", "MRT", "Mauritania"),
+    ("MS", "MSR", "Montserrat"),
+    ("MT", "MLT", "Malta"),
+    ("MU", "MUS", "Mauritius"),
+    ("MV", "MDV", "Maldives"),
+    ("MW", "MWI", "Malawi"),
+    ("MX", "MEX", "Mexico"),
+    ("MY", "MYS", "Malaysia"),
+    ("MZ", "MOZ", "Mozambique"),
+    ("NA", "NAM", "Namibia"),
+    ("NC", "NCL", "New Caledonia"),
+    ("NE", "NER", "Niger"),
+    ("NF", "NFK", "Norfolk Island"),
+    ("NG", "NGA", "Nigeria"),
+    ("NI", "NIC", "Nicaragua"),
+    ("NL", "NLD", "Netherlands"),
+    ("NO", "NOR", "Norway"),
+    ("NP", "NPL", "Nepal"),
+    ("NR", "NRU", "Nauru"),
+    ("NU", "NIU", "Niue"),
+    ("NZ", "NZL", "New Zealand"),
+    ("OM", "OMN", "Oman"),
+    ("PA", "PAN", "Panama"),
+    ("PE", "PER", "Peru"),
+    ("PF", "PYF", "French Polynesia"),
+    ("PG", "PNG", "Papua New Guinea"),
+    ("PH", "PHL", "Philippines"),
+    ("PK", "PAK", "Pakistan"),
+    ("PL", "POL", "Poland"),
+    ("PM", "SPM", "Saint Pierre and Miquelon"),
+    ("PN", "PCN", "Pitcairn"),
+    ("PR", "PRI", "Puerto Rico"),
+    ("PS", "PSE", "Palestine"),
+    ("PT", "PRT", "Portugal"),
+    ("PW", "PLW", "Palau"),
+    ("PY", "PRY", "Paraguay"),
+    ("QA", "QAT", "Qatar"),
+    ("RE", "REU", "Reunion"),
+    ("RO", "ROU", "Romania"),
+    ("RS", "SRB", "Serbia"),
+    ("RU", "RUS", "Russia"),
+    ("RW", "RWA", "Rwanda"),
+    ("SA", "SAU", "Saudi Arabia"),
+    ("SB", "SLB", "Solomon Islands"),
+    ("SC", "SYC", "Seychelles"),
+    ("SD", "SDN", "Sudan"),
+    ("SE", "SWE", "Sweden"),
+    ("SG", "SGP", "Singapore"),
+    ("SH", "SHN", "Saint Helena, Ascension and Tristan da Cunha"),
+    ("SI", "SVN", "Slovenia"),
+    ("SJ", "SJM", "Svalbard and Jan Mayen"),
+    ("SK", "SVK", "Slovakia"),
+    ("SL", "SLE", "Sierra Leone"),
+    ("SM", "SMR", "San Marino"),
+    ("SN", "SEN", "Senegal"),
+    ("SO", "SOM", "Somalia"),
+    ("SR", "SUR", "Suriname"),
+    ("SS", "SSD", "South Sudan"),
+    ("ST", "STP", "Sao Tome and Principe"),
+    ("SV", "SLV", "El Salvador"),
+    ("SX", "SXM", "Sint Maarten"),
+    ("SY", "SYR", "Syria"),
+    ("SZ", "SWZ", "Eswatini"),
+    ("TC", "TCA", "Turks and Caicos Islands"),
+    ("TD", "TCD", "Chad"),
+    ("TF", "ATF", "French Southern Territories"),
+    ("TG", "TGO", "Togo"),
+    ("TH", "THA", "Thailand"),
+    ("TJ", "TJK", "Tajikistan"),
+    ("TK", "TKL", "Tokelau"),
+    ("TL", "TLS", "Timor-Leste"),
+    ("TM", "TKM", "Turkmenistan"),
+    ("TN", "TUN", "Tunisia"),
+    ("TO", "TON", "Tonga"),
+    ("TR", "TUR", "Turkey"),
+    ("TT", "TTO", "Trinidad and Tobago"),
+    ("TV", "TUV", "Tuvalu"),
+    ("TW", "TWN", "Taiwan"),
+    ("TZ", "TZA", "Tanzania"),
+    ("UA", "UKR", "Ukraine"),
+    ("UG", "UGA", "Uganda"),
+    ("UM", "UMI", "United States Minor Outlying Islands"),
+    ("US", "USA", "United States"),
+    ("UY", "URY", "Uruguay"),
+    ("UZ", "UZB", "Uzbekistan"),
+    ("VA", "VAT", "Holy See"),
+    ("VC", "VCT", "Saint Vincent and the Grenadines"),
+    ("VE", "VEN", "Venezuela"),
+    ("VG", "VGB", "British Virgin Islands"),
+    ("VI", "VIR", "U.S. Virgin Islands"),
+    ("VN", "VNM", "Vietnam"),
+    ("VU", "VUT", "Vanuatu"),
+    ("WF", "WLF", "Wallis and Futuna"),
+    ("WS", "WSM", "Samoa"),
+    ("YE", "YEM", "Yemen"),
+    ("YT", "MYT", "Mayotte"),
+    ("ZA", "ZAF", "South Africa"),
+    ("ZM", "ZMB", "Zambia"),
+    ("ZW", "ZWE", "Zimbabwe"),
+)
+
+# other names seen in team profiles
+_NAME_ALIASES = {
+    "uk": "GB",
+    "great britain": "GB",
+    "england": "GB",
+    "usa": "US",
+    "united states of america": "US",
+    "korea": "KR",
+    "republic of korea": "KR",
+    "russian federation": "RU",
+    "czech republic": "CZ",
+    "viet nam": "VN",
+    "macau": "MO",
+    "ivory coast": "CI",
+    "swaziland": "SZ",
+    "macedonia": "MK",
+    "turkiye": "TR",
+    "vatican": "VA",
+}
+
+
+def _regional_indicator(alpha2:str) -> str:
+    # "TW" -> U+1F1F9 U+1F1FC
+    return "".join(chr(0x1F1E6 + ord(c) - ord("A")) for c in alpha2)
+
+
+_FLAGS = MappingProxyType({alpha2: _regional_indicator(alpha2) for alpha2, _, _ in _ISO_3166})
+_ALPHA3 = MappingProxyType({alpha3: alpha2 for alpha2, alpha3, _ in _ISO_3166})
+_NAMES = MappingProxyType({
+    **{name.lower(): alpha2 for alpha2, _, name in _ISO_3166},
+    **_NAME_ALIASES,
+})
+
+_UNKNOWN = ("🌍", "未知")
+_TWO_LETTERS = re.compile("[A-Z]{2}")
+
+
+def normalize_country_code(country) -> str | None:
+    """alpha-2, alpha-3 or English name -> alpha-2, None if unknown."""
+    if not country:
+        return None
+    value = country.strip()
+    code = value.upper()
+    if code in _FLAGS:
+        return code
+    if code in _ALPHA3:
+        return _ALPHA3[code]
+    return _NAMES.get(value.lower())
+
+
 def get_country_info(country_code):
     if not country_code:
-        return "🌍", "未知"
-
-    country_flags = {
-        "CN": "🇨🇳",
-        "JP": "🇯🇵",
-        "KR": "🇰🇷",
-        "TW": "🇹🇼",
-        "HK": "🇭🇰",
-        "MO": "🇲🇴",
-        "IN": "🇮🇳",
-        "SG": "🇸🇬",
-        "MY": "🇲🇾",
-        "TH": "🇹🇭",
-        "VN": "🇻🇳",
-        "ID": "🇮🇩",
-        "PH": "🇵🇭",
-        "BD": "🇧🇩",
-        "PK": "🇵🇰",
-        "LK": "🇱🇰",
-        "NP": "🇳🇵",
-        "MM": "🇲🇲",
-        "KH": "🇰🇭",
-        "LA": "🇱🇦",
-        "BN": "🇧🇳",
-        "MN": "🇲🇳",
-        "UZ": "🇺🇿",
-        "KZ": "🇰🇿",
-        "GB": "🇬🇧",
-        "DE": "🇩🇪",
-        "FR": "🇫🇷",
-        "IT": "🇮🇹",
-        "ES": "🇪🇸",
-        "NL": "🇳🇱",
-        "CH": "🇨🇭",
-        "SE": "🇸🇪",
-        "NO": "🇳🇴",
-        "DK": "🇩🇰",
-        "FI": "🇫🇮",
-        "BE": "🇧🇪",
-        "AT": "🇦🇹",
-        "PL": "🇵🇱",
-        "CZ": "🇨🇿",
-        "SK": "🇸🇰",
-        "HU": "🇭🇺",
-        "RO": "🇷🇴",
-        "BG": "🇧🇬",
-        "HR": "🇭🇷",
-        "RS": "🇷🇸",
-        "SI": "🇸🇮",
-        "BA": "🇧🇦",
-        "ME": "🇲🇪",
-        "MK": "🇲🇰",
-        "AL": "🇦🇱",
-        "GR": "🇬🇷",
-        "CY": "🇨🇾",
-        "MT": "🇲🇹",
-        "PT": "🇵🇹",
-        "IE": "🇮🇪",
-        "IS": "🇮🇸",
-        "LU": "🇱🇺",
-        "LI": "🇱🇮",
-        "AD": "🇦🇩",
-        "SM": "🇸🇲",
-        "VA": "🇻🇦",
-        "MC": "🇲🇨",
-        "RU": "🇷🇺",
-        "UA": "🇺🇦",
-        "BY": "🇧🇾",
-        "LT": "🇱🇹",
-        "LV": "🇱🇻",
-        "EE": "🇪🇪",
-        "MD": "🇲🇩",
-        "GE": "🇬🇪",
-        "AM": "🇦🇲",
-        "AZ": "🇦🇿",
-        "US": "🇺🇸",
-        "CA": "🇨🇦",
-        "MX": "🇲🇽",
-        "GT": "🇬🇹",
-        "BZ": "🇧🇿",
-        "SV": "🇸🇻",
-        "HN": "🇭🇳",
-        "NI": "🇳🇮",
-        "CR": "🇨🇷",
-        "PA": "🇵🇦",
-        "CU": "🇨🇺",
-        "JM": "🇯🇲",
-        "HT": "🇭🇹",
-        "DO": "🇩🇴",
-        "PR": "🇵🇷",
-        "TT": "🇹🇹",
-        "BB": "🇧🇧",
-        "GD": "🇬🇩",
-        "BR": "🇧🇷",
-        "AR": "🇦🇷",
-        "CL": "🇨🇱",
-        "CO": "🇨🇴",
-        "PE": "🇵🇪",
-        "VE": "🇻🇪",
-        "EC": "🇪🇨",
-        "BO": "🇧🇴",
-        "PY": "🇵🇾",
-        "UY": "🇺🇾",
-        "SR": "🇸🇷",
-        "GY": "🇬🇾",
-        "ZA": "🇿🇦",
-        "EG": "🇪🇬",
-        "NG": "🇳🇬",
-        "KE": "🇰🇪",
-        "MA": "🇲🇦",
-        "ET": "🇪🇹",
-        "GH": "🇬🇭",
-        "TN": "🇹🇳",
-        "DZ": "🇩🇿",
-        "LY": "🇱🇾",
-        "SD": "🇸🇩",
-        "UG": "🇺🇬",
-        "TZ": "🇹🇿",
-        "ZW": "🇿🇼",
-        "ZM": "🇿🇲",
-        "MW": "🇲🇼",
-        "MZ": "🇲🇿",
-        "BW": "🇧🇼",
-        "NA": "🇳🇦",
-        "SZ": "🇸🇿",
-        "LS": "🇱🇸",
-        "MG": "🇲🇬",
-        "MU": "🇲🇺",
-        "SC": "🇸🇨",
-        "IL": "🇮🇱",
-        "TR": "🇹🇷",
-        "IR": "🇮🇷",
-        "SA": "🇸🇦",
-        "AE": "🇦🇪",
-        "IQ": "🇮🇶",
-        "SY": "🇸🇾",
-        "LB": "🇱🇧",
-        "JO": "🇯🇴",
-        "PS": "🇵🇸",
-        "YE": "🇾🇪",
-        "OM": "🇴🇲",
-        "QA": "🇶🇦",
-        "BH": "🇧🇭",
-        "KW": "🇰🇼",
-        "AF": "🇦🇫",
-        "AU": "🇦🇺",
-        "NZ": "🇳🇿",
-        "FJ": "🇫🇯",
-        "PG": "🇵🇬",
-        "TO": "🇹🇴",
-        "WS": "🇼🇸",
-        "VU": "🇻🇺",
-        "SB": "🇸🇧",
-        "PW": "🇵🇼",
-        "FM": "🇫🇲",
-        "MH": "🇲🇭",
-        "KI": "🇰🇮",
-        "TV": "🇹🇻",
-        "NR": "🇳🇷",
-    }
+        return _UNKNOWN
 
-    code = country_code.upper()
-    flag_emoji = country_flags.get(code, f"🏳️")
+    code = normalize_country_code(country_code)
+    if code is None:
+        code = country_code.strip().upper()
+        # codes missing from the table (XK, EU, ...) still render as regional indicators
+        if not _TWO_LETTERS.fullmatch(code):
+            return "🏳️", code
+        return _regional_indicator(code), code
 
-    return flag_emoji, code
+    return _FLAGS[code], code
@@ -1,47 +1,85 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import aiohttp
 import logging
+import time
 
 from src.config import settings
+from src.utils.metrics import CTFTIME_REQUEST_DURATION, CTFTIME_REQUESTS
 
 logger = logging.getLogger(__name__)
 
 
 async def fetch_ctf_events(event_id:Optional[int]=None) -> List[Dict[str, Any]]:
+    if not (event_id is None):
+        _, event = await fetch_ctf_event(event_id)
+        return [] if event is None else [event]
+
     params = {
         "limit": 20,
         "start": int(datetime.now().timestamp()),
         "finish": int((datetime.now() + timedelta(days=settings.CTFTIME_SEARCH_DAYS)).timestamp()),
     }
     
-    url = settings.CTFTIME_API_URL
-    if not (event_id is None):
-        # for example: "https://ctftime.org/api/v1/events/2345"
-        url = f"{url}{event_id}/"
-    
+    start = time.perf_counter()
+    status = "error"
     try:
         async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
+            async with session.get(settings.CTFTIME_API_URL, params=params) as response:
+                status = response.status
                 if response.status == 200:
-                    if not (event_id is None):
-                        return [await response.json()]
-                    
                     return await response.json()
     except Exception as e:
-        logger.error(f"API error: {e}")
+        logger.error("API error: %s", e)
+    finally:
+        _observe("events", status, start)
     
     return []
 
 
+async def fetch_ctf_event(event_id:int) -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
+    """(HTTP status, payload) of one event.
+
+    The payload is only set on a 200. The status tells a removed event (404)
+    apart from a failed request (429/5xx, or None when no response arrived).
+    """
+    # for example: "https://ctftime.org/api/v1/events/2345"
+    url = f"{settings.CTFTIME_API_URL}{event_id}/"
+    start = time.perf_counter()
+    status = "error"
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(url) as response:
+                status = response.status
+                if response.status == 200:
+                    return status, await response.json()
+                return status, None
+    except Exception as e:
+        logger.error("API error: %s", e)
+    finally:
+        _observe("event", status, start)
+
+    return None, None
+
+
 async def fetch_team_info(team_id):
     url = f"{settings.TEAM_API_URL}{team_id}/"
+    start = time.perf_counter()
+    status = "error"
     try:
         async with aiohttp.ClientSession() as session:
             async with session.get(url) as response:
+                status = response.status
                 if response.status == 200:
                     team_data = await response.json()
                     return team_data.get("country"), team_data.get("name")
     except Exception as e:
-        logger.error(f"Error fetching team info: {e}")
+        logger.error("Error fetching team info: %s", e)
+    finally:
+        _observe("team", status, start)
     return None, None
+
+
+def _observe(endpoint:str, status, start:float):
+    CTFTIME_REQUEST_DURATION.labels(endpoint).observe(time.perf_counter() - start)
+    CTFTIME_REQUESTS.labels(endpoint, status).inc()
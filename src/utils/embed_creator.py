@@ -1,19 +1,95 @@
+from typing import Dict, List, Optional, Tuple
 import discord
-import pytz
 import logging
+import copy
+import functools
+import hashlib
+import json
+from collections import OrderedDict
 from datetime import datetime
-from src.utils.ctf_api import fetch_team_info
-from src.utils.country_flags import get_country_info
+from src.database.database import get_db
+import src.crud.team as crud_team
 from src.config import settings
 
 logger = logging.getLogger(__name__)
 
+# rendered embeds as dicts, keyed by (event content hash, title, timezone)
+EMBED_CACHE_SIZE = 256
+_embed_cache:OrderedDict = OrderedDict()
+# (event_id, organizer team_ids) -> [(name, country)], read from event_organizers
+# joined to teams; the ids come from the payload, so a changed organizer list is a new key
+OrganizerKey = Tuple[int, Tuple[int, ...]]
+_organizer_cache:Dict[OrganizerKey, List[Tuple[Optional[str], Optional[str]]]] = {}
 
-async def create_event_embed(event, title:str):
+
+@functools.lru_cache(maxsize=None)
+def _get_timezone(name:str):
+    # imported on first render, pytz is not needed to start the bot
+    import pytz
+    return pytz.timezone(name)
+
+
+def _event_hash(event) -> str:
+    # any change in the payload gives a new key, so stale renders are never served
+    return hashlib.sha1(json.dumps(event, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def clear_embed_cache():
+    # called when teams change, rendered embeds embed team countries
+    _embed_cache.clear()
+    _organizer_cache.clear()
+
+
+def export_embed_cache() -> dict:
+    return {
+        "embeds": [[*key, embed] for key, embed in _embed_cache.items()],
+        "organizers": [[event_id, list(team_ids), [list(team) for team in teams]] for (event_id, team_ids), teams in _organizer_cache.items()],
+    }
+
+
+def restore_embed_cache(state:dict):
+    for event_hash, title, timezone, embed in state.get("embeds", [])[-EMBED_CACHE_SIZE:]:
+        _embed_cache[(event_hash, title, timezone)] = embed
+    for event_id, team_ids, teams in state.get("organizers", []):
+        _organizer_cache[(event_id, tuple(team_ids))] = [tuple(team) for team in teams]
+
+
+async def create_event_embed(event, title:str, timezone:Optional[str]=None):
+    """Event embed with times shown in `timezone` (a guild's setting, TIMEZONE by default)."""
+    timezone = timezone or settings.TIMEZONE
+    key = (_event_hash(event), title, timezone)
+    cached = _embed_cache.get(key)
+    if cached is not None:
+        _embed_cache.move_to_end(key)
+        return discord.Embed.from_dict(copy.deepcopy(cached))
+
+    embed = await _render_event_embed(event, title, timezone)
+    _embed_cache[key] = embed.to_dict()
+    if len(_embed_cache) > EMBED_CACHE_SIZE:
+        _embed_cache.popitem(last=False)
+    return embed
+
+
+async def _read_organizers(event) -> List[Tuple[Optional[str], Optional[str]]]:
+    """(name, country) of the first three organizers, countries kept fresh by the team refresh task."""
+    key = (event["id"], tuple(org["id"] for org in event["organizers"]))
+    organizers = _organizer_cache.get(key)
+    if organizers is None:
+        async with get_db() as session:
+            rows = await crud_team.read_event_organizers(session, event["id"], limit=3)
+        if len(rows) == 0:
+            # custom renders or events synced before the organizers were stored
+            logger.warning("Organizers of event %s not in event_organizers", event["id"], extra={"event_id": event["id"]})
+            return [(org["name"], None) for org in event["organizers"][:3]]
+        organizers = _organizer_cache[key] = [(name, country) for team_id, name, country in rows]
+    return organizers
+
+
+async def _render_event_embed(event, title:str, timezone:str):
     start_time_utc = datetime.fromisoformat(event["start"].replace("Z", "+00:00"))
     finish_time_utc = datetime.fromisoformat(event["finish"].replace("Z", "+00:00"))
 
-    display_tz = pytz.timezone(settings.TIMEZONE)
+    display_tz = _get_timezone(timezone)
     start_time_taipei = start_time_utc.astimezone(display_tz)
     finish_time_taipei = finish_time_utc.astimezone(display_tz)
 
@@ -22,20 +98,17 @@ async def create_event_embed(event, title:str):
     organizer_info = []
     first_country_flag = ""
     if event.get("organizers"):
-        logger.info(f"Processing {len(event['organizers'])} organizers")
-        for i, org in enumerate(event["organizers"][:3]):
-            try:
-                country_code, team_name = await fetch_team_info(org["id"])
-                logger.info(
-                    f"Organizer {org['name']} (ID: {org['id']}) country: {country_code}"
-                )
-                country_flag, country_name = get_country_info(country_code)
-                if i == 0:
-                    first_country_flag = country_flag
-                organizer_info.append(f"{country_flag} {org['name']}")
-            except Exception as e:
-                logger.error(f"Failed to fetch organizer {org['name']} info: {e}")
-                organizer_info.append(f"🌍 {org['name']}")
+        from src.utils.country_flags import get_country_info # the flag table is built on first use
+
+        organizers = await _read_organizers(event)
+        for i, (name, country) in enumerate(organizers):
+            if country is None:
+                organizer_info.append(f"🌍 {name}")
+                continue
+            country_flag, country_name = get_country_info(country)
+            if i == 0:
+                first_country_flag = country_flag
+            organizer_info.append(f"{country_flag} {name}")
 
     title_with_flag = event["title"]
     if first_country_flag:
@@ -47,8 +120,8 @@ async def create_event_embed(event, title:str):
 
     embed.add_field(
         name="🕐 比賽時間",
-        value=f"**開始：** {start_time_taipei.strftime('%m月%d日 %H:%M')} ({settings.TIMEZONE}) | {start_time_utc.strftime('%H:%M UTC')}\n"
-        f"**結束：** {finish_time_taipei.strftime('%m月%d日 %H:%M')} ({settings.TIMEZONE}) | {finish_time_utc.strftime('%H:%M UTC')}\n"
+        value=f"**開始：** {start_time_taipei.strftime('%m月%d日 %H:%M')} ({timezone}) | {start_time_utc.strftime('%H:%M UTC')}\n"
+        f"**結束：** {finish_time_taipei.strftime('%m月%d日 %H:%M')} ({timezone}) | {finish_time_utc.strftime('%H:%M UTC')}\n"
         f"**持續：** {event['duration']['days']}天 {event['duration']['hours']}小時",
         inline=False,
     )
@@ -0,0 +1,102 @@
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass
+import logging
+
+from src.database.model import BaseEvent
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CatalogEntry:
+    event_type:str # event/custom
+    event_id:int
+    title:str
+    is_private:bool
+    category_id:Optional[int]=None
+    start:Optional[int]=None
+    finish:Optional[int]=None
+
+    @property
+    def event_data(self) -> str:
+        return f"{self.event_type}:{self.event_id}"
+
+
+# called with (event_type, event_id, entry), entry is None when the event was removed
+CatalogListener = Callable[[str, int, Optional[CatalogEntry]], None]
+
+
+class EventCatalog:
+    """In-memory copy of the event tables.
+
+    The crud layer writes through to it after every commit, so interaction
+    handlers can resolve an event without a database round trip. Entries are
+    updated in place; references held by views stay current.
+    """
+
+    def __init__(self):
+        self._entries:Dict[Tuple[str, int], CatalogEntry] = {}
+        self._listeners:List[CatalogListener] = []
+        self.loaded:bool = False
+
+    def add_listener(self, listener:CatalogListener):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener:CatalogListener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, event_type:str, event_id:int, entry:Optional[CatalogEntry]):
+        for listener in self._listeners:
+            try:
+                listener(event_type, event_id, entry)
+            except Exception as e:
+                logger.error("Event catalog listener failed: %s", e)
+
+    def load(self, events:Iterable[BaseEvent]):
+        # updated in place, entries restored from the warm state keep their identity
+        stale = set(self._entries)
+        for event in events:
+            self.put(event)
+            stale.discard((event.event_type, event.event_id))
+        for event_type, event_id in stale:
+            self.remove(event_type, event_id)
+        self.loaded = True
+        logger.info("Event catalog loaded with %d events", len(self._entries))
+
+    def restore(self, entries:Iterable[CatalogEntry]):
+        """Fill from a warm-state snapshot until load() replaces it with the database."""
+        for entry in entries:
+            self._entries[(entry.event_type, entry.event_id)] = entry
+            self._notify(entry.event_type, entry.event_id, entry)
+        logger.info("Event catalog restored with %d events", len(self._entries))
+
+    def get(self, event_type:str, event_id:int) -> Optional[CatalogEntry]:
+        return self._entries.get((event_type, event_id))
+
+    def put(self, event:BaseEvent) -> CatalogEntry:
+        key = (event.event_type, event.event_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = CatalogEntry(event_type=event.event_type, event_id=event.event_id, title=event.title, is_private=False)
+            self._entries[key] = entry
+        entry.title = event.title
+        entry.is_private = bool(event.is_private)
+        entry.category_id = event.category_id
+        entry.start = getattr(event, "start", None)
+        entry.finish = getattr(event, "finish", None)
+        self._notify(entry.event_type, entry.event_id, entry)
+        return entry
+
+    def remove(self, event_type:str, event_id:int):
+        if self._entries.pop((event_type, event_id), None) is not None:
+            self._notify(event_type, event_id, None)
+
+    def all(self) -> List[CatalogEntry]:
+        return list(self._entries.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+event_catalog = EventCatalog()
@@ -0,0 +1,56 @@
+from typing import List, Optional
+
+from src.database.model import BaseEvent
+from src import crud
+from src.crud import PageCursor
+
+
+class EventPager:
+    """Walks the event tables one page at a time.
+
+    Only the current page and the start cursors of the visited pages are kept,
+    so memory does not depend on how many events exist.
+    """
+
+    def __init__(self, page_size:int=25, with_category:bool=False):
+        self.page_size = page_size
+        self.with_category = with_category
+        self.title_contains:Optional[str] = None
+        self.events:List[BaseEvent] = []
+        self._cursors:List[Optional[PageCursor]] = [None]
+        self._next_cursor:Optional[PageCursor] = None
+
+    @property
+    def page(self) -> int:
+        return len(self._cursors)
+
+    @property
+    def has_prev(self) -> bool:
+        return len(self._cursors) > 1
+
+    @property
+    def has_next(self) -> bool:
+        return self._next_cursor is not None
+
+    async def load(self):
+        self.events, self._next_cursor = await crud.read_event_page(
+            self._cursors[-1],
+            limit=self.page_size,
+            title_contains=self.title_contains,
+            with_category=self.with_category,
+        )
+
+    async def next(self):
+        if self.has_next:
+            self._cursors.append(self._next_cursor)
+            await self.load()
+
+    async def prev(self):
+        if self.has_prev:
+            self._cursors.pop()
+            await self.load()
+
+    async def set_filter(self, title_contains:Optional[str]):
+        self.title_contains = title_contains or None
+        self._cursors = [None]
+        await self.load()
@@ -0,0 +1,17 @@
+from typing import Any, Dict, Optional
+import json
+import zlib
+
+# CTFtime payloads are stored as zlib compressed compact JSON
+_COMPRESS_LEVEL = 6
+
+
+def pack_event(payload:Dict[str, Any]) -> bytes:
+    data = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return zlib.compress(data.encode(), _COMPRESS_LEVEL)
+
+
+def unpack_event(data:Optional[bytes]) -> Optional[Dict[str, Any]]:
+    if data is None:
+        return None
+    return json.loads(zlib.decompress(data))
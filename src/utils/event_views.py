@@ -0,0 +1,114 @@
+from typing import List, Optional, Set, Tuple
+from datetime import datetime
+import logging
+
+from discord.ext import commands
+import discord
+
+from src.config import settings
+from src.utils.event_catalog import event_catalog
+from src.utils.interaction_router import interaction_router, CustomId
+from src.utils.interaction_router import JoinButtonId, AnnouncePrivacyButtonId, InfoPrivacyButtonId
+from src.utils.interaction_router import ApproveJoinId, RejectJoinId
+
+logger = logging.getLogger(__name__)
+
+
+# buttons carry their decoded custom_id and hand off to the router
+class RoutedButton(discord.ui.Button):
+    def __init__(self, route:CustomId, **kwargs):
+        super().__init__(custom_id=route.encode(), **kwargs)
+        self.route = route
+
+    async def callback(self, interaction:discord.Interaction):
+        await interaction_router.invoke(interaction, self.route)
+
+
+def _privacy_label(is_private:bool) -> str:
+    return f'Set {"Public" if is_private else "Private"}'
+
+
+class EventAnnouncementView(discord.ui.View):
+    """Join / Set Private buttons under an event announcement."""
+
+    def __init__(self, event_type:str, event_id:int, is_private:bool=False, emoji:Optional[str]=None):
+        super().__init__(timeout=None)
+        self.add_item(RoutedButton(
+            JoinButtonId(event_type, event_id),
+            label='Join',
+            style=discord.ButtonStyle.blurple,
+            emoji=emoji or settings.EMOJI,
+        ))
+        self.add_item(RoutedButton(
+            AnnouncePrivacyButtonId(event_type, event_id),
+            label=_privacy_label(is_private),
+            style=discord.ButtonStyle.gray,
+        ))
+
+
+class EventInfoView(discord.ui.View):
+    """Set Private button in the event info channel."""
+
+    def __init__(self, event_type:str, event_id:int, is_private:bool=False):
+        super().__init__(timeout=None)
+        self.add_item(RoutedButton(
+            InfoPrivacyButtonId(event_type, event_id),
+            label=_privacy_label(is_private),
+            style=discord.ButtonStyle.gray,
+        ))
+
+
+class JoinReviewView(discord.ui.View):
+    """Approve / Reject buttons for a private event join request."""
+
+    def __init__(self, event_type:str, event_id:int, guild_id:int, user_id:int):
+        super().__init__(timeout=None)
+        self.add_item(RoutedButton(
+            ApproveJoinId(event_type, event_id, guild_id, user_id),
+            label='Approve',
+            style=discord.ButtonStyle.green,
+        ))
+        self.add_item(RoutedButton(
+            RejectJoinId(event_type, event_id, guild_id, user_id),
+            label='Reject',
+            style=discord.ButtonStyle.red,
+        ))
+
+
+# events whose buttons are already in the bot's view store
+_registered:Set[Tuple[str, int]] = set()
+
+# py-cord allows 25 components per view
+_VIEW_CAPACITY = 25
+
+
+class _RouteView(discord.ui.View):
+    """Dispatch-only holder for routed buttons of several events, never sent in a message."""
+
+    def __init__(self, buttons:List[RoutedButton]):
+        super().__init__(timeout=None)
+        for button in buttons:
+            self.add_item(button)
+
+
+def register_persistent_views(bot:commands.Bot) -> int:
+    # py-cord scans every stored button on each add_view and on each dispatch. Buttons
+    # are packed 25 to a view, and only events that have not finished are registered,
+    # each once. Buttons of finished events still work through the router fallback
+    # in on_interaction.
+    now = datetime.now().timestamp()
+    entries = [
+        entry for entry in event_catalog.all()
+        if (entry.event_type, entry.event_id) not in _registered and (entry.finish is None or entry.finish >= now)
+    ]
+    buttons:List[RoutedButton] = []
+    for entry in entries:
+        label = _privacy_label(entry.is_private)
+        buttons.append(RoutedButton(JoinButtonId(entry.event_type, entry.event_id), label='Join'))
+        buttons.append(RoutedButton(AnnouncePrivacyButtonId(entry.event_type, entry.event_id), label=label))
+        buttons.append(RoutedButton(InfoPrivacyButtonId(entry.event_type, entry.event_id), label=label))
+        _registered.add((entry.event_type, entry.event_id))
+    for i in range(0, len(buttons), _VIEW_CAPACITY):
+        bot.add_view(_RouteView(buttons[i:i + _VIEW_CAPACITY]))
+    logger.info("Registered persistent views for %d events", len(entries))
+    return len(entries)
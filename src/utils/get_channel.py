@@ -1,21 +1,73 @@
+from typing import Dict, List, Optional, Tuple
 import discord
 from discord.ext import commands
 import logging
 
 from src.config import settings
+from src.utils.guild_config import guild_configs, GuildSettings
 
 logger = logging.getLogger(__name__)
 
+# (guild_id, lowercase name) -> channel id, checked on every hit so a renamed or
+# deleted channel falls through to a scan of that guild only
+_channel_ids:Dict[Tuple[int, str], int] = {}
+
+
+def find_text_channel(guild:discord.Guild, channel_name:str) -> Optional[discord.TextChannel]:
+    key = (guild.id, channel_name.lower())
+    channel_id = _channel_ids.get(key)
+    if channel_id is not None:
+        channel = guild.get_channel(channel_id)
+        if isinstance(channel, discord.TextChannel) and channel.name.lower() == key[1]:
+            return channel
+        del _channel_ids[key]
+
+    for text_channel in guild.text_channels:
+        if text_channel.name.lower() == key[1]:
+            _channel_ids[key] = text_channel.id
+            return text_channel
+    return None
+
+
+def _configured_channel(guild:discord.Guild, channel_id:Optional[int], channel_name:str) -> Optional[discord.TextChannel]:
+    # a channel picked with /ctf_config wins, the name from the environment is the default
+    if not (channel_id is None):
+        channel = guild.get_channel(channel_id)
+        if isinstance(channel, discord.TextChannel):
+            return channel
+    return find_text_channel(guild, channel_name)
+
+
+def find_announcement_channel(guild:discord.Guild) -> Optional[discord.TextChannel]:
+    return _configured_channel(guild, guild_configs.get(guild.id).announcement_channel_id, settings.ANNOUNCEMENT_CHANNEL_NAME)
+
+
+def find_admin_channel(guild:discord.Guild) -> Optional[discord.TextChannel]:
+    return _configured_channel(guild, guild_configs.get(guild.id).admin_channel_id, settings.ADMIN_CHANNEL_NAME)
+
+
+def is_admin_channel(channel) -> bool:
+    guild = getattr(channel, "guild", None)
+    if guild is None:
+        return False
+    admin_channel = find_admin_channel(guild)
+    return not (admin_channel is None) and admin_channel.id == channel.id
+
+
+def forget_guild(guild_id:int):
+    for key in [key for key in _channel_ids if key[0] == guild_id]:
+        del _channel_ids[key]
+
+
 # utils
-async def get_announcement_channel(bot:commands.Bot) -> discord.TextChannel:
+async def get_announcement_channel(bot:commands.Bot, guild:Optional[discord.Guild]=None) -> discord.TextChannel:
+    if not (guild is None):
+        return find_announcement_channel(guild)
     channel_name = settings.ANNOUNCEMENT_CHANNEL_NAME
-    
+
     channel = None
     for guild in bot.guilds:
-        for text_channel in guild.text_channels:
-            if text_channel.name.lower() == channel_name.lower():
-                channel = text_channel
-                break
+        channel = find_announcement_channel(guild)
         if channel:
             break
 
@@ -27,18 +79,29 @@ async def get_announcement_channel(bot:commands.Bot) -> discord.TextChannel:
         logger.error(f"3. The channel exists in the server where the Bot is located")
         await bot.close()
         return
-    
+
     return channel
 
-async def get_admin_channel(bot:commands.Bot) -> discord.TextChannel:
+async def get_announcement_channels(bot:commands.Bot) -> List[Tuple[discord.TextChannel, GuildSettings]]:
+    """Announcement channel of every guild that has one, with that guild's settings."""
+    targets:List[Tuple[discord.TextChannel, GuildSettings]] = []
+    for guild in bot.guilds:
+        channel = find_announcement_channel(guild)
+        if channel:
+            targets.append((channel, guild_configs.get(guild.id)))
+
+    if not targets:
+        logger.error(f"Can't find channel named '{settings.ANNOUNCEMENT_CHANNEL_NAME}' in any server")
+    return targets
+
+async def get_admin_channel(bot:commands.Bot, guild:Optional[discord.Guild]=None) -> discord.TextChannel:
+    if not (guild is None):
+        return find_admin_channel(guild)
     channel_name = settings.ADMIN_CHANNEL_NAME
-    
+
     channel = None
     for guild in bot.guilds:
-        for text_channel in guild.text_channels:
-            if text_channel.name.lower() == channel_name.lower():
-                channel = text_channel
-                break
+        channel = find_admin_channel(guild)
         if channel:
             break
 
@@ -47,5 +110,5 @@ async def get_admin_channel(bot:commands.Bot) -> discord.TextChannel:
         logger.error("Please check: 1) Name correct 2) Bot permissions 3) Channel exists")
         await bot.close()
         return
-    
+
     return channel
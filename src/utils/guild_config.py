@@ -0,0 +1,66 @@
+from typing import Dict, Iterable, Optional
+from dataclasses import dataclass
+import logging
+
+from src.config import settings
+from src.database.model import GuildConfig
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class GuildSettings:
+    """Effective settings of one guild, environment defaults filled in."""
+    guild_id:int
+    announcement_channel_id:Optional[int]=None # None: channel named ANNOUNCEMENT_CHANNEL_NAME
+    admin_channel_id:Optional[int]=None # None: channel named ADMIN_CHANNEL_NAME
+    timezone:str=settings.TIMEZONE
+    emoji:str=settings.EMOJI
+
+
+class GuildConfigCache:
+    """In-memory copy of the guild_configs table.
+
+    Loaded once at startup and kept current by the crud functions that write the
+    table (write-through), so lookups on the interaction and announcement paths
+    never query the database. Replicas that did not make a change pick it up on
+    the next reload from the check loop.
+    """
+
+    def __init__(self):
+        self._configs:Dict[int, GuildSettings] = {}
+
+    def load(self, rows:Iterable[GuildConfig]):
+        configs = {}
+        for row in rows:
+            configs[row.guild_id] = self._from_row(row)
+        self._configs = configs
+        logger.info("Guild config loaded for %d guilds", len(configs))
+
+    def _from_row(self, row:GuildConfig) -> GuildSettings:
+        return GuildSettings(
+            guild_id=row.guild_id,
+            announcement_channel_id=row.announcement_channel_id,
+            admin_channel_id=row.admin_channel_id,
+            timezone=row.timezone or settings.TIMEZONE,
+            emoji=row.emoji or settings.EMOJI,
+        )
+
+    def get(self, guild_id:Optional[int]) -> GuildSettings:
+        config = self._configs.get(guild_id)
+        if config is None:
+            return GuildSettings(guild_id=guild_id)
+        return config
+
+    def put(self, row:GuildConfig) -> GuildSettings:
+        config = self._configs[row.guild_id] = self._from_row(row)
+        return config
+
+    def remove(self, guild_id:int):
+        self._configs.pop(guild_id, None)
+
+    def __len__(self) -> int:
+        return len(self._configs)
+
+
+guild_configs = GuildConfigCache()
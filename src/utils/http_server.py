@@ -0,0 +1,58 @@
+from typing import Awaitable, Callable, Dict, Optional
+import logging
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+RouteHandler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+class HttpServer:
+    """Small local HTTP server shared by the features that expose an endpoint.
+
+    Routes live in a plain dict looked up by one catch-all handler, so cogs can
+    add or remove them while the server is running.
+    """
+
+    def __init__(self):
+        self._routes:Dict[str, RouteHandler] = {}
+        self._runner:Optional[web.AppRunner] = None
+
+    @property
+    def running(self) -> bool:
+        return self._runner is not None
+
+    def add_route(self, path:str, handler:RouteHandler):
+        if path in self._routes:
+            raise ValueError(f"http route {path} is already registered")
+        self._routes[path] = handler
+
+    def remove_route(self, path:str):
+        self._routes.pop(path, None)
+
+    async def _dispatch(self, request:web.Request) -> web.StreamResponse:
+        if request.method not in ("GET", "HEAD"):
+            return web.Response(status=405)
+        handler = self._routes.get(request.path)
+        if handler is None:
+            return web.Response(status=404)
+        return await handler(request)
+
+    async def start(self, host:str, port:int):
+        if self.running:
+            return
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self._dispatch)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        logger.info(f"HTTP server listening on {host}:{port}")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+http_server = HttpServer()
@@ -0,0 +1,147 @@
+from typing import Dict, Optional, Tuple
+from datetime import datetime, timezone
+import hashlib
+import logging
+
+from aiohttp import web
+
+from src.utils.event_catalog import EventCatalog, CatalogEntry, event_catalog
+
+logger = logging.getLogger(__name__)
+
+_HEADER = (
+    b"BEGIN:VCALENDAR\r\n"
+    b"VERSION:2.0\r\n"
+    b"PRODID:-//CTFeed//CTF events//EN\r\n"
+    b"CALSCALE:GREGORIAN\r\n"
+    b"METHOD:PUBLISH\r\n"
+    b"X-WR-CALNAME:CTFeed\r\n"
+)
+_FOOTER = b"END:VCALENDAR\r\n"
+
+
+def _escape(text:str) -> str:
+    # RFC 5545 3.3.11
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _fold(line:str) -> bytes:
+    # RFC 5545 3.1, lines are at most 75 octets, continuations start with a space
+    data = line.encode()
+    if len(data) <= 75:
+        return data + b"\r\n"
+    parts = []
+    chunk = b""
+    for char in line:
+        encoded = char.encode()
+        if len(chunk) + len(encoded) > 75:
+            parts.append(chunk)
+            chunk = b" "
+        chunk += encoded
+    parts.append(chunk)
+    return b"\r\n".join(parts) + b"\r\n"
+
+
+def _format_time(timestamp:float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _content_key(entry:CatalogEntry) -> Tuple:
+    return (entry.title, int(entry.start), int(entry.finish))
+
+
+def render_vevent(entry:CatalogEntry, stamp:float) -> bytes:
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:ctftime-{entry.event_id}@ctfeed",
+        f"DTSTAMP:{_format_time(stamp)}",
+        f"DTSTART:{_format_time(entry.start)}",
+        f"DTEND:{_format_time(entry.finish)}",
+        f"SUMMARY:{_escape(entry.title)}",
+        f"URL:https://ctftime.org/event/{entry.event_id}",
+        "END:VEVENT",
+    ]
+    return b"".join(_fold(line) for line in lines)
+
+
+class IcalFeed:
+    """iCalendar feed of the CTFtime events in the catalog.
+
+    Each VEVENT is rendered once and kept as bytes with the content it was
+    rendered from; catalog changes only re-render the event that changed. The
+    whole feed and its ETag are assembled lazily on the next read.
+    """
+
+    def __init__(self, catalog:EventCatalog):
+        self._vevents:Dict[int, Tuple[Tuple, bytes]] = {}
+        self._body:Optional[bytes] = None
+        self._etag:Optional[str] = None
+        self.last_modified:datetime = datetime.now(timezone.utc)
+        self.renders:int = 0
+        catalog.add_listener(self.on_catalog_change)
+        for entry in catalog.all():
+            self.on_catalog_change(entry.event_type, entry.event_id, entry)
+
+    def on_catalog_change(self, event_type:str, event_id:int, entry:Optional[CatalogEntry]):
+        if event_type != "event":
+            return
+        if entry is None or entry.start is None or entry.finish is None:
+            if self._vevents.pop(event_id, None) is not None:
+                self._invalidate()
+            return
+
+        key = _content_key(entry)
+        cached = self._vevents.get(event_id)
+        if cached is not None and cached[0] == key:
+            return
+        self._vevents[event_id] = (key, render_vevent(entry, datetime.now().timestamp()))
+        self.renders += 1
+        self._invalidate()
+
+    def _invalidate(self):
+        self._body = None
+        self._etag = None
+        self.last_modified = datetime.now(timezone.utc)
+
+    def _build(self):
+        # sorted by start so the output is stable for the same content
+        vevents = sorted(self._vevents.values(), key=lambda item: (item[0][1], item[0][0]))
+        self._body = _HEADER + b"".join(vevent for _, vevent in vevents) + _FOOTER
+        self._etag = f'"{hashlib.sha1(self._body).hexdigest()}"'
+
+    @property
+    def body(self) -> bytes:
+        if self._body is None:
+            self._build()
+        return self._body
+
+    @property
+    def etag(self) -> str:
+        if self._etag is None:
+            self._build()
+        return self._etag
+
+    def __len__(self) -> int:
+        return len(self._vevents)
+
+
+ical_feed = IcalFeed(event_catalog)
+
+
+async def handle_calendar(request:web.Request) -> web.Response:
+    headers = {
+        "ETag": ical_feed.etag,
+        "Last-Modified": ical_feed.last_modified.strftime("%a, %d %b %Y %H:%M:%S GMT"),
+        "Cache-Control": "no-cache",
+    }
+    # clients polling an unchanged feed get a bodiless 304
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if ical_feed.etag in tags or "*" in tags:
+            return web.Response(status=304, headers=headers)
+    elif request.if_modified_since is not None and \
+        ical_feed.last_modified.replace(microsecond=0) <= request.if_modified_since:
+        return web.Response(status=304, headers=headers)
+
+    return web.Response(body=ical_feed.body, content_type="text/calendar", charset="utf-8", headers=headers)
@@ -0,0 +1,176 @@
+from typing import Awaitable, Callable, ClassVar, Dict, Optional, Tuple, Type
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+import logging
+import time
+
+import discord
+
+from src.utils.metrics import INTERACTION_DURATION, INTERACTION_ERRORS
+from src.utils.log_pipeline import log_context
+
+logger = logging.getLogger(__name__)
+
+
+# custom_id codec
+# every custom_id is "<prefix>:<action>:<args...>", the first two fields select the handler
+@dataclass(frozen=True)
+class CustomId(ABC):
+    PREFIX:ClassVar[str] = ""
+
+    @abstractmethod
+    def encode(self) -> str:
+        ...
+
+    @classmethod
+    @abstractmethod
+    def decode(cls, args:str) -> "CustomId":
+        ...
+
+
+@dataclass(frozen=True)
+class EventButtonId(CustomId):
+    event_type:str # event/custom
+    event_id:int
+
+    @property
+    def event_data(self) -> str:
+        return f"{self.event_type}:{self.event_id}"
+
+    def encode(self) -> str:
+        return f"{self.PREFIX}:{self.event_data}"
+
+    @classmethod
+    def decode(cls, args:str) -> "EventButtonId":
+        event_type, event_id = args.split(":")
+        return cls(event_type=event_type, event_id=int(event_id))
+
+
+@dataclass(frozen=True)
+class JoinButtonId(EventButtonId):
+    PREFIX:ClassVar[str] = "ctf_join_channel:event"
+
+
+@dataclass(frozen=True)
+class AnnouncePrivacyButtonId(EventButtonId):
+    PREFIX:ClassVar[str] = "ctf_join_channel:private"
+
+
+@dataclass(frozen=True)
+class InfoPrivacyButtonId(EventButtonId):
+    PREFIX:ClassVar[str] = "ctf_info:private"
+
+
+@dataclass(frozen=True)
+class JoinReviewId(CustomId):
+    event_type:str
+    event_id:int
+    guild_id:int
+    user_id:int
+
+    @property
+    def event_data(self) -> str:
+        return f"{self.event_type}:{self.event_id}"
+
+    def encode(self) -> str:
+        return f"{self.PREFIX}:{self.event_type}:{self.event_id}:{self.guild_id}:{self.user_id}"
+
+    @classmethod
+    def decode(cls, args:str) -> "JoinReviewId":
+        event_type, event_id, guild_id, user_id = args.split(":")
+        return cls(event_type=event_type, event_id=int(event_id), guild_id=int(guild_id), user_id=int(user_id))
+
+
+@dataclass(frozen=True)
+class ApproveJoinId(JoinReviewId):
+    PREFIX:ClassVar[str] = "ctf_admin_approve:join"
+
+
+@dataclass(frozen=True)
+class RejectJoinId(JoinReviewId):
+    PREFIX:ClassVar[str] = "ctf_admin_reject:join"
+
+
+# router
+Handler = Callable[[discord.Interaction, CustomId], Awaitable[None]]
+
+
+@dataclass
+class HandlerStats:
+    count:int = 0
+    errors:int = 0
+    total:float = 0.0
+    max:float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class InteractionRouter:
+    """Dispatch component interactions to exactly one handler by custom_id prefix."""
+
+    def __init__(self):
+        self._routes:Dict[str, Tuple[Type[CustomId], Handler]] = {}
+        self.stats:Dict[str, HandlerStats] = {}
+
+    def add(self, codec:Type[CustomId], handler:Handler):
+        if codec.PREFIX in self._routes:
+            raise ValueError(f"custom_id prefix {codec.PREFIX} is already routed")
+        self._routes[codec.PREFIX] = (codec, handler)
+        self.stats[codec.PREFIX] = HandlerStats()
+
+    def remove(self, codec:Type[CustomId]):
+        self._routes.pop(codec.PREFIX, None)
+        self.stats.pop(codec.PREFIX, None)
+
+    def resolve(self, custom_id:str) -> Optional[Tuple[Type[CustomId], Handler, str]]:
+        parts = custom_id.split(":", 2)
+        if len(parts) != 3:
+            return None
+        route = self._routes.get(f"{parts[0]}:{parts[1]}")
+        if route is None:
+            return None
+        return route[0], route[1], parts[2]
+
+    async def dispatch(self, interaction:discord.Interaction) -> bool:
+        """Return True if the interaction matched a route."""
+        custom_id = (interaction.data or {}).get("custom_id")
+        if custom_id is None:
+            return False
+
+        resolved = self.resolve(custom_id)
+        if resolved is None:
+            return False
+        codec, handler, args = resolved
+
+        try:
+            decoded = codec.decode(args)
+        except Exception:
+            await interaction.response.send_message("Invalid arguments", ephemeral=True)
+            return True
+
+        await self.invoke(interaction, decoded)
+        return True
+
+    async def invoke(self, interaction:discord.Interaction, custom_id:CustomId):
+        """Run the handler for an already decoded custom_id."""
+        _, handler = self._routes[custom_id.PREFIX]
+        stats = self.stats[custom_id.PREFIX]
+        start = time.perf_counter()
+        try:
+            with log_context(guild_id=interaction.guild_id, event_id=getattr(custom_id, "event_id", None)):
+                await handler(interaction, custom_id)
+        except Exception:
+            stats.errors += 1
+            INTERACTION_ERRORS.labels(custom_id.PREFIX).inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            stats.count += 1
+            stats.total += elapsed
+            stats.max = max(stats.max, elapsed)
+            INTERACTION_DURATION.labels(custom_id.PREFIX).observe(elapsed)
+
+
+interaction_router = InteractionRouter()
@@ -1,21 +1,39 @@
-from typing import Optional, List
+from typing import Dict, Optional, Tuple
+from dataclasses import dataclass
+import asyncio
 import logging
+import time
+import weakref
 
 from discord.ext import commands
 import discord
 
-from src.database.model import Event
 from src.database.database import get_db
 import src.crud.event as crud_event
 import src.crud.custom_event as crud_custom_event
 from src.utils.ctf_api import fetch_ctf_events
 from src.utils.embed_creator import create_event_embed, create_custom_event_embed
 from src.utils.get_channel import get_announcement_channel, get_admin_channel
-from src.config import settings
+from src.utils.event_catalog import event_catalog, CatalogEntry
+from src.utils.guild_config import guild_configs
+from src.utils.member_resolver import member_resolver
+from src.utils.event_views import EventAnnouncementView, EventInfoView, JoinReviewView
+from src.utils.workspace import create_event_category_with_channels, workspace_pool
+from src.utils.metrics import JOIN_DURATION, WORKSPACES_CREATED, observe_ack
 
 
 logger = logging.getLogger(__name__)
 
+# one workspace provisioning at a time per event, concurrent first joins would each create a category
+_provision_locks: "weakref.WeakValueDictionary[Tuple[str, int], asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def _provision_lock(event_type: str, event_id: int) -> asyncio.Lock:
+    lock = _provision_locks.get((event_type, event_id))
+    if lock is None:
+        lock = _provision_locks[(event_type, event_id)] = asyncio.Lock()
+    return lock
+
 
 def _get_child_text_channel(category: discord.CategoryChannel, name: str) -> Optional[discord.TextChannel]:
     for ch in category.channels:
@@ -35,14 +53,54 @@ def _get_info_channel(category: discord.CategoryChannel) -> Optional[discord.Tex
     return None
 
 
-async def _get_or_create_event_role(guild: discord.Guild, title: str) -> discord.Role:
-    role_name = f"ctf {"".join(c for c in title.lower() if c.isalnum())}"
+def _event_role_name(title: str) -> str:
+    return f"ctf {"".join(c for c in title.lower() if c.isalnum())}"
+
+
+# (guild_id, role name) -> role_id, saves scanning guild.roles on every join
+_event_role_ids: Dict[Tuple[int, str], int] = {}
+
+
+def _find_event_role(guild: discord.Guild, title: str) -> Optional[discord.Role]:
+    role_name = _event_role_name(title).lower()
+    role_id = _event_role_ids.get((guild.id, role_name))
+    if role_id is not None:
+        role = guild.get_role(role_id)
+        if role is not None and role.name.lower() == role_name:
+            return role
+        del _event_role_ids[(guild.id, role_name)]
     for role in guild.roles:
-        if role.name.lower() == role_name.lower():
+        if role.name.lower() == role_name:
+            _event_role_ids[(guild.id, role_name)] = role.id
             return role
-    return await guild.create_role(name=role_name, mentionable=False, hoist=False, reason=f"Create role for event {title}")
+    return None
+
+
+async def _get_or_create_event_role(guild: discord.Guild, title: str) -> discord.Role:
+    role = _find_event_role(guild, title)
+    if role is not None:
+        return role
+    role = await guild.create_role(name=_event_role_name(title), mentionable=False, hoist=False, reason=f"Create role for event {title}")
+    _event_role_ids[(guild.id, role.name.lower())] = role.id
+    return role
+
+
+def export_role_map() -> list:
+    return [[guild_id, role_name, role_id] for (guild_id, role_name), role_id in _event_role_ids.items()]
+
+
+def restore_role_map(entries: list):
+    for guild_id, role_name, role_id in entries:
+        _event_role_ids[(guild_id, role_name)] = role_id
+
+
+def forget_guild_roles(guild_id: int):
+    for key in [key for key in _event_role_ids if key[0] == guild_id]:
+        del _event_role_ids[key]
 
 async def _ensure_role_permission(category: discord.CategoryChannel, role: discord.Role):
+    if category.overwrites_for(role).view_channel is True:
+        return
     try:
         await category.set_permissions(role, view_channel=True)
     except Exception:
@@ -56,36 +114,26 @@ async def get_info_channel_for_category(bot: commands.Bot, category_id: int) ->
     return _get_info_channel(cat)
 
 
-async def _create_event_category_with_channels(
-    guild: discord.Guild,
-    name: str,
-    overwrites: dict,
-) -> discord.CategoryChannel:
-    # Create category
-    category = await guild.create_category(name, overwrites=overwrites)
-
-    # Create child channels
-    await guild.create_text_channel("資訊", category=category)
-    await guild.create_text_channel("聊天", category=category)
-    # Try to create a forum channel for problems; fallback to text
-    try:
-        # py-cord supports create_forum_channel
-        await guild.create_forum_channel("題目", category=category)
-    except Exception as e:
-        logger.warning(f"Failed to create forum channel, falling back to text channel: {e}")
-        await guild.create_text_channel("題目", category=category)
+@dataclass
+class JoinContext:
+    """State of one join/approval interaction, resolved once and passed down the pipeline."""
+    event_type: str
+    event_id: int
+    event: Optional[CatalogEntry] = None
+    guild: Optional[discord.Guild] = None
+    member: Optional[discord.Member] = None
+    role: Optional[discord.Role] = None
 
-    return category
+    @property
+    def event_data(self) -> str:
+        return f"{self.event_type}:{self.event_id}"
 
-async def join_request(
-    bot: commands.Bot,
-    interaction: discord.Interaction,
-    event_data: str,
-):
-    await interaction.response.defer(ephemeral=True)
 
-    event_type = str(event_data.split(":")[0])
-    event_id = int(event_data.split(":")[1])
+async def _resolve_event(event_type: str, event_id: int) -> Optional[CatalogEntry]:
+    # catalog first, database at most once
+    entry = event_catalog.get(event_type, event_id)
+    if entry is not None:
+        return entry
 
     events = []
     async with get_db() as session:
@@ -93,167 +141,233 @@ async def join_request(
             events = await crud_event.read_event(session, event_id=[event_id])
         elif event_type == "custom":
             events = await crud_custom_event.read_event(session, event_id=[event_id])
-        if len(events) != 1:
-            await interaction.followup.send(content="Invalid event", ephemeral=True)
-            return
-        event = events[0]
-        guild_id = interaction.guild.id
-        user_id = interaction.user.id
-
-        # If event marked private, request admin approval first
-        if (not getattr(interaction.user, "guild_permissions", None) or not interaction.user.guild_permissions.administrator) and event.is_private:
-            try:
-                admin_channel = await get_admin_channel(bot)
-                view = discord.ui.View(timeout=None)
-                view.add_item(
-                    discord.ui.Button(
-                        label='Approve',
-                        style=discord.ButtonStyle.green,
-                        custom_id=f"ctf_admin_approve:join:{event_type}:{event_id}:{guild_id}:{user_id}",
-                    )
-                )
-                view.add_item(
-                    discord.ui.Button(
-                        label='Reject',
-                        style=discord.ButtonStyle.red,
-                        custom_id=f"ctf_admin_reject:join:{event_type}:{event_id}:{guild_id}:{user_id}",
-                    )
-                )
-                embed = discord.Embed(
-                    title="審核請求：加入私密活動",
-                    description=(
-                        f"使用者 <@{user_id}> 請求加入：{event.title} (event_id={event.event_id})"
-                    ),
-                    color=discord.Color.orange(),
-                )
-                await admin_channel.send(embed=embed, view=view)
-                await interaction.followup.send(content="已送交管理員審核，請稍候。", ephemeral=True)
-                return
-            except Exception as e:
-                logger.error(f"Failed to send admin approval request: {e}")
-                await interaction.followup.send(content=f"審核請求失敗：{e}", ephemeral=True)
-                return
+    if len(events) != 1:
+        return None
+    return event_catalog.put(events[0])
 
-        if await join_channel(bot, interaction, event_data, guild_id, user_id):
-            await interaction.followup.send(content="Done", ephemeral=True)
 
-async def join_channel(
+async def resolve_join_context(
     bot: commands.Bot,
-    interaction: discord.Interaction,
     event_data: str,
     guild_id: int,
     user_id: int,
+    member: Optional[discord.Member] = None,
+) -> JoinContext:
+    event_type = str(event_data.split(":")[0])
+    event_id = int(event_data.split(":")[1])
+    ctx = JoinContext(event_type=event_type, event_id=event_id)
+
+    ctx.event = await _resolve_event(event_type, event_id)
+    ctx.guild = bot.get_guild(guild_id)
+    if ctx.guild is not None:
+        # approvals name someone other than the interaction's user, resolved from cache or fetched
+        ctx.member = await member_resolver.resolve(ctx.guild, user_id, member)
+        if ctx.event is not None:
+            ctx.role = _find_event_role(ctx.guild, ctx.event.title)
+    return ctx
+
+
+async def join_request(
+    bot: commands.Bot,
+    interaction: discord.Interaction,
+    event_data: str,
+):
+    await interaction.response.defer(ephemeral=True)
+    observe_ack(interaction, "join")
+
+    guild_id = interaction.guild.id
+    user_id = interaction.user.id
+    member = interaction.user if isinstance(interaction.user, discord.Member) else None
+    ctx = await resolve_join_context(bot, event_data, guild_id, user_id, member)
+    event = ctx.event
+    if event is None:
+        await interaction.followup.send(content="Invalid event", ephemeral=True)
+        return
+
+    # If event marked private, request admin approval first
+    if (not getattr(interaction.user, "guild_permissions", None) or not interaction.user.guild_permissions.administrator) and event.is_private:
+        try:
+            admin_channel = await get_admin_channel(bot, interaction.guild)
+            if admin_channel is None:
+                raise RuntimeError("no admin channel in this server, see /ctf_config admin_channel")
+            view = JoinReviewView(ctx.event_type, ctx.event_id, guild_id, user_id)
+            embed = discord.Embed(
+                title="審核請求：加入私密活動",
+                description=(
+                    f"使用者 <@{user_id}> 請求加入：{event.title} (event_id={event.event_id})"
+                ),
+                color=discord.Color.orange(),
+            )
+            await admin_channel.send(embed=embed, view=view)
+            await interaction.followup.send(content="已送交管理員審核，請稍候。", ephemeral=True)
+            return
+        except Exception as e:
+            logger.error("Failed to send admin approval request: %s", e)
+            await interaction.followup.send(content=f"審核請求失敗：{e}", ephemeral=True)
+            return
+
+    if await join_channel(bot, interaction, ctx):
+        await interaction.followup.send(content="Done", ephemeral=True)
+
+async def join_channel(
+    bot: commands.Bot,
+    interaction: discord.Interaction,
+    ctx: JoinContext,
     fromadmin: bool=False,
 ):
-    messager = interaction.followup.send if not fromadmin else interaction.response.send_message
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        joined = await _join_channel(bot, interaction, ctx, fromadmin)
+        outcome = "joined" if joined else "rejected"
+        return joined
+    finally:
+        JOIN_DURATION.labels(outcome).observe(time.perf_counter() - start)
 
-    event_type = str(event_data.split(":")[0])
-    event_id = int(event_data.split(":")[1])
 
-    async with get_db() as session:
-        # get event from database
-        events = []
-        if event_type == "event":
-            events = await crud_event.read_event(session, event_id=[event_id])
-        elif event_type == "custom":
-            events = await crud_custom_event.read_event(session, event_id=[event_id])
-        if len(events) != 1:
-            await messager(content="Invalid event", ephemeral=True)
-            return False
-        event = events[0]
+async def _join_channel(
+    bot: commands.Bot,
+    interaction: discord.Interaction,
+    ctx: JoinContext,
+    fromadmin: bool,
+):
+    # admin approvals are deferred by the button handler, so everything goes through followups
+    messager = interaction.followup.send
+
+    event_type = ctx.event_type
+    event_id = ctx.event_id
+    event = ctx.event
+    if event is None:
+        await messager(content="Invalid event", ephemeral=True)
+        return False
 
-        guild = bot.get_guild(guild_id)
-        if guild is None:
-            await messager(content="Guild not found", ephemeral=True)
-            return False
-        member = guild.get_member(user_id)
-        user = bot.get_user(user_id)
-        if member is None:
-            await messager(content="Member not found", ephemeral=True)
-            return False
+    guild = ctx.guild
+    if guild is None:
+        await messager(content="Guild not found", ephemeral=True)
+        return False
+    member = ctx.member
+    if member is None:
+        await messager(content="Member not found", ephemeral=True)
+        return False
+    user = member
+
+    existing = bot.get_channel(event.category_id) if event.category_id else None
+    if event_type == "event" and not isinstance(existing, discord.CategoryChannel):
+        async with _provision_lock(event_type, event_id):
+            # the catalog entry is shared, a join that held the lock may have provisioned already
+            existing = bot.get_channel(event.category_id) if event.category_id else None
+            if not isinstance(existing, discord.CategoryChannel):
+                return await _create_event_workspace(interaction, ctx, fromadmin)
+
+    if isinstance(existing, discord.CategoryChannel) and existing.guild.id != guild.id:
+        # one workspace per event, announced everywhere but created in the first guild that joined
+        await messager(content=f"{event.title} 的頻道位於其他伺服器（{existing.guild.name}）", ephemeral=True)
+        return False
 
-        existing = bot.get_channel(event.category_id) if event.category_id else None
-        role = await _get_or_create_event_role(guild, event.title)
-        if isinstance(existing, discord.CategoryChannel):
-            try:
-                info_ch = _get_info_channel(existing)
-                if info_ch:
-                    await info_ch.send(embed=discord.Embed(
-                        color=discord.Color.green(),
-                        title=f"{user.display_name} joined the event"
-                    ))
-
-                logger.info(
-                    f"User {user.display_name}(id={user.id}) joined event {existing.name}(id={event.event_id})"
-                )
-                if fromadmin:
-                    await interaction.response.edit_message(content=(f"Approved: ok"), view=None)
-
-                await _ensure_role_permission(existing, role)
-                if role not in member.roles:
-                    await member.add_roles(role, reason=f"Join event {event.event_id}")
-                else:
-                    await messager(content="You have joined the event", ephemeral=True)
-                    return False
-
-                return True
-            except Exception as e:
-                logger.error(f"Failed to join event: {e}")
-                await messager(content=f"Failed to join event: {e}", ephemeral=True)
+    if isinstance(existing, discord.CategoryChannel):
+        role = ctx.role
+        try:
+            info_ch = _get_info_channel(existing)
+            if info_ch:
+                await info_ch.send(embed=discord.Embed(
+                    color=discord.Color.green(),
+                    title=f"{user.display_name} joined the event"
+                ))
+
+            logger.info(
+                "User %s(id=%s) joined event %s(id=%s)", user.display_name, user.id, existing.name, event.event_id
+            )
+            if fromadmin:
+                await interaction.edit_original_response(content="Approved: ok", view=None)
+
+            if role is None:
+                role = ctx.role = await _get_or_create_event_role(guild, event.title)
+            await _ensure_role_permission(existing, role)
+            if role not in member.roles:
+                await member.add_roles(role, reason=f"Join event {event.event_id}")
+            else:
+                await messager(content="You have joined the event", ephemeral=True)
                 return False
 
-        if event_type == "event":
+            return True
+        except Exception as e:
+            logger.error("Failed to join event: %s", e)
+            await messager(content=f"Failed to join event: {e}", ephemeral=True)
+            return False
+
+    await messager(content="Invalid event", ephemeral=True)
+    return False
+
+
+async def _create_event_workspace(
+    interaction: discord.Interaction,
+    ctx: JoinContext,
+    fromadmin: bool,
+) -> bool:
+    messager = interaction.followup.send
+    event = ctx.event
+    guild = ctx.guild
+    member = user = ctx.member
+    role = ctx.role
+
+    async with get_db() as session:
+        event_api = await crud_event.read_event_snapshot(session, event.event_id)
+        if event_api is None:
+            # rows ingested before snapshots existed, fetch once and keep it
             events_api = await fetch_ctf_events(event.event_id)
             if len(events_api) != 1:
                 await messager(content="Invalid event", ephemeral=True)
                 return False
             event_api = events_api[0]
-
+            await crud_event.update_event(session, event_id=event.event_id, snapshot=event_api)
+
+        # a pooled workspace only needs a rename; its placeholder role becomes the event role
+        claimed = None
+        if role is None:
+            claimed = await workspace_pool.claim(guild, event.title, _event_role_name(event.title))
+        if claimed is not None:
+            category, role = claimed
+        else:
+            if role is None:
+                role = await _get_or_create_event_role(guild, event.title)
             overwrites = {
                 guild.default_role: discord.PermissionOverwrite(view_channel=False),
                 role: discord.PermissionOverwrite(view_channel=True),
                 guild.me: discord.PermissionOverwrite(view_channel=True),
             }
-
-            category = await _create_event_category_with_channels(guild, event.title, overwrites)
-            updated = await crud_event.update_event(session, event_id=event.event_id, category_id=category.id)
-            if updated is None:
-                await messager(
-                    content=f"Failed to create: database update failed for event_id={event.event_id}",
-                    ephemeral=True,
-                )
-                try:
-                    await category.delete(reason="DB update failed for event creation")
-                except Exception:
-                    pass
-                return False
-
-            if fromadmin:
-                await interaction.response.edit_message(content=(f"Approved: ok"), view=None)
-
-            await _ensure_role_permission(category, role)
+            category = await create_event_category_with_channels(guild, event.title, overwrites)
+        ctx.role = role
+        updated = await crud_event.update_event(session, event_id=event.event_id, category_id=category.id)
+        if updated is None:
+            await messager(
+                content=f"Failed to create: database update failed for event_id={event.event_id}",
+                ephemeral=True,
+            )
             try:
-                await member.add_roles(role, reason=f"Join event {event.event_id}")
+                await category.delete(reason="DB update failed for event creation")
             except Exception:
                 pass
+            return False
+        WORKSPACES_CREATED.inc()
 
-            info_ch = _get_info_channel(category)
-            if info_ch:
-                embed = await create_event_embed(event_api, f"{user.display_name} 發起了 {event.title}")
-                view = discord.ui.View(timeout=None)
-                view.add_item(
-                    discord.ui.Button(
-                        label='Set Private',
-                        style=discord.ButtonStyle.gray,
-                        custom_id=f"ctf_info:private:{event_data}",
-                        )
-                )
-                await info_ch.send(embed=embed, view=view)
+        if fromadmin:
+            await interaction.edit_original_response(content="Approved: ok", view=None)
+
+        try:
+            await member.add_roles(role, reason=f"Join event {event.event_id}")
+        except Exception:
+            pass
+
+        info_ch = _get_info_channel(category)
+        if info_ch:
+            embed = await create_event_embed(event_api, f"{user.display_name} 發起了 {event.title}", guild_configs.get(guild.id).timezone)
+            await info_ch.send(embed=embed, view=EventInfoView(ctx.event_type, ctx.event_id, event.is_private))
+
+        logger.info(
+            "User %s(id=%s) created and joined event %s(id=%s)", user.display_name, user.id, event.title, event.event_id
+        )
+        return True
 
-            logger.info(
-                f"User {user.display_name}(id={user.id}) created and joined event {event.title}(id={event.event_id})"
-            )
-            return True
 
 async def create_custom_channel(
     bot: commands.Bot,
@@ -263,25 +377,26 @@ async def create_custom_channel(
     await interaction.response.defer(ephemeral=True)
 
     guild = interaction.guild
-    member = guild.get_member(interaction.user.id)
-
-    overwrites = {
-        guild.default_role: discord.PermissionOverwrite(view_channel=False),
-        guild.me: discord.PermissionOverwrite(view_channel=True),
-    }
+    member = await member_resolver.resolve(guild, interaction.user.id, interaction.user)
 
     try:
-        if len(await crud_custom_event.read_event(session, title=[name])) > 0:
-            await interaction.followup.send(content="Custom event with this name already exists", ephemeral=True)
-            return
-        category = await _create_event_category_with_channels(guild, name, overwrites)
+        async with get_db() as session:
+            if len(await crud_custom_event.read_event(session, title=[name])) > 0:
+                await interaction.followup.send(content="Custom event with this name already exists", ephemeral=True)
+                return
+
+        role = await _get_or_create_event_role(guild, name)
+        overwrites = {
+            guild.default_role: discord.PermissionOverwrite(view_channel=False),
+            role: discord.PermissionOverwrite(view_channel=True),
+            guild.me: discord.PermissionOverwrite(view_channel=True),
+        }
+        category = await create_event_category_with_channels(guild, name, overwrites)
 
         # record custom category
         async with get_db() as session:
             event = await crud_custom_event.create_event(session, title=name, category_id=category.id)
 
-        role = await _get_or_create_event_role(guild, event.title)
-        await _ensure_role_permission(category, role)
         try:
             if member:
                 await member.add_roles(role, reason=f"Create custom event {name}")
@@ -291,43 +406,21 @@ async def create_custom_channel(
         info_ch = _get_info_channel(category)
         if info_ch:
             embed = await create_custom_event_embed(name, f"{interaction.user.display_name} 發起了 {name}")
-            view = discord.ui.View(timeout=None)
-            view.add_item(
-                discord.ui.Button(
-                    label='Set Private',
-                    style=discord.ButtonStyle.gray,
-                    custom_id=f"ctf_info:private:custom:{event.event_id}",
-                    )
-            )
-            await info_ch.send(embed=embed, view=view)
-
-        channel:discord.TextChannel = await get_announcement_channel(bot)
-        embed = await create_custom_event_embed(name, f"{interaction.user.display_name} 發起了 {name}")
-        view = discord.ui.View(timeout=None)
-        view.add_item(
-            discord.ui.Button(
-                label='Join',
-                style=discord.ButtonStyle.blurple,
-                custom_id=f"ctf_join_channel:event:custom:{event.event_id}",
-                emoji=settings.EMOJI,
-            )
-        )
-        view.add_item(
-            discord.ui.Button(
-                label='Set Private',
-                style=discord.ButtonStyle.gray,
-                custom_id=f"ctf_join_channel:private:custom:{event.event_id}",
-                )
-        )
-        await channel.send(embed=embed, view=view)
+            await info_ch.send(embed=embed, view=EventInfoView("custom", event.event_id))
+
+        channel:discord.TextChannel = await get_announcement_channel(bot, guild)
+        if channel:
+            embed = await create_custom_event_embed(name, f"{interaction.user.display_name} 發起了 {name}")
+            view = EventAnnouncementView("custom", event.event_id, emoji=guild_configs.get(guild.id).emoji)
+            await channel.send(embed=embed, view=view)
 
         await interaction.followup.send(content="Done", ephemeral=True)
         logger.info(
-            f"User {interaction.user.display_name}(id={interaction.user.id}) created custom event {event.title}(id={event.event_id})"
+            "User %s(id=%s) created custom event %s(id=%s)", interaction.user.display_name, interaction.user.id, event.title, event.event_id
         )
         return
     except Exception as e:
-        logger.error(f"Failed to create custom event: {e}")
+        logger.error("Failed to create custom event: %s", e)
         await interaction.followup.send(content=f"Failed to create custom event: {e}", ephemeral=True)
         return
 
@@ -335,47 +428,46 @@ async def set_private(
     bot: commands.Bot,
     interaction: discord.Interaction,
     event_data: str,
-):
+) -> Optional[CatalogEntry]:
+    """Toggle privacy; returns the updated event, or None after answering the interaction with an error."""
     try:
         if not getattr(interaction.user, "guild_permissions", None) or not interaction.user.guild_permissions.administrator:
             await interaction.response.send_message(content="你沒有權限使用此功能（需要 Administrator）", ephemeral=True)
-            return False
+            return None
     except Exception:
         await interaction.response.send_message(content="權限檢查失敗，請於伺服器中使用此功能", ephemeral=True)
-        return False
+        return None
 
-    async with get_db() as session:
-        event_type = str(event_data.split(":")[0])
-        event_id = int(event_data.split(":")[1])
-        # get event from database
-        events = []
-        if event_type == "event":
-            events = await crud_event.read_event(session, event_id=[event_id])
-        elif event_type == "custom":
-            events = await crud_custom_event.read_event(session, event_id=[event_id])
-        
-        if len(events) != 1:
-            await interaction.response.send_message(content="Invalid event", ephemeral=True)
-            return False
+    # acknowledge before touching the database
+    await interaction.response.defer()
+    observe_ack(interaction, "private")
 
-        event = events[0]
+    event_type = str(event_data.split(":")[0])
+    event_id = int(event_data.split(":")[1])
+    event = await _resolve_event(event_type, event_id)
+    if event is None:
+        await interaction.followup.send(content="Invalid event", ephemeral=True)
+        return None
 
-        updated = None
+    # flipped by the database, the catalog on this replica may be a check behind
+    updated = None
+    async with get_db() as session:
         if event_type == "event":
-            updated = await crud_event.update_event(session, event_id=event.event_id, private=not event.is_private)
+            updated = await crud_event.toggle_event_private(session, event.event_id)
         elif event_type == "custom":
-            updated = await crud_custom_event.update_event(session, event_id=event.event_id, private=not event.is_private)
-
-        if updated is None:
-            await interaction.response.send_message(
-                content=(
-                    f"Failed to update privacy: database update failed for event_id={event.event_id}"
-                ),
-                ephemeral=True,
-            )
-            return False
-
-        logger.info(
-            f"User {interaction.user.display_name}(id={interaction.user.id}) set event {event.title}(id={event_id}) private={event.is_private}"
+            updated = await crud_custom_event.toggle_event_private(session, event.event_id)
+
+    if updated is None:
+        await interaction.followup.send(
+            content=(
+                f"Failed to update privacy: database update failed for event_id={event.event_id}"
+            ),
+            ephemeral=True,
         )
-        return True
\ No newline at end of file
+        return None
+
+    # the catalog entry was refreshed in place from the returned row
+    logger.info(
+        "User %s(id=%s) set event %s(id=%s) private=%s", interaction.user.display_name, interaction.user.id, event.title, event_id, updated.is_private
+    )
+    return event
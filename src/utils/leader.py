@@ -0,0 +1,121 @@
+from typing import Callable, List, Optional
+from datetime import datetime
+import asyncio
+import logging
+import os
+import socket
+import time
+
+from src.config import settings
+from src.database.database import get_db
+import src.crud.lease as crud_lease
+
+logger = logging.getLogger(__name__)
+
+# Replicas share the database, so a row in `leases` decides which one runs the
+# CTFtime poll and the jobs that write to Discord on its own (reconcile
+# announcements, reminders, team refresh, workspace pool). The holder renews it
+# every TTL/3; once it stops renewing, a follower takes the row over on its next
+# attempt after expiry, so failover takes at most one TTL plus one retry.
+#
+# Expiry is stored as wall-clock epoch seconds, replicas are assumed to have
+# synchronized clocks. Locally leadership is timed on the monotonic clock from
+# before the renew was sent, so a holder whose renews fail steps down before
+# another replica can see the lease as expired.
+
+SCHEDULER_LEASE = "scheduler"
+CLOCK_MARGIN = 2 # seconds, expiry is stored truncated to the second, plus some skew
+
+LeadershipListener = Callable[[bool], None]
+
+
+def _default_instance_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class LeaderElector:
+    def __init__(self, name:str=SCHEDULER_LEASE, ttl:Optional[int]=None, instance_id:Optional[str]=None):
+        self.name = name
+        self.ttl = max(settings.LEASE_TTL_SECONDS if ttl is None else ttl, 3 * CLOCK_MARGIN)
+        self.instance_id = instance_id or settings.INSTANCE_ID or _default_instance_id()
+        self._valid_until = 0.0 # monotonic
+        self._was_leader = False
+        self._task:Optional[asyncio.Task] = None
+        self._listeners:List[LeadershipListener] = []
+
+    @property
+    def is_leader(self) -> bool:
+        return time.monotonic() < self._valid_until
+
+    def add_listener(self, listener:LeadershipListener):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener:LeadershipListener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self):
+        leader = self.is_leader
+        if leader == self._was_leader:
+            return
+        self._was_leader = leader
+        logger.info("%s %s the %s lease", self.instance_id, "acquired" if leader else "lost", self.name)
+        for listener in list(self._listeners):
+            try:
+                listener(leader)
+            except Exception as e:
+                logger.error("Leadership listener failed: %s", e)
+
+    async def try_acquire(self) -> bool:
+        """One acquire/renew attempt, updates is_leader."""
+        sent = time.monotonic()
+        async with get_db() as session:
+            acquired = await crud_lease.acquire_lease(
+                session, self.name, self.instance_id,
+                now=int(datetime.now().timestamp()), ttl=self.ttl,
+            )
+        if acquired:
+            self._valid_until = sent + self.ttl - CLOCK_MARGIN
+        elif self.is_leader:
+            # someone else holds the row, the lease was lost while we were not looking
+            self._valid_until = 0.0
+        self._notify()
+        return acquired
+
+    async def _run(self):
+        while True:
+            try:
+                await self.try_acquire()
+            except Exception as e:
+                logger.error("Lease attempt failed: %s", e)
+            # renew well inside the TTL, followers retry a little more often than that
+            interval = self.ttl / 3 if self.is_leader else self.ttl / 6
+            if self.is_leader:
+                interval = min(interval, max(self._valid_until - time.monotonic() - 1, 0.5))
+            await asyncio.sleep(interval)
+            # a missed renew deadline is a lost lease even before the next attempt returns
+            self._notify()
+
+    async def start(self):
+        """First attempt inline, so jobs started right after already see the result."""
+        if not (self._task is None):
+            return
+        try:
+            await self.try_acquire()
+        except Exception as e:
+            logger.error("Lease attempt failed: %s", e)
+        self._task = asyncio.create_task(self._run(), name="leader-election")
+
+    async def stop(self):
+        """Stop renewing and hand the lease over without waiting for it to expire."""
+        if not (self._task is None):
+            self._task.cancel()
+            self._task = None
+        if self.is_leader:
+            self._valid_until = 0.0
+            async with get_db() as session:
+                await crud_lease.release_lease(session, self.name, self.instance_id)
+            self._notify()
+
+
+leader = LeaderElector()
@@ -0,0 +1,159 @@
+from typing import Dict, Optional, Tuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+
+# Logging off the event loop: callers only run the filters below and a put_nowait,
+# formatting and writing happen on the QueueListener thread. Records keep their
+# %-style args until then, so a suppressed or filtered record is never formatted.
+
+TEXT_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+CONTEXT_FIELDS = ("event_id", "guild_id")
+
+# None rather than a shared {} default, every log_context() block sets a fresh dict
+_log_context:ContextVar[Optional[Dict[str, object]]] = ContextVar("log_context", default=None)
+
+
+@contextmanager
+def log_context(**fields):
+    """Attach fields such as event_id/guild_id to every record logged inside the block."""
+    token = _log_context.set({**(_log_context.get() or {}), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    # runs in the caller, the contextvar is not visible from the writer thread
+    def filter(self, record:logging.LogRecord) -> bool:
+        for key, value in (_log_context.get() or {}).items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """Let through at most `limit` records per (logger, template, level) in each `window` seconds."""
+
+    def __init__(self, limit:int, window:float):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self._buckets:Dict[Tuple[str, object, int], list] = {} # key -> [window start, count]
+
+    def filter(self, record:logging.LogRecord) -> bool:
+        if self.limit <= 0 or record.levelno >= logging.ERROR:
+            return True
+        # the unformatted template, f-string messages only collapse when identical
+        key = (record.name, record.msg, record.levelno)
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None or now - bucket[0] >= self.window:
+            suppressed = bucket[1] - self.limit if bucket is not None and bucket[1] > self.limit else 0
+            self._buckets[key] = [now, 1]
+            if len(self._buckets) > 4096:
+                self._prune(now)
+            if suppressed > 0:
+                record.suppressed = suppressed
+            return True
+        bucket[1] += 1
+        return bucket[1] <= self.limit
+
+    def _prune(self, now:float):
+        for key in [key for key, bucket in self._buckets.items() if now - bucket[0] >= self.window]:
+            del self._buckets[key]
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, log_queue:queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record:logging.LogRecord) -> logging.LogRecord:
+        # formatting is left to the writer thread
+        return record
+
+    def enqueue(self, record:logging.LogRecord):
+        if self.dropped:
+            record.dropped = self.dropped
+        try:
+            self.queue.put_nowait(record)
+            self.dropped = 0
+        except queue.Full:
+            # never wait for the writer, a full queue drops and counts instead
+            self.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record:logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key in CONTEXT_FIELDS + ("suppressed", "dropped"):
+            value = getattr(record, key, None)
+            if not (value is None):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record:logging.LogRecord) -> str:
+        message = super().format(record)
+        fields = [f"{key}={getattr(record, key)}" for key in CONTEXT_FIELDS if not (getattr(record, key, None) is None)]
+        suppressed = getattr(record, "suppressed", None)
+        if suppressed:
+            fields.append(f"(+{suppressed} similar suppressed)")
+        dropped = getattr(record, "dropped", None)
+        if dropped:
+            fields.append(f"({dropped} records dropped before this one)")
+        return f"{message} | {' '.join(fields)}" if fields else message
+
+
+_listener:Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(level:str="INFO", fmt:str="text", rate_limit:int=20, rate_window:float=60, queue_size:int=10000):
+    """Route the root logger through a bounded queue drained by a writer thread."""
+    global _listener
+    if not (_listener is None):
+        return
+
+    stream = logging.StreamHandler(sys.stderr)
+    stream.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter(TEXT_FORMAT, DATE_FORMAT))
+
+    log_queue:queue.Queue = queue.Queue(maxsize=queue_size)
+    handler = _NonBlockingQueueHandler(log_queue)
+    handler.addFilter(ContextFilter())
+    handler.addFilter(RateLimitFilter(rate_limit, rate_window))
+
+    root = logging.getLogger()
+    for old in list(root.handlers):
+        root.removeHandler(old)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Flush what is queued and stop the writer thread."""
+    global _listener
+    if not (_listener is None):
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,109 @@
+from typing import Dict, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import logging
+import time
+
+import discord
+
+from src.config import settings
+from src.utils.metrics import MEMBER_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+# MEMBER_CACHE=lazy runs without the members intent: guilds are never chunked and
+# py-cord keeps only the bot's own member. Members come from the interaction
+# payload, which is always current, or from fetch_member into a small LRU. No
+# member update events arrive in that mode, so LRU entries also expire after
+# MEMBER_CACHE_TTL seconds. With MEMBER_CACHE=full the guild cache answers first
+# and the LRU is only reached for members not seen yet.
+
+MEMBER_CACHE_TTL = 300
+
+MemberKey = Tuple[int, int] # (guild_id, user_id)
+
+
+class MemberResolver:
+    def __init__(self, maxsize:int):
+        self.maxsize = maxsize
+        self._members:OrderedDict = OrderedDict() # key -> (member, fetched_at)
+        self._pending:Dict[MemberKey, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def _put(self, member:discord.Member):
+        key = (member.guild.id, member.id)
+        self._members[key] = (member, time.monotonic())
+        self._members.move_to_end(key)
+        while len(self._members) > self.maxsize:
+            self._members.popitem(last=False)
+
+    def _get(self, key:MemberKey) -> Optional[discord.Member]:
+        cached = self._members.get(key)
+        if cached is None:
+            return None
+        member, fetched_at = cached
+        if time.monotonic() - fetched_at > MEMBER_CACHE_TTL:
+            del self._members[key]
+            return None
+        self._members.move_to_end(key)
+        return member
+
+    def forget(self, guild_id:int, user_id:Optional[int]=None):
+        if user_id is None:
+            for key in [key for key in self._members if key[0] == guild_id]:
+                del self._members[key]
+        else:
+            self._members.pop((guild_id, user_id), None)
+
+    async def resolve(
+        self,
+        guild:discord.Guild,
+        user_id:int,
+        member:Optional[discord.Member]=None,
+    ) -> Optional[discord.Member]:
+        """Member of guild by id; `member` is the interaction's own member, used when it matches."""
+        if isinstance(member, discord.Member) and member.guild.id == guild.id and member.id == user_id:
+            MEMBER_LOOKUPS.labels("payload").inc()
+            self._put(member)
+            return member
+
+        cached = guild.get_member(user_id)
+        if cached is not None:
+            MEMBER_LOOKUPS.labels("guild").inc()
+            return cached
+
+        key = (guild.id, user_id)
+        cached = self._get(key)
+        if cached is not None:
+            MEMBER_LOOKUPS.labels("lru").inc()
+            return cached
+
+        # concurrent approvals for one member share a single request
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            try:
+                fetched = await guild.fetch_member(user_id)
+                MEMBER_LOOKUPS.labels("fetch").inc()
+                self._put(fetched)
+            except discord.NotFound:
+                MEMBER_LOOKUPS.labels("missing").inc()
+                fetched = None
+            except discord.HTTPException as e:
+                logger.error("Failed to fetch member %s of guild %s: %s", user_id, guild.id, e)
+                fetched = None
+            future.set_result(fetched)
+            return fetched
+        finally:
+            if not future.done():
+                future.cancel()
+            del self._pending[key]
+
+
+member_resolver = MemberResolver(settings.MEMBER_LRU_SIZE)
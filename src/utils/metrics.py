@@ -0,0 +1,231 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+import math
+import time
+
+from aiohttp import web
+
+from src.utils.event_catalog import event_catalog
+
+# Minimal Prometheus style metrics.
+# Everything runs on the event loop thread, so children are plain objects without
+# locks; a labelled child is created once and cached, an update is a dict lookup
+# and an addition.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value:str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names:Sequence[str], values:Sequence[str], extra:Optional[Tuple[str, str]]=None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if not (extra is None):
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value:float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    TYPE = ""
+
+    def __init__(self, name:str, documentation:str, labelnames:Sequence[str]=(), registry:Optional["Registry"]=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children:Dict[Tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+        (registry or REGISTRY).register(self)
+
+    @abstractmethod
+    def _new_child(self):
+        ...
+
+    def labels(self, *values:str):
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[key] = self._new_child()
+        return child
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        ...
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount:float=1.0):
+        self.value += amount
+
+    def dec(self, amount:float=1.0):
+        self.value -= amount
+
+    def set(self, value:float):
+        self.value = value
+
+
+class Counter(_Metric):
+    TYPE = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount:float=1.0):
+        self._children[()].inc(amount)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+            for key, child in self._children.items()
+        ]
+
+
+class Gauge(Counter):
+    TYPE = "gauge"
+
+    def set(self, value:float):
+        self._children[()].set(value)
+
+    def dec(self, amount:float=1.0):
+        self._children[()].dec(amount)
+
+
+class _HistogramValue:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets:Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1) # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value:float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(_Metric):
+    TYPE = "histogram"
+
+    def __init__(self, name:str, documentation:str, labelnames:Sequence[str]=(),
+                 buckets:Sequence[float]=DEFAULT_BUCKETS, registry:Optional["Registry"]=None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value:float):
+        self._children[()].observe(value)
+
+    def time(self):
+        return self._children[()].time()
+
+    def totals(self) -> Dict[Tuple[str, ...], Tuple[float, int]]:
+        """(sum, count) per label values, for computing deltas over a time window."""
+        return {key: (child.sum, child.count) for key, child in self._children.items()}
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), child.counts, strict=True):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', _format_value(bound)))} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics:Dict[str, _Metric] = {}
+
+    def register(self, metric:_Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+
+    def get(self, name:str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def metrics(self) -> List[_Metric]:
+        return list(self._metrics.values())
+
+    def render(self) -> str:
+        """Text exposition format 0.0.4."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
+
+
+# bot metrics
+CHECK_DURATION = Histogram("ctfeed_check_duration_seconds", "Duration of one event check (task_checks)")
+CHECK_CHANGES = Counter("ctfeed_check_changes_total", "Event changes found by checks", ["change"])
+TRACKED_EVENTS = Gauge("ctfeed_tracked_events", "Events in the event catalog")
+
+CTFTIME_REQUEST_DURATION = Histogram("ctfeed_ctftime_request_seconds", "CTFtime API request latency", ["endpoint"])
+CTFTIME_REQUESTS = Counter("ctfeed_ctftime_requests_total", "CTFtime API requests by response status", ["endpoint", "status"])
+
+DB_QUERY_DURATION = Histogram(
+    "ctfeed_db_query_seconds", "Database statement execution time",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+DB_ERRORS = Counter("ctfeed_db_errors_total", "Database statements that raised")
+
+DISCORD_SEND_FAILURES = Counter("ctfeed_discord_send_failures_total", "Failed Discord messages", ["kind"])
+
+INTERACTION_ACK = Histogram("ctfeed_interaction_ack_seconds", "Time from interaction creation to the bot's acknowledgement", ["handler"])
+INTERACTION_DURATION = Histogram("ctfeed_interaction_handler_seconds", "Interaction handler run time", ["handler"])
+INTERACTION_ERRORS = Counter("ctfeed_interaction_errors_total", "Interaction handlers that raised", ["handler"])
+
+JOIN_DURATION = Histogram("ctfeed_join_seconds", "join_channel run time by outcome", ["outcome"])
+WORKSPACES_CREATED = Counter("ctfeed_workspaces_created_total", "Event workspaces provisioned on join")
+MEMBER_LOOKUPS = Counter("ctfeed_member_lookups_total", "Member resolutions by where the member came from", ["source"])
+
+
+def observe_ack(interaction, handler:str):
+    """Record the ack latency as Discord sees it, measured from the interaction's snowflake."""
+    created = interaction.created_at.timestamp() if interaction.created_at else None
+    if not (created is None):
+        INTERACTION_ACK.labels(handler).observe(max(time.time() - created, 0.0))
+
+
+async def handle_metrics(request:web.Request) -> web.Response:
+    # gauges derived from state are sampled at scrape time instead of on every change
+    TRACKED_EVENTS.set(len(event_catalog))
+    return web.Response(text=REGISTRY.render(), content_type="text/plain", charset="utf-8")
@@ -0,0 +1,217 @@
+from typing import Dict, List, Optional, Tuple
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+
+from src.utils.metrics import REGISTRY, Histogram
+
+logger = logging.getLogger(__name__)
+
+# Opt-in profiling of the event loop, nothing here runs unless a profile is started.
+# A side thread samples the loop thread's stack and the task it is running, asyncio
+# debug mode reports slow callbacks, and histogram deltas give the DB/HTTP breakdown.
+
+IDLE = "<idle>"
+_SELECTOR_FUNCS = {"select", "poll"}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _task_label(task:Optional[asyncio.Task]) -> str:
+    if task is None:
+        return "<callbacks>"
+    coro = task.get_coro()
+    name = getattr(coro, "__qualname__", None) or repr(coro)
+    return f"{name} [{task.get_name()}]"
+
+
+class _SlowCallbackHandler(logging.Handler):
+    # asyncio logs "Executing <Handle ...> took 0.250 seconds" in debug mode
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.records:List[str] = []
+
+    def emit(self, record:logging.LogRecord):
+        message = record.getMessage()
+        if message.startswith("Executing "):
+            self.records.append(message)
+
+
+@dataclass
+class ProfileReport:
+    started_at:datetime
+    duration:float
+    interval:float
+    samples:int = 0
+    stacks:Counter = field(default_factory=Counter) # tuple of frame labels, outermost first
+    tasks:Counter = field(default_factory=Counter)
+    slow_callbacks:List[str] = field(default_factory=list)
+    spans:List[Tuple[str, str, float, int]] = field(default_factory=list) # metric, labels, seconds, count
+
+    def render(self, top:int=30) -> str:
+        lines = [
+            f"CTFeed event loop profile, {self.started_at.isoformat(timespec='seconds')}",
+            f"duration {self.duration:.1f}s, {self.samples} samples every {self.interval * 1000:.0f}ms",
+            "",
+        ]
+        busy = self.samples - self.tasks.get(IDLE, 0)
+        lines.append(f"loop busy {busy / self.samples * 100 if self.samples else 0:.1f}%")
+        lines.append("")
+
+        lines.append("== wall time by task ==")
+        for label, count in self.tasks.most_common(top):
+            lines.append(f"{count * self.interval:8.2f}s {count / self.samples * 100:5.1f}%  {label}")
+        lines.append("")
+
+        self_time:Counter = Counter()
+        total_time:Counter = Counter()
+        for stack, count in self.stacks.items():
+            if stack[-1] == IDLE:
+                continue
+            self_time[stack[-1]] += count
+            for label in set(stack):
+                total_time[label] += count
+        for title, counter in (("== functions by total time ==", total_time), ("== functions by self time ==", self_time)):
+            lines.append(title)
+            for label, count in counter.most_common(top):
+                lines.append(f"{count * self.interval:8.2f}s {count / self.samples * 100:5.1f}%  {label}")
+            lines.append("")
+
+        lines.append("== spans (metric deltas) ==")
+        for metric, labels, seconds, count in self.spans:
+            lines.append(f"{seconds:8.3f}s {count:6d}x  {metric}{labels}")
+        if not self.spans:
+            lines.append("none")
+        lines.append("")
+
+        lines.append(f"== slow callbacks ({len(self.slow_callbacks)}) ==")
+        lines.extend(self.slow_callbacks[:top * 5])
+        lines.append("")
+
+        # flamegraph.pl / speedscope compatible
+        lines.append("== collapsed stacks ==")
+        for stack, count in self.stacks.most_common():
+            lines.append(f"{';'.join(stack)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_totals() -> Dict[str, Dict[Tuple[str, ...], Tuple[float, int]]]:
+    return {metric.name: metric.totals() for metric in REGISTRY.metrics() if isinstance(metric, Histogram)}
+
+
+class LoopProfiler:
+    """Time-boxed sampling profiler for the running event loop, one profile at a time."""
+
+    def __init__(self, interval:float=0.005):
+        self.interval = interval
+        self._stop:Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return not (self._stop is None)
+
+    def stop(self):
+        """End a running profile early, its report is still produced."""
+        if not (self._stop is None):
+            self._stop.set()
+
+    async def run(self, seconds:float, slow_ms:int=100) -> ProfileReport:
+        if self.running:
+            raise RuntimeError("a profile is already running")
+        loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        report = ProfileReport(started_at=datetime.now(), duration=0.0, interval=self.interval)
+
+        # slow callback reporting
+        handler = _SlowCallbackHandler()
+        asyncio_logger = logging.getLogger("asyncio")
+        asyncio_logger.addHandler(handler)
+        # slow callbacks are WARNING records, with LOG_LEVEL=ERROR they would be dropped before the handler
+        asyncio_level = asyncio_logger.level
+        if asyncio_logger.getEffectiveLevel() > logging.WARNING:
+            asyncio_logger.setLevel(logging.WARNING)
+        debug, slow_duration = loop.get_debug(), loop.slow_callback_duration
+        loop.slow_callback_duration = slow_ms / 1000
+        loop.set_debug(True)
+
+        # stack sampling
+        sampling = threading.Event()
+        sampler = threading.Thread(
+            target=self._sample, args=(loop, threading.get_ident(), sampling, report),
+            name="ctfeed-profiler", daemon=True,
+        )
+        before = _histogram_totals()
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=seconds)
+        except TimeoutError:
+            pass
+        finally:
+            sampling.set()
+            # the sampler only reads, joining briefly is enough
+            await asyncio.to_thread(sampler.join, 1.0)
+            report.duration = time.perf_counter() - start
+            loop.set_debug(debug)
+            loop.slow_callback_duration = slow_duration
+            asyncio_logger.removeHandler(handler)
+            asyncio_logger.setLevel(asyncio_level)
+            self._stop = None
+
+        report.slow_callbacks = handler.records
+        after = _histogram_totals()
+        for name, children in after.items():
+            for key, (total, count) in children.items():
+                old_total, old_count = before.get(name, {}).get(key, (0.0, 0))
+                if count > old_count:
+                    metric = REGISTRY.get(name)
+                    labels = ",".join(f"{label}={value}" for label, value in zip(metric.labelnames, key, strict=True))
+                    report.spans.append((name, f"{{{labels}}}" if labels else "", total - old_total, count - old_count))
+        report.spans.sort(key=lambda span: span[2], reverse=True)
+        logger.info(f"Profile finished: {report.samples} samples in {report.duration:.1f}s")
+        return report
+
+    def _sample(self, loop:asyncio.AbstractEventLoop, thread_id:int, done:threading.Event, report:ProfileReport):
+        while not done.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                continue
+            stack = [_frame_label(f) for f, _ in traceback.walk_stack(frame)]
+            stack.reverse()
+            try:
+                task = asyncio.current_task(loop)
+            except RuntimeError:
+                task = None
+            if frame.f_code.co_name in _SELECTOR_FUNCS and task is None:
+                # waiting for I/O in the selector
+                stack.append(IDLE)
+                report.tasks[IDLE] += 1
+            else:
+                report.tasks[_task_label(task)] += 1
+            report.stacks[tuple(stack)] += 1
+            report.samples += 1
+
+
+def describe_tasks(loop:Optional[asyncio.AbstractEventLoop]=None, limit:int=8) -> str:
+    """Every pending task with where it is suspended, for the task inspector."""
+    tasks = sorted(asyncio.all_tasks(loop), key=lambda task: task.get_name())
+    lines = [f"{len(tasks)} tasks, {datetime.now().isoformat(timespec='seconds')}", ""]
+    for task in tasks:
+        lines.append(_task_label(task))
+        for frame in task.get_stack(limit=limit):
+            lines.append(f"    {_frame_label(frame)} line {frame.f_lineno}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+loop_profiler = LoopProfiler()
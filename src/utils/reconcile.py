@@ -0,0 +1,199 @@
+from typing import List, Dict, Any, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from datetime import datetime
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.database.database import get_db
+from src.database.model import Event, EventChange
+from src.utils.ctf_api import fetch_ctf_events, fetch_ctf_event
+from src.utils.event_snapshot import pack_event
+from src.utils.teams import refresh_unfetched_teams
+import src.crud.event as crud_event
+import src.crud.team as crud_team
+import src.crud.event_change as crud_event_change
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReconcileResult:
+    """What one check changed; Event rows hold the values from before the check."""
+    new:List[Dict[str, Any]] = field(default_factory=list) # CTFtime payloads
+    restored:List[Tuple[Event, Dict[str, Any]]] = field(default_factory=list)
+    updated:List[Tuple[Event, Dict[str, Any]]] = field(default_factory=list)
+    removed:List[Event] = field(default_factory=list)
+
+
+def _organizer_ids(event:Optional[Dict[str, Any]]) -> List[int]:
+    return [org["id"] for org in (event or {}).get("organizers") or []]
+
+
+async def _set_organizers(session:AsyncSession, event_id:int, event_api:Dict[str, Any], team_ids:Set[int]):
+    organizers = event_api.get("organizers") or []
+    await crud_team.set_event_organizers(session, event_id, organizers)
+    team_ids.update(org["id"] for org in organizers)
+
+
+async def _restore_event(session:AsyncSession, event:Event, event_api:Dict[str, Any], now:int, team_ids:Set[int]) -> EventChange:
+    """Clear the tombstone of `event` and apply its CTFtime payload, returns the history row."""
+    # the row kept its category_id, so the existing workspace is reattached
+    ntitle = event_api["title"]
+    nstart = datetime.fromisoformat(event_api["start"]).timestamp()
+    nfinish = datetime.fromisoformat(event_api["finish"]).timestamp()
+    delta = crud_event_change.diff_fields(
+        {"title": event.title, "start": int(event.start), "finish": int(event.finish)},
+        {"title": ntitle, "start": int(nstart), "finish": int(nfinish)},
+    )
+    await crud_event.set_event_presence(session, event.event_id, 0, None)
+    await crud_event.update_event(session, event_id=event.event_id,
+                      title=ntitle,
+                      start=nstart,
+                      finish=nfinish,
+                      snapshot=event_api)
+    await _set_organizers(session, event.event_id, event_api, team_ids)
+    return crud_event_change.make_change(event.event_id, crud_event_change.CHANGE_RESTORED, delta, now)
+
+
+async def reconcile_events() -> ReconcileResult:
+    """Bring the events table in line with CTFtime, without touching Discord."""
+    result = ReconcileResult()
+    now = int(datetime.now().timestamp())
+    changes:List[EventChange] = [] # history rows, written once per check
+    team_ids:Set[int] = set() # organizers seen this check, unfetched ones are fetched at the end
+
+    # 1. get new events
+    async with get_db() as session:
+        all_events = await fetch_ctf_events()
+
+        known_events = await crud_event.read_event(session, include_removed=True)
+        known_events_id = { event.event_id: event for event in known_events }
+
+        new_events_db:List[Event] = [] # new events data for database
+        for event in all_events:
+            event_id = event["id"]
+            if event_id in known_events_id:
+                if not (known_events_id[event_id].removed_at is None):
+                    # tombstoned event listed again
+                    result.restored.append((known_events_id[event_id], event))
+            else: # new event
+                new_events_db.append(Event(
+                    event_id=event_id,
+                    title=event["title"],
+                    start=datetime.fromisoformat(event["start"]).timestamp(),
+                    finish=datetime.fromisoformat(event["finish"]).timestamp(),
+                    snapshot=pack_event(event),
+                ))
+
+                result.new.append(event)
+
+        # a tombstone still holds the unique title a new event may reuse
+        new_titles = { event.title for event in new_events_db }
+        stale_tombstones = [ event.event_id for event in known_events if not (event.removed_at is None) and event.title in new_titles ]
+        if len(stale_tombstones) > 0:
+            await crud_event.delete_event(session, event_id=stale_tombstones)
+
+        if len(new_events_db) > 0:
+            await crud_event.create_events(session, new_events_db)
+            for event in new_events_db:
+                changes.append(crud_event_change.make_change(event.event_id, crud_event_change.CHANGE_CREATED, crud_event_change.diff_fields({}, {
+                    "title": event.title, "start": int(event.start), "finish": int(event.finish),
+                }), now))
+
+        for event in result.new:
+            await _set_organizers(session, event["id"], event, team_ids)
+
+        for event, event_api in result.restored:
+            logger.info("Detected: %s (event_id=%s) is listed again", event.title, event.event_id, extra={"event_id": event.event_id})
+            changes.append(await _restore_event(session, event, event_api, now, team_ids))
+
+    # 2. detect updates
+    # - event updates
+    # - event removed
+    live_events = [ event for event in known_events if event.removed_at is None ] + new_events_db
+    # the listing only holds the next 20 upcoming events, tombstones of events that
+    # have not finished are fetched by id so they come back once CTFtime serves them
+    handled = { event.event_id for event, _ in result.restored } | set(stale_tombstones)
+    tombstones = [
+        event for event in known_events
+        if not (event.removed_at is None) and event.finish > now and event.event_id not in handled
+    ]
+    async with get_db() as session:
+        for event in tombstones:
+            _, event_api = await fetch_ctf_event(event.event_id)
+            if event_api is None:
+                continue
+            logger.info("Detected: %s (event_id=%s) is served again", event.title, event.event_id, extra={"event_id": event.event_id})
+            changes.append(await _restore_event(session, event, event_api, now, team_ids))
+            result.restored.append((event, event_api))
+
+        # check events
+        for event in live_events:
+            status, event_api = await fetch_ctf_event(event.event_id)
+            if event_api is None:
+                # only a 404 is a miss, a failed request (timeout, 429, 5xx) says nothing
+                if status != 404:
+                    continue
+
+                missing_count = (event.missing_count or 0) + 1
+                if missing_count < settings.EVENT_REMOVAL_GRACE:
+                    logger.info("Detected: %s (event_id=%s) is missing (%d/%d)", event.title, event.event_id, missing_count, settings.EVENT_REMOVAL_GRACE, extra={"event_id": event.event_id})
+                    await crud_event.set_event_presence(session, event.event_id, missing_count, None)
+                    continue
+
+                # event removed, kept as a tombstone
+                logger.info("Detected: %s (event_id=%s) was removed", event.title, event.event_id, extra={"event_id": event.event_id})
+
+                await crud_event.set_event_presence(session, event.event_id, missing_count, now)
+                changes.append(crud_event_change.make_change(event.event_id, crud_event_change.CHANGE_REMOVED, {}, now))
+                result.removed.append(event)
+            else:
+                if event.missing_count:
+                    await crud_event.set_event_presence(session, event.event_id, 0, None)
+
+                # check update
+                ntitle = event_api["title"]
+                nstart = datetime.fromisoformat(event_api["start"]).timestamp()
+                nfinish = datetime.fromisoformat(event_api["finish"]).timestamp()
+
+                if event.title != ntitle or \
+                    event.start != nstart or event.finish != nfinish:
+                    # update detected
+                    logger.info("Detected: %s (old: %s) (event_id=%s) was updated", ntitle, event.title, event.event_id, extra={"event_id": event.event_id})
+
+                    await crud_event.update_event(session, event_id=event.event_id,
+                                      title=ntitle,
+                                      start=nstart,
+                                      finish=nfinish,
+                                      snapshot=event_api)
+                    changes.append(crud_event_change.make_change(event.event_id, crud_event_change.CHANGE_UPDATED, crud_event_change.diff_fields(
+                        {"title": event.title, "start": int(event.start), "finish": int(event.finish)},
+                        {"title": ntitle, "start": int(nstart), "finish": int(nfinish)},
+                    ), now))
+                    await _set_organizers(session, event.event_id, event_api, team_ids)
+                    result.updated.append((event, event_api))
+                else:
+                    snapshot = await crud_event.read_event_snapshot(session, event.event_id)
+                    if snapshot != event_api:
+                        # keep the stored payload current for joins, no announcement needed
+                        await crud_event.update_event(session, event_id=event.event_id, snapshot=event_api)
+                        if _organizer_ids(snapshot) != _organizer_ids(event_api):
+                            await _set_organizers(session, event.event_id, event_api, team_ids)
+
+        # 3. history
+        await crud_event_change.create_event_changes(session, changes)
+        await crud_event_change.compact_event_changes(
+            session,
+            older_than=now - settings.EVENT_HISTORY_RETENTION_DAYS * 24 * 60 * 60,
+            keep_per_event=settings.EVENT_HISTORY_MAX_PER_EVENT,
+            # only events that got a row this check can be over the cap
+            event_id=list({ change.event_id for change in changes }),
+        )
+
+    # only teams never seen before are fetched, once per check and outside the session;
+    # the ones over the cap stay unfetched and are picked up by the team refresh task
+    await refresh_unfetched_teams(list(team_ids), settings.TEAM_REFRESH_BATCH)
+
+    return result
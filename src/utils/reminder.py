@@ -0,0 +1,137 @@
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+from datetime import datetime
+import asyncio
+import heapq
+import logging
+
+from src.utils.event_catalog import CatalogEntry
+
+logger = logging.getLogger(__name__)
+
+# reminder kinds
+REMIND_START = "start"
+REMIND_FINISH = "finish"
+
+ReminderKey = Tuple[int, str] # (event_id, kind)
+ReminderCallback = Callable[[int, str], Awaitable[None]]
+
+
+@dataclass(order=True)
+class _Reminder:
+    when:float
+    seq:int
+    key:ReminderKey = field(compare=False)
+    cancelled:bool = field(default=False, compare=False)
+
+
+class ReminderScheduler:
+    """Min-heap of reminder deadlines with a single sleeper task.
+
+    Insert is O(log n). Cancel marks the entry and leaves it in the heap; the
+    sleeper drops cancelled entries when they surface, and the heap is rebuilt
+    once they outnumber the live ones, so cancel stays O(log n) amortized.
+    """
+
+    def __init__(self):
+        self._heap:List[_Reminder] = []
+        self._live:Dict[ReminderKey, _Reminder] = {}
+        self._seq = 0
+        self._wakeup = asyncio.Event()
+        self._task:Optional[asyncio.Task] = None
+        self._callback:Optional[ReminderCallback] = None
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def schedule(self, event_id:int, kind:str, when:float):
+        key = (event_id, kind)
+        current = self._live.get(key)
+        if current is not None:
+            if current.when == when:
+                return
+            self._cancel(current)
+
+        self._seq += 1
+        reminder = _Reminder(when=when, seq=self._seq, key=key)
+        self._live[key] = reminder
+        heapq.heappush(self._heap, reminder)
+        if self._heap[0] is reminder:
+            # new earliest deadline, the sleeper has to re-arm
+            self._wakeup.set()
+
+    def cancel(self, event_id:int, kind:Optional[str]=None):
+        kinds = (REMIND_START, REMIND_FINISH) if kind is None else (kind,)
+        for k in kinds:
+            reminder = self._live.get((event_id, k))
+            if reminder is not None:
+                self._cancel(reminder)
+
+    def _cancel(self, reminder:_Reminder):
+        reminder.cancelled = True
+        del self._live[reminder.key]
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._live):
+            self._heap = [r for r in self._heap if not r.cancelled]
+            heapq.heapify(self._heap)
+
+    def sync(self, entry:CatalogEntry, lead:int):
+        """(Re)schedule the reminders of one event from its catalog entry.
+
+        Only deadlines that changed are touched, a catalog reload that leaves an
+        event as it was costs two dict lookups.
+        """
+        deadlines:Dict[str, Optional[float]] = {REMIND_START: None, REMIND_FINISH: None}
+        # reminders go to the info channel, events without a workspace are skipped
+        if entry.event_type == "event" and not (entry.category_id is None) and not (entry.start is None):
+            now = datetime.now().timestamp()
+            if lead > 0 and entry.start - lead > now:
+                deadlines[REMIND_START] = entry.start - lead
+            if entry.finish is not None and entry.finish > now:
+                deadlines[REMIND_FINISH] = entry.finish
+
+        for kind, when in deadlines.items():
+            if when is None:
+                self.cancel(entry.event_id, kind)
+            else:
+                # unchanged deadlines return early in schedule()
+                self.schedule(entry.event_id, kind, when)
+
+    def start(self, callback:ReminderCallback):
+        self._callback = callback
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _pop_due(self, now:float) -> List[ReminderKey]:
+        due = []
+        while self._heap and (self._heap[0].cancelled or self._heap[0].when <= now):
+            reminder = heapq.heappop(self._heap)
+            if reminder.cancelled:
+                continue
+            del self._live[reminder.key]
+            due.append(reminder.key)
+        return due
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            for event_id, kind in self._pop_due(datetime.now().timestamp()):
+                try:
+                    await self._callback(event_id, kind)
+                except Exception as e:
+                    logger.error("Reminder %s for event %s failed: %s", kind, event_id, e)
+
+            timeout = None
+            if self._heap:
+                timeout = max(self._heap[0].when - datetime.now().timestamp(), 0)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except TimeoutError:
+                pass
+
+
+reminder_scheduler = ReminderScheduler()
@@ -0,0 +1,71 @@
+from typing import List
+from datetime import datetime
+import asyncio
+import logging
+
+from src.config import settings
+from src.database.database import get_db
+from src.utils.ctf_api import fetch_team_info
+from src.utils.embed_creator import clear_embed_cache
+import src.crud.team as crud_team
+
+logger = logging.getLogger(__name__)
+
+# concurrent CTFtime team requests
+_FETCH_CONCURRENCY = 5
+# a failed fetch is retried after 15 minutes, doubling up to TEAM_STALE_HOURS, so
+# deleted or broken team pages do not cost requests on every pass
+_RETRY_BASE = 15 * 60
+
+
+def _retry_delay(attempts:int) -> int:
+    return min(_RETRY_BASE * 2 ** min(attempts - 1, 16), settings.TEAM_STALE_HOURS * 60 * 60)
+
+
+async def refresh_teams(team_ids:List[int]) -> int:
+    """Fetch teams from CTFtime into the teams table, returns how many changed."""
+    if len(team_ids) == 0:
+        return 0
+
+    semaphore = asyncio.Semaphore(_FETCH_CONCURRENCY)
+    async def fetch(team_id:int):
+        async with semaphore:
+            return await fetch_team_info(team_id)
+    results = await asyncio.gather(*(fetch(team_id) for team_id in team_ids))
+
+    now = int(datetime.now().timestamp())
+    changed = 0
+    async with get_db() as session:
+        teams = {team.team_id: team for team in await crud_team.read_team(session, team_id=team_ids)}
+        for team_id, (country, name) in zip(team_ids, results, strict=True):
+            if country is None and name is None:
+                # request failed or the team is gone, keep it stale and back off
+                attempts = (teams[team_id].fetch_attempts or 0) + 1 if team_id in teams else 1
+                await crud_team.update_team_retry(session, team_id, attempts, now + _retry_delay(attempts))
+                continue
+            team = teams.get(team_id)
+            if team is not None and (team.country != country or team.name != name):
+                changed += 1
+            await crud_team.update_team(session, team_id, now, name=name, country=country)
+
+    if changed > 0:
+        clear_embed_cache()
+    logger.info("Refreshed %d teams, %d changed", len(team_ids), changed)
+    return changed
+
+
+async def refresh_stale_teams(updated_before:int, limit:int) -> int:
+    now = int(datetime.now().timestamp())
+    async with get_db() as session:
+        teams = await crud_team.read_team(session, updated_before=updated_before, retry_before=now, limit=limit)
+    return await refresh_teams([team.team_id for team in teams])
+
+
+async def refresh_unfetched_teams(team_ids:List[int], limit:int) -> int:
+    """Fetch the teams of `team_ids` only known by name from an event payload, at most `limit`."""
+    if len(team_ids) == 0:
+        return 0
+    now = int(datetime.now().timestamp())
+    async with get_db() as session:
+        teams = await crud_team.read_team(session, team_id=team_ids, updated_before=1, retry_before=now, limit=limit)
+    return await refresh_teams([team.team_id for team in teams])
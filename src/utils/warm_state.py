@@ -0,0 +1,73 @@
+from typing import Optional
+from dataclasses import asdict
+from datetime import datetime
+import asyncio
+import json
+import logging
+import os
+
+from src.config import settings
+from src.utils.event_catalog import event_catalog, CatalogEntry
+from src.utils.embed_creator import export_embed_cache, restore_embed_cache
+from src.utils.join_channel import export_role_map, restore_role_map
+
+logger = logging.getLogger(__name__)
+
+# In-memory state saved across restarts, so the first interactions after a boot are
+# answered before the database and CTFtime have been read. Everything in it is a
+# cache: the database load that follows replaces the catalog, and a missing or
+# unreadable file only means a cold start.
+
+WARM_STATE_VERSION = 3
+
+
+def _collect() -> dict:
+    return {
+        "version": WARM_STATE_VERSION,
+        "saved_at": int(datetime.now().timestamp()),
+        "catalog": [asdict(entry) for entry in event_catalog.all()],
+        "roles": export_role_map(),
+        "embed_cache": export_embed_cache(),
+    }
+
+
+def _write(path:str, state:dict):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+async def save_warm_state(path:Optional[str]=None) -> bool:
+    path = settings.WARM_STATE_PATH if path is None else path
+    if not path:
+        return False
+    # collected on the loop so the snapshot is consistent, written off it
+    state = _collect()
+    try:
+        await asyncio.to_thread(_write, path, state)
+    except Exception as e:
+        logger.error(f"Failed to save warm state: {e}")
+        return False
+    logger.info(f"Saved warm state: {len(state['catalog'])} events")
+    return True
+
+
+def load_warm_state(path:Optional[str]=None) -> bool:
+    path = settings.WARM_STATE_PATH if path is None else path
+    if not path or not os.path.exists(path):
+        return False
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("version") != WARM_STATE_VERSION:
+            logger.info("Ignoring warm state from another version")
+            return False
+        event_catalog.restore(CatalogEntry(**entry) for entry in state["catalog"])
+        restore_role_map(state.get("roles", []))
+        restore_embed_cache(state.get("embed_cache", {}))
+    except Exception as e:
+        logger.error(f"Failed to load warm state: {e}")
+        return False
+    return True
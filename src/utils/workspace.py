@@ -0,0 +1,210 @@
+from typing import Optional, List, Tuple
+import asyncio
+import logging
+
+import discord
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def parse_channel_templates(templates: List[str]) -> List[Tuple[str, str]]:
+    # "name:type" -> (name, type), type defaults to text
+    result = []
+    for template in templates:
+        name, _, kind = template.partition(":")
+        result.append((name.strip(), kind.strip().lower() or "text"))
+    return result
+
+
+async def _create_child_channel(
+    guild: discord.Guild,
+    name: str,
+    kind: str,
+    category: discord.CategoryChannel,
+    overwrites: dict,
+    position: int,
+):
+    if kind == "forum":
+        # Try to create a forum channel; fallback to text
+        try:
+            return await guild.create_forum_channel(name, category=category, overwrites=overwrites, position=position)
+        except Exception as e:
+            logger.warning("Failed to create forum channel, falling back to text channel: %s", e)
+    return await guild.create_text_channel(name, category=category, overwrites=overwrites, position=position)
+
+
+async def create_event_category_with_channels(
+    guild: discord.Guild,
+    name: str,
+    overwrites: dict,
+    templates: Optional[List[str]] = None,
+) -> discord.CategoryChannel:
+    # Create category
+    category = await guild.create_category(name, overwrites=overwrites)
+
+    # Create child channels concurrently, overwrites are applied on creation
+    if templates is None:
+        templates = settings.EVENT_CHANNEL_TEMPLATES
+    await asyncio.gather(*(
+        _create_child_channel(guild, channel_name, kind, category, overwrites, position)
+        for position, (channel_name, kind) in enumerate(parse_channel_templates(templates))
+    ))
+
+    return category
+
+
+# pool of hidden, pre-provisioned workspaces
+class WorkspacePool:
+    """Hidden category+channel sets, each with its own placeholder role.
+
+    A slot is a category named "<prefix>-<n>" that only the bot and the slot
+    role can see. Claiming a slot renames the category and the role, so the
+    event workspace is ready without creating any channel.
+    """
+
+    def __init__(self):
+        self._slots:dict[int, List[Tuple[discord.CategoryChannel, discord.Role]]] = {} # guild_id -> idle slots
+        self._locks:dict[int, asyncio.Lock] = {}
+        self._tasks:set[asyncio.Task] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return settings.WORKSPACE_POOL_SIZE > 0
+
+    def size(self, guild: discord.Guild) -> int:
+        return len(self._slots.get(guild.id, []))
+
+    def _is_pool_name(self, name: str) -> bool:
+        return name.lower().startswith(f"{settings.WORKSPACE_POOL_PREFIX.lower()}-")
+
+    def _slot_role(self, category: discord.CategoryChannel) -> Optional[discord.Role]:
+        for target in category.overwrites:
+            if isinstance(target, discord.Role) and self._is_pool_name(target.name):
+                return target
+        return None
+
+    def _is_complete(self, category: discord.CategoryChannel) -> bool:
+        expected = [name for name, _ in parse_channel_templates(settings.EVENT_CHANNEL_TEMPLATES)]
+        return sorted(ch.name for ch in category.channels) == sorted(expected)
+
+    async def _delete_slot(self, category: discord.CategoryChannel, role: Optional[discord.Role]):
+        try:
+            await asyncio.gather(*(ch.delete(reason="Workspace pool cleanup") for ch in category.channels))
+            await category.delete(reason="Workspace pool cleanup")
+            if role is not None:
+                await role.delete(reason="Workspace pool cleanup")
+        except Exception as e:
+            logger.error("Failed to delete pooled workspace %s: %s", category.name, e)
+
+    async def _discover(self, guild: discord.Guild) -> List[Tuple[discord.CategoryChannel, discord.Role]]:
+        # adopt slots left by a previous run, drop broken ones
+        slots = []
+        for category in guild.categories:
+            if not self._is_pool_name(category.name):
+                continue
+            role = self._slot_role(category)
+            if role is None or not self._is_complete(category):
+                logger.info("Removing broken pooled workspace %s", category.name)
+                await self._delete_slot(category, role)
+                continue
+            slots.append((category, role))
+        return slots
+
+    async def _create_slot(self, guild: discord.Guild, name: str) -> Tuple[discord.CategoryChannel, discord.Role]:
+        role = await guild.create_role(name=name, mentionable=False, hoist=False, reason="Pre-provision event workspace")
+        overwrites = {
+            guild.default_role: discord.PermissionOverwrite(view_channel=False),
+            role: discord.PermissionOverwrite(view_channel=True),
+            guild.me: discord.PermissionOverwrite(view_channel=True),
+        }
+        try:
+            category = await create_event_category_with_channels(guild, name, overwrites)
+        except Exception:
+            await role.delete(reason="Pre-provision event workspace failed")
+            raise
+        return category, role
+
+    async def replenish(self, guild: discord.Guild):
+        """Top the pool up to WORKSPACE_POOL_SIZE and remove extra or broken slots."""
+        lock = self._locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            if guild.id not in self._slots:
+                self._slots[guild.id] = await self._discover(guild)
+            slots = self._slots[guild.id]
+
+            # garbage collect: slots deleted by hand or made stale by template changes
+            alive = []
+            for category, role in slots:
+                if guild.get_channel(category.id) is None or guild.get_role(role.id) is None:
+                    continue
+                if not self._is_complete(category):
+                    await self._delete_slot(category, role)
+                    continue
+                alive.append((category, role))
+            while len(alive) > settings.WORKSPACE_POOL_SIZE:
+                await self._delete_slot(*alive.pop())
+            self._slots[guild.id] = alive
+
+            used = {category.name.lower() for category, _ in alive}
+            n = 0
+            while len(alive) < settings.WORKSPACE_POOL_SIZE:
+                name = f"{settings.WORKSPACE_POOL_PREFIX}-{n}"
+                n += 1
+                if name.lower() in used:
+                    continue
+                try:
+                    alive.append(await self._create_slot(guild, name))
+                except Exception as e:
+                    logger.error("Failed to pre-provision workspace %s: %s", name, e)
+                    return
+                logger.info("Pre-provisioned workspace %s (%d/%d)", name, len(alive), settings.WORKSPACE_POOL_SIZE)
+
+    def forget(self, guild_id: int):
+        self._slots.pop(guild_id, None)
+        self._locks.pop(guild_id, None)
+
+    def replenish_later(self, guild: discord.Guild):
+        task = asyncio.create_task(self.replenish(guild))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def claim(
+        self,
+        guild: discord.Guild,
+        name: str,
+        role_name: str,
+    ) -> Optional[Tuple[discord.CategoryChannel, discord.Role]]:
+        """Take an idle slot and turn it into the workspace `name` guarded by `role_name`.
+
+        Returns None when the pool is disabled, empty, or the rename failed.
+        """
+        if not self.enabled:
+            return None
+        slots = self._slots.get(guild.id)
+        if not slots:
+            self.replenish_later(guild)
+            return None
+
+        category, role = slots.pop()
+        claimed = True
+        try:
+            await asyncio.gather(
+                category.edit(name=name, reason=f"Claim pooled workspace for {name}"),
+                role.edit(name=role_name, reason=f"Claim pooled workspace for {name}"),
+            )
+        except Exception as e:
+            logger.error("Failed to claim pooled workspace %s: %s", category.name, e)
+            await self._delete_slot(category, role)
+            claimed = False
+        finally:
+            self.replenish_later(guild)
+
+        if not claimed:
+            return None
+        logger.info("Claimed pooled workspace for %s", name)
+        return category, role
+
+
+workspace_pool = WorkspacePool()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Per-call cost of get_country_info, compared with rebuilding the flag dict on every call.
+
+usage: python tools/bench_country_flags.py [--calls 200000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils import country_flags
+from src.utils.country_flags import get_country_info
+
+# the previous implementation built a ~150 entry dict literal inside the function
+_LEGACY_CODES = (
+    "CN JP KR TW HK MO IN SG MY TH VN ID PH BD PK LK NP MM KH LA BN MN UZ KZ GB DE FR IT ES NL CH SE NO DK FI BE "
+    "AT PL CZ SK HU RO BG HR RS SI BA ME MK AL GR CY MT PT IE IS LU LI AD SM VA MC RU UA BY LT LV EE MD GE AM AZ "
+    "US CA MX GT BZ SV HN NI CR PA CU JM HT DO PR TT BB GD BR AR CL CO PE VE EC BO PY UY SR GY ZA EG NG KE MA ET "
+    "GH TN DZ LY SD UG TZ ZW ZM MW MZ BW NA SZ LS MG MU SC IL TR IR SA AE IQ SY LB JO PS YE OM QA BH KW AF AU NZ "
+    "FJ PG TO WS VU SB PW FM MH KI TV NR"
+).split()
+
+
+def _legacy_function():
+    entries = "".join(f'        "{code}": "{country_flags._FLAGS[code]}",\n' for code in _LEGACY_CODES)
+    source = (
+        "def legacy_get_country_info(country_code):\n"
+        "    if not country_code:\n"
+        "        return '🌍', '未知'\n"
+        "    country_flags = {\n"
+        f"{entries}"
+        "    }\n"
+        "    code = country_code.upper()\n"
+        "    return country_flags.get(code, '🏳️'), code\n"
+    )
+    namespace = {}
+    exec(source, namespace)
+    return namespace["legacy_get_country_info"]
+
+
+def run(calls:int):
+    legacy = _legacy_function()
+    codes = ["TW", "us", "JPN", "Germany", "XX"]
+    for label, func in (("before", legacy), ("after", get_country_info)):
+        elapsed = timeit.timeit(lambda func=func: [func(code) for code in codes], number=calls // len(codes))
+        print(f"{label:<8} {elapsed / calls * 1e9:8.1f} ns/call")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+    run(args.calls)
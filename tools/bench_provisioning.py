@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Latency benchmark for event workspace provisioning against a mocked Discord HTTP layer.
+
+usage: python tools/bench_provisioning.py [--latency-ms 80] [--rounds 5]
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import sys
+import time
+
+import discord
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for key, value in {
+    "DISCORD_BOT_TOKEN": "bench",
+    "ADMIN_CHANNEL_NAME": "admin",
+    "ANNOUNCEMENT_CHANNEL_NAME": "announcement",
+    "CHECK_INTERVAL_MINUTES": "30",
+    "TIMEZONE": "Asia/Taipei",
+    "DATABASE_URL": "sqlite+aiosqlite:///:memory:",
+}.items():
+    os.environ.setdefault(key, value)
+
+from src.utils.workspace import create_event_category_with_channels  # noqa: E402  settings are read on import
+
+GUILD_ID = 1000
+ROLE_ID = 1001 # the event role, found by name before provisioning in both flows
+_ids = itertools.count(2000)
+
+
+class MockHTTP:
+    def __init__(self, latency:float):
+        self.latency = latency
+        self.calls = 0
+
+    async def request(self, route, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        payload = kwargs.get("json") or {}
+        return {
+            "id": str(next(_ids)),
+            "guild_id": str(GUILD_ID),
+            "type": payload.get("type", 0),
+            "name": payload.get("name", ""),
+            "position": payload.get("position", 0),
+            "parent_id": payload.get("parent_id"),
+            "permission_overwrites": payload.get("permission_overwrites", []),
+        }
+
+
+def make_guild(http:MockHTTP) -> discord.Guild:
+    client = discord.Client()
+    client.http.request = http.request
+    return discord.Guild(
+        data={
+            "id": str(GUILD_ID),
+            "name": "bench",
+            "roles": [
+                {"id": str(GUILD_ID), "name": "@everyone", "permissions": "0", "position": 0, "color": 0, "colors": {"primary_color": 0}, "hoist": False, "managed": False, "mentionable": False},
+                {"id": str(ROLE_ID), "name": "ctf bench", "permissions": "0", "position": 1, "color": 0, "colors": {"primary_color": 0}, "hoist": False, "managed": False, "mentionable": False},
+            ],
+        },
+        state=client._connection,
+    )
+
+
+async def sequential_baseline(guild:discord.Guild, name:str, overwrites:dict):
+    # provisioning as it was before concurrent creation, _ensure_role_permission
+    # included: the event role was granted view_channel again after the channels
+    category = await guild.create_category(name, overwrites=overwrites)
+    await guild.create_text_channel("資訊", category=category)
+    await guild.create_text_channel("聊天", category=category)
+    await guild.create_forum_channel("題目", category=category)
+    await category.set_permissions(guild.get_role(ROLE_ID), view_channel=True)
+    return category
+
+
+async def run(latency_ms:float, rounds:int):
+    http = MockHTTP(latency_ms / 1000)
+    guild = make_guild(http)
+    overwrites = {
+        guild.default_role: discord.PermissionOverwrite(view_channel=False),
+        guild.get_role(ROLE_ID): discord.PermissionOverwrite(view_channel=True),
+    }
+
+    for label, provision in (
+        ("sequential", sequential_baseline),
+        ("concurrent", create_event_category_with_channels),
+    ):
+        http.calls = 0
+        timings = []
+        for i in range(rounds):
+            start = time.perf_counter()
+            await provision(guild, f"bench-{label}-{i}", overwrites)
+            timings.append(time.perf_counter() - start)
+        print(
+            f"{label:<12} mean={sum(timings) / rounds * 1000:8.1f}ms "
+            f"min={min(timings) * 1000:8.1f}ms calls/round={http.calls / rounds:.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency-ms", type=float, default=80)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.latency_ms, args.rounds))
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Cost of one event reconciliation cycle against the fake CTFtime server.
+
+For each dataset size the database is reset, seeded with that many known events
+(all also served by the fake server), and reconcile_events() is run --cycles
+times. Each cycle reports wall time, HTTP requests, DB statements, commits and
+peak RSS. --churn changes or removes a fraction of the served events before
+every cycle to exercise the update/removal paths.
+
+usage: python tools/bench_reconcile.py [--sizes 10,1000,50000] [--cycles 2] [--churn 0]
+                                       [--database sqlite+aiosqlite:///:memory:] [--output bench.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tools"))
+
+
+def _setup_env(database_url:str):
+    # settings are read at import time
+    for key, value in {
+        "DISCORD_BOT_TOKEN": "bench",
+        "ADMIN_CHANNEL_NAME": "admin",
+        "ANNOUNCEMENT_CHANNEL_NAME": "announcement",
+        "CHECK_INTERVAL_MINUTES": "30",
+        "TIMEZONE": "UTC",
+    }.items():
+        os.environ.setdefault(key, value)
+    os.environ["DATABASE_URL"] = database_url
+
+
+class Counters:
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.statements = 0
+        self.commits = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_statement)
+        event.listen(engine.sync_engine, "commit", self._on_commit)
+
+    def _on_statement(self, *args):
+        self.statements += 1
+
+    def _on_commit(self, *args):
+        self.commits += 1
+
+
+def _peak_rss_kb() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=ROOT, text=True).strip()
+    except Exception:
+        return ""
+
+
+async def _reset_database(size:int, dataset):
+    from src.database.database import engine, init_db, get_db
+    from src.database.model import Base, Event, Team, EventOrganizer
+    from src.utils.event_snapshot import pack_event
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await init_db()
+
+    # steady state: every served event is known and every team already fetched
+    now = int(datetime.now().timestamp())
+    events = dataset["events"][:size]
+    async with get_db() as session:
+        session.add_all([
+            Team(team_id=team["id"], name=team["name"], country=team["country"], updated_at=now)
+            for team in dataset["teams"]
+        ])
+        session.add_all([
+            Event(
+                event_id=event["id"],
+                title=event["title"],
+                start=datetime.fromisoformat(event["start"]).timestamp(),
+                finish=datetime.fromisoformat(event["finish"]).timestamp(),
+                snapshot=pack_event(event),
+            )
+            for event in events
+        ])
+        await session.flush()
+        session.add_all([
+            EventOrganizer(event_id=event["id"], team_id=org["id"], position=position)
+            for event in events
+            for position, org in enumerate(event["organizers"])
+        ])
+        await session.commit()
+
+
+def _churn(server, rate:float, rng:random.Random) -> int:
+    changed = 0
+    for event_id in rng.sample(sorted(server.events), k=int(len(server.events) * rate)):
+        if rng.random() < 0.5:
+            server.remove_event(event_id)
+        else:
+            event = dict(server.events[event_id])
+            event["title"] = f"{event['title']} (changed {changed})"
+            server.put_event(event)
+        changed += 1
+    return changed
+
+
+async def run(args:argparse.Namespace):
+    from fake_ctftime import FakeCTFtime, generate_dataset
+    from src.config import settings
+    from src.database.database import engine
+    from src.utils.event_catalog import event_catalog
+    from src.utils.reconcile import reconcile_events
+
+    counters = Counters(engine)
+    rng = random.Random(args.seed)
+    results = []
+    for size in args.sizes:
+        dataset = generate_dataset(size, max(size // 10, 10), seed=args.seed)
+        await _reset_database(size, dataset)
+        event_catalog.load([])
+
+        server = FakeCTFtime(dataset, latency=args.latency_ms / 1000, seed=args.seed)
+        await server.start()
+        settings.CTFTIME_API_URL = server.events_url
+        settings.TEAM_API_URL = server.teams_url
+        try:
+            for cycle in range(1, args.cycles + 1):
+                churned = _churn(server, args.churn, rng) if args.churn > 0 else 0
+                requests, statements, commits = sum(server.requests.values()), counters.statements, counters.commits
+
+                start = time.perf_counter()
+                result = await reconcile_events()
+                elapsed = time.perf_counter() - start
+
+                row = {
+                    "size": size,
+                    "cycle": cycle,
+                    "churned": churned,
+                    "wall_s": round(elapsed, 4),
+                    "http_requests": sum(server.requests.values()) - requests,
+                    "db_statements": counters.statements - statements,
+                    "commits": counters.commits - commits,
+                    "peak_rss_kb": _peak_rss_kb(),
+                    "new": len(result.new),
+                    "updated": len(result.updated),
+                    "removed": len(result.removed),
+                }
+                results.append(row)
+                print(" ".join(f"{key}={value}" for key, value in row.items()), flush=True)
+        finally:
+            await server.stop()
+
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "database": os.environ["DATABASE_URL"],
+        "latency_ms": args.latency_ms,
+        "churn": args.churn,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=lambda value: [int(size) for size in value.split(",")], default=[10, 1000, 50000])
+    parser.add_argument("--cycles", type=int, default=2)
+    parser.add_argument("--churn", type=float, default=0, help="fraction of served events changed or removed before each cycle")
+    parser.add_argument("--latency-ms", type=float, default=0, help="fake CTFtime response latency")
+    parser.add_argument("--database", help="SQLAlchemy URL, defaults to a temporary SQLite file")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _setup_env(args.database or f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        asyncio.run(run(args))
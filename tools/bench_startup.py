@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Cold start cost of the bot, up to the point the gateway would connect.
+
+Every run is a fresh interpreter. A run:
+- imports ctfeed.py and loads the cogs
+- initializes the database and loads the event catalog
+- "logs in"; the login call is replaced by a --login-ms sleep, so no token or
+  network is needed
+
+It reports when a join on the first seeded event could be resolved from memory,
+and the cost of rendering that event's embed.
+
+Modes:
+    sequential  database first, then login (the startup order before overlap)
+    overlapped  cold start: database setup and login run concurrently
+    warm        warm-state snapshot loaded first, the catalog loads after login
+
+usage: python tools/bench_startup.py [--events 1000] [--runs 5] [--login-ms 300] [--output bench.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tools"))
+
+MODES = ("sequential", "overlapped", "warm")
+
+
+def _env(database_url:str, warm_state:str) -> dict:
+    env = dict(os.environ)
+    for key, value in {
+        "DISCORD_BOT_TOKEN": "bench",
+        "ADMIN_CHANNEL_NAME": "admin",
+        "ANNOUNCEMENT_CHANNEL_NAME": "announcement",
+        "CHECK_INTERVAL_MINUTES": "30",
+        "TIMEZONE": "UTC",
+        "LOG_LEVEL": "WARNING",
+    }.items():
+        env.setdefault(key, value)
+    env["DATABASE_URL"] = database_url
+    env["WARM_STATE_PATH"] = warm_state
+    return env
+
+
+async def _child(mode:str, login_ms:float, probe_id:int) -> dict:
+    start = time.perf_counter()
+    sys.argv = ["ctfeed.py"]
+    import ctfeed
+    ctfeed.load_cogs()
+    imported = time.perf_counter()
+
+    from sqlalchemy import event as sa_event
+    from src.database.database import engine
+    from src.utils.event_catalog import event_catalog
+    from src.utils.embed_creator import create_event_embed
+    from src.utils.warm_state import load_warm_state
+    import src.crud.event as crud_event
+    from src.database.database import get_db
+
+    statements = [0]
+    sa_event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.__setitem__(0, statements[0] + 1))
+
+    async def fake_login(token:str):
+        await asyncio.sleep(login_ms / 1000)
+    ctfeed.bot.login = fake_login
+
+    boot = time.perf_counter()
+    first_event = None
+    if mode == "sequential":
+        await ctfeed.load_database()
+        first_event = time.perf_counter()
+        await ctfeed.bot.login("bench")
+        catalog_load = None
+    else:
+        warm = load_warm_state() if mode == "warm" else False
+        if event_catalog.get("event", probe_id) is not None:
+            first_event = time.perf_counter()
+        catalog_load = await ctfeed.startup(warm)
+    # the gateway would connect here
+    ready = time.perf_counter()
+    if first_event is None:
+        first_event = ready
+    if not (catalog_load is None):
+        await catalog_load
+
+    # the first join renders the event embed for the info channel
+    async with get_db() as session:
+        payload = await crud_event.read_event_snapshot(session, probe_id)
+    before = statements[0]
+    render_start = time.perf_counter()
+    await create_event_embed(payload, "bench")
+    render = time.perf_counter() - render_start
+
+    return {
+        "import_s": imported - start,
+        "ready_s": ready - boot,
+        "first_event_s": first_event - boot,
+        "embed_ms": render * 1000,
+        "embed_db_statements": statements[0] - before,
+    }
+
+
+async def _prepare(events:int, warm_state:str) -> int:
+    from bench_reconcile import _reset_database
+    from fake_ctftime import generate_dataset
+    from src.database.database import engine
+    from src.utils.event_catalog import event_catalog
+    from src.utils.embed_creator import create_event_embed
+    from src.utils.warm_state import save_warm_state
+    from src import crud
+
+    dataset = generate_dataset(events, max(events // 10, 10))
+    await _reset_database(events, dataset)
+
+    # what a running bot would have saved: catalog, and embeds rendered for announcements
+    event_catalog.load(await crud.read_all_event())
+    for event in dataset["events"][:200]:
+        await create_event_embed(event, "bench")
+    await save_warm_state(warm_state)
+    await engine.dispose()
+    return dataset["events"][0]["id"]
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=ROOT, text=True).strip()
+    except Exception:
+        return ""
+
+
+def run(args:argparse.Namespace):
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        warm_state = os.path.join(tmp, "warm_state.json")
+        os.environ.update(_env(database_url, warm_state))
+        probe_id = asyncio.run(_prepare(args.events, warm_state))
+
+        results = {}
+        for mode in MODES:
+            rows = []
+            for _ in range(args.runs):
+                output = subprocess.check_output(
+                    [sys.executable, os.path.abspath(__file__), "--child", mode, "--login-ms", str(args.login_ms), "--probe", str(probe_id)],
+                    cwd=ROOT, env=_env(database_url, warm_state if mode == "warm" else ""), text=True,
+                )
+                rows.append(json.loads(output.strip().splitlines()[-1]))
+            summary = {key: round(statistics.median(row[key] for row in rows), 4) for key in rows[0]}
+            results[mode] = summary
+            print(f"{mode:<11} " + " ".join(f"{key}={value}" for key, value in summary.items()), flush=True)
+
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "events": args.events,
+        "login_ms": args.login_ms,
+        "runs": args.runs,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--login-ms", type=float, default=300, help="simulated gateway login time")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--probe", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(_child(args.child, args.login_ms, args.probe))))
+    else:
+        run(args)
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Local stand-in for the CTFtime API, serving generated or recorded fixtures.
+
+Serves the endpoints ctf_api uses:
+    GET /api/v1/events/?limit=&start=&finish=
+    GET /api/v1/events/<id>/
+    GET /api/v1/teams/<id>/
+
+Point the bot (or a benchmark) at it with the printed CTFTIME_API_URL / TEAM_API_URL.
+Latency, 5xx errors and 429 rate limiting can be injected for chaos tests, and
+FakeCTFtime can also be started in-process and mutated between checks.
+
+usage: python tools/fake_ctftime.py [--port 8765] [--events 1000] [--teams 200] [--seed 1]
+                                    [--fixtures data.json] [--dump data.json]
+                                    [--latency-ms 0] [--jitter-ms 0] [--error-rate 0] [--rate-limit-rate 0]
+"""
+
+from typing import Any, Dict, List, Optional
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+import argparse
+import asyncio
+import json
+import random
+
+from aiohttp import web
+
+_COUNTRIES = ["TW", "US", "JP", "KR", "DE", "FR", "GB", "CN", "IN", "SG", "PL", "RU", "IT", "", None]
+
+
+def generate_dataset(events:int, teams:int, seed:int=1, now:Optional[datetime]=None) -> Dict[str, List[Dict[str, Any]]]:
+    """Deterministic events/teams shaped like CTFtime responses, spread over the next 90 days."""
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    team_list = [
+        {"id": team_id, "name": f"team-{team_id}", "country": rng.choice(_COUNTRIES)}
+        for team_id in range(1, teams + 1)
+    ]
+    event_list = []
+    for event_id in range(1, events + 1):
+        start = now + timedelta(minutes=rng.randrange(60, 90 * 24 * 60))
+        duration = timedelta(hours=rng.choice((24, 36, 48, 72)))
+        organizers = rng.sample(team_list, k=min(len(team_list), rng.randint(1, 3)))
+        event_list.append({
+            "id": event_id,
+            "title": f"Fake CTF {event_id}",
+            "start": start.isoformat(timespec="seconds"),
+            "finish": (start + duration).isoformat(timespec="seconds"),
+            "duration": {"days": duration.days, "hours": duration.seconds // 3600},
+            "weight": round(rng.uniform(0, 100), 2),
+            "format": rng.choice(("Jeopardy", "Attack-Defense")),
+            "restrictions": "Open",
+            "url": f"https://fake-ctf-{event_id}.example",
+            "ctftime_url": f"https://ctftime.org/event/{event_id}/",
+            "logo": "",
+            "description": f"Generated event {event_id}",
+            "organizers": [{"id": team["id"], "name": team["name"]} for team in organizers],
+        })
+    return {"events": event_list, "teams": team_list}
+
+
+class FakeCTFtime:
+    def __init__(
+        self,
+        dataset:Dict[str, List[Dict[str, Any]]],
+        latency:float=0.0,
+        jitter:float=0.0,
+        error_rate:float=0.0,
+        rate_limit_rate:float=0.0,
+        seed:int=1,
+    ):
+        self.events:Dict[int, Dict[str, Any]] = {event["id"]: event for event in dataset["events"]}
+        self.teams:Dict[int, Dict[str, Any]] = {team["id"]: team for team in dataset["teams"]}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.requests:Counter = Counter() # route -> count, including failed ones
+        self._rng = random.Random(seed)
+        self._runner:Optional[web.AppRunner] = None
+        self.base_url = ""
+
+    # mutation helpers for chaos tests
+    def remove_event(self, event_id:int) -> Optional[Dict[str, Any]]:
+        return self.events.pop(event_id, None)
+
+    def put_event(self, event:Dict[str, Any]):
+        self.events[event["id"]] = event
+
+    # handlers
+    async def _chaos(self, route:str) -> Optional[web.Response]:
+        self.requests[route] += 1
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            return web.json_response({"error": "rate limited"}, status=429, headers={"Retry-After": "1"})
+        if roll < self.rate_limit_rate + self.error_rate:
+            return web.json_response({"error": "injected failure"}, status=500)
+        return None
+
+    async def list_events(self, request:web.Request) -> web.Response:
+        failure = await self._chaos("events")
+        if failure is not None:
+            return failure
+        limit = int(request.query.get("limit", 100))
+        start = request.query.get("start")
+        finish = request.query.get("finish")
+        events = self.events.values()
+        if start is not None or finish is not None:
+            low = datetime.fromtimestamp(int(start), timezone.utc) if start else None
+            high = datetime.fromtimestamp(int(finish), timezone.utc) if finish else None
+            events = [
+                event for event in events
+                if (low is None or datetime.fromisoformat(event["start"]) >= low)
+                and (high is None or datetime.fromisoformat(event["start"]) <= high)
+            ]
+        events = sorted(events, key=lambda event: event["start"])[:limit]
+        return web.json_response(events)
+
+    async def get_event(self, request:web.Request) -> web.Response:
+        failure = await self._chaos("event")
+        if failure is not None:
+            return failure
+        event = self.events.get(int(request.match_info["event_id"]))
+        if event is None:
+            return web.json_response({"error": "not found"}, status=404)
+        return web.json_response(event)
+
+    async def get_team(self, request:web.Request) -> web.Response:
+        failure = await self._chaos("team")
+        if failure is not None:
+            return failure
+        team = self.teams.get(int(request.match_info["team_id"]))
+        if team is None:
+            return web.json_response({"error": "not found"}, status=404)
+        return web.json_response(team)
+
+    # lifecycle
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/api/v1/events/", self.list_events)
+        app.router.add_get("/api/v1/events/{event_id:\\d+}/", self.get_event)
+        app.router.add_get("/api/v1/teams/{team_id:\\d+}/", self.get_team)
+        return app
+
+    async def start(self, host:str="127.0.0.1", port:int=0) -> str:
+        """Start serving and return the base URL; port 0 picks a free port."""
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @property
+    def events_url(self) -> str:
+        return f"{self.base_url}/api/v1/events/"
+
+    @property
+    def teams_url(self) -> str:
+        return f"{self.base_url}/api/v1/teams/"
+
+
+async def serve(args:argparse.Namespace):
+    if args.fixtures:
+        with open(args.fixtures, encoding="utf-8") as f:
+            dataset = json.load(f)
+    else:
+        dataset = generate_dataset(args.events, args.teams, seed=args.seed)
+    if args.dump:
+        with open(args.dump, "w", encoding="utf-8") as f:
+            json.dump(dataset, f, ensure_ascii=False)
+
+    server = FakeCTFtime(
+        dataset,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+    )
+    await server.start(args.host, args.port)
+    print(f"serving {len(server.events)} events / {len(server.teams)} teams")
+    print(f"CTFTIME_API_URL={server.events_url}")
+    print(f"TEAM_API_URL={server.teams_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--teams", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--fixtures", help="JSON file with {\"events\": [...], \"teams\": [...]} instead of generated data")
+    parser.add_argument("--dump", help="write the served dataset to this JSON file")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0, help="fraction of requests answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0, help="fraction of requests answered with 429")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""In-process fake of the Discord REST/webhook layer and gateway for interaction benchmarks.
+
+FakeDiscord replaces the py-cord HTTP client and the webhook adapter used for
+interaction responses. It records every call, adds latency and enforces per-bucket
+rate limits by delaying requests, and feeds the resulting gateway events
+(CHANNEL_CREATE, GUILD_ROLE_CREATE, ...) back into the connection state so the
+cache behaves like a connected bot. Synthetic component interactions go through
+ConnectionState.parse_interaction_create, the same path as a real gateway event.
+
+The benchmark seeds events, loads the CTFBGTask cog and fires button clicks,
+reporting time-to-ack (interaction callback), time to completion and API calls
+per interaction:
+    join     members click Join on public events
+    private  an admin toggles Set Private/Public
+    approve  members click Join on private events, an admin approves each request
+
+usage: python tools/fake_discord.py [--scenario join] [--interactions 2000] [--events 50] [--members 500] [--member-cache full]
+                                    [--concurrency 50] [--latency-ms 50] [--jitter-ms 20]
+                                    [--bucket-limit 5] [--bucket-window 1] [--output result.json]
+"""
+
+from typing import Any, Dict, List, Optional
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass
+import argparse
+import asyncio
+import contextvars
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+import discord
+from discord.webhook.async_ import async_context
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for key, value in {
+    "DISCORD_BOT_TOKEN": "bench",
+    "ADMIN_CHANNEL_NAME": "admin",
+    "ANNOUNCEMENT_CHANNEL_NAME": "announcement",
+    "CHECK_INTERVAL_MINUTES": "30",
+    "TIMEZONE": "Asia/Taipei",
+    "DATABASE_URL": "sqlite+aiosqlite:///:memory:",
+}.items():
+    os.environ.setdefault(key, value)
+
+APPLICATION_ID = 900
+BOT_USER_ID = 901
+TIMESTAMP = "2025-01-01T00:00:00+00:00"
+
+# token of the interaction whose handler made the current call
+_current_token:contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_token", default=None)
+
+
+@dataclass
+class Call:
+    method:str
+    path:str # route template, e.g. /channels/{channel_id}/messages
+    token:Optional[str]
+    at:float
+    throttled:float # seconds spent waiting for the bucket
+
+
+def user_payload(user_id:int, name:str, bot:bool=False) -> Dict[str, Any]:
+    return {"id": str(user_id), "username": name, "discriminator": "0", "avatar": None, "global_name": None, "bot": bot}
+
+
+def role_payload(role_id:int, name:str, permissions:int=0, position:int=0) -> Dict[str, Any]:
+    return {
+        "id": str(role_id), "name": name, "permissions": str(permissions), "position": position,
+        "color": 0, "colors": {"primary_color": 0}, "hoist": False, "managed": False, "mentionable": False,
+    }
+
+
+class FakeDiscord:
+    def __init__(self, bot:discord.Client, latency:float=0.0, jitter:float=0.0,
+                 bucket_limit:int=0, bucket_window:float=1.0, seed:int=1):
+        self.bot = bot
+        self.state = bot._connection
+        self.latency = latency
+        self.jitter = jitter
+        self.bucket_limit = bucket_limit
+        self.bucket_window = bucket_window
+        self.calls:List[Call] = []
+        self.channels:Dict[int, Dict[str, Any]] = {}
+        self.roles:Dict[int, Dict[str, Any]] = {}
+        self.member_roles:Dict[int, List[str]] = {}
+        self.member_names:Dict[int, str] = {}
+        self.guild_id = 1000
+        self._ids = itertools.count(10_000)
+        self._buckets:Dict[str, deque] = defaultdict(deque)
+        self._rng = random.Random(seed)
+
+    # setup
+    def install(self):
+        self.bot.http.request = self.request
+        async_context.get().request = self.webhook_request
+        self.state.user = discord.ClientUser(state=self.state, data=user_payload(BOT_USER_ID, "ctfeed", bot=True))
+        self.state.application_id = APPLICATION_ID
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def add_guild(self, members:int, text_channels:List[str]) -> discord.Guild:
+        everyone = role_payload(self.guild_id, "@everyone")
+        admin = role_payload(self.next_id(), "admin", permissions=8, position=1)
+        for role in (everyone, admin):
+            self.roles[int(role["id"])] = role
+        for name in text_channels:
+            self._new_channel({"name": name, "type": 0})
+
+        member_payloads = [self._member(BOT_USER_ID, "ctfeed", [admin["id"]], bot=True)]
+        self.admin_id = self.next_id()
+        member_payloads.append(self._member(self.admin_id, "admin", [admin["id"]]))
+        self.member_ids = []
+        for i in range(members):
+            member_id = self.next_id()
+            self.member_ids.append(member_id)
+            member_payloads.append(self._member(member_id, f"member-{i}", []))
+
+        return self.state._add_guild_from_data({
+            "id": str(self.guild_id), "name": "bench", "owner_id": str(self.admin_id),
+            "roles": list(self.roles.values()), "channels": list(self.channels.values()),
+            "members": member_payloads, "member_count": len(member_payloads),
+            "emojis": [], "stickers": [], "features": [], "threads": [],
+        })
+
+    def _member(self, user_id:int, name:str, roles:List[str], bot:bool=False) -> Dict[str, Any]:
+        self.member_roles[user_id] = list(roles)
+        self.member_names[user_id] = name
+        return {"user": user_payload(user_id, name, bot), "roles": list(roles), "joined_at": TIMESTAMP, "deaf": False, "mute": False}
+
+    def _new_channel(self, payload:Dict[str, Any]) -> Dict[str, Any]:
+        channel = {
+            "id": str(self.next_id()), "guild_id": str(self.guild_id),
+            "type": payload.get("type", 0), "name": payload.get("name", ""),
+            "position": payload.get("position", 0), "parent_id": payload.get("parent_id"),
+            "permission_overwrites": payload.get("permission_overwrites", []),
+            "nsfw": False, "topic": None, "rate_limit_per_user": 0, "last_message_id": None,
+            "available_tags": [], "flags": 0,
+        }
+        self.channels[int(channel["id"])] = channel
+        return channel
+
+    def _message(self, channel_id:Any, payload:Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        payload = payload or {}
+        return {
+            "id": str(self.next_id()), "channel_id": str(channel_id), "guild_id": str(self.guild_id),
+            "author": user_payload(BOT_USER_ID, "ctfeed", bot=True), "content": payload.get("content", ""),
+            "embeds": payload.get("embeds", []), "components": payload.get("components", []),
+            "attachments": [], "mentions": [], "mention_roles": [], "mention_everyone": False,
+            "pinned": False, "tts": False, "type": 0, "timestamp": TIMESTAMP, "edited_timestamp": None,
+        }
+
+    # transport
+    async def _delay(self, bucket:Optional[str]) -> float:
+        throttled = 0.0
+        if bucket is not None and self.bucket_limit > 0:
+            window = self._buckets[bucket]
+            while True:
+                now = time.perf_counter()
+                while window and now - window[0] >= self.bucket_window:
+                    window.popleft()
+                if len(window) < self.bucket_limit:
+                    window.append(now)
+                    break
+                wait = self.bucket_window - (now - window[0])
+                throttled += wait
+                await asyncio.sleep(wait)
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return throttled
+
+    async def request(self, route, **kwargs) -> Any:
+        throttled = await self._delay(f"{route.method}:{route.bucket}")
+        self.calls.append(Call(route.method, route.path, _current_token.get(), time.perf_counter(), throttled))
+        return self._respond(route, kwargs.get("json"))
+
+    async def webhook_request(self, route, session, *, payload=None, multipart=None, **kwargs) -> Any:
+        # interaction callbacks and followups are not bucketed with the bot's routes
+        await self._delay(None)
+        token = route.webhook_token
+        self.calls.append(Call(route.method, route.path, token, time.perf_counter(), 0.0))
+        if route.path.endswith("/callback"):
+            return {"interaction": {"id": str(route.webhook_id), "type": 3}}
+        if payload is None and multipart:
+            payload = json.loads(multipart[0]["value"])
+        return self._message(self.channels and next(iter(self.channels)), payload)
+
+    def _respond(self, route, payload:Optional[Dict[str, Any]]) -> Any:
+        method, path, url = route.method, route.path, route.url
+        payload = payload or {}
+        if method == "POST" and path == "/guilds/{guild_id}/channels":
+            channel = self._new_channel(payload)
+            self.state.parse_channel_create(channel)
+            return channel
+        if method == "POST" and path == "/guilds/{guild_id}/roles":
+            role = role_payload(self.next_id(), payload.get("name", "new role"), int(payload.get("permissions") or 0))
+            self.roles[int(role["id"])] = role
+            self.state.parse_guild_role_create({"guild_id": str(self.guild_id), "role": role})
+            return role
+        if method == "PATCH" and path == "/guilds/{guild_id}/roles/{role_id}":
+            role = self.roles[int(url.rsplit("/", 1)[1])]
+            role.update({key: value for key, value in payload.items() if key in ("name", "permissions")})
+            self.state.parse_guild_role_update({"guild_id": str(self.guild_id), "role": role})
+            return role
+        if method == "PATCH" and path == "/channels/{channel_id}":
+            channel = self.channels[int(route.channel_id)]
+            channel.update({key: value for key, value in payload.items() if key in ("name", "position", "parent_id", "permission_overwrites")})
+            self.state.parse_channel_update(channel)
+            return channel
+        if method == "PUT" and path == "/channels/{channel_id}/permissions/{target}":
+            channel = self.channels[int(route.channel_id)]
+            target = url.rsplit("/", 1)[1]
+            overwrites = [ow for ow in channel["permission_overwrites"] if ow["id"] != target]
+            overwrites.append({"id": target, "type": payload.get("type", 0), "allow": str(payload.get("allow", 0)), "deny": str(payload.get("deny", 0))})
+            channel["permission_overwrites"] = overwrites
+            self.state.parse_channel_update(channel)
+            return None
+        if method == "PUT" and path == "/guilds/{guild_id}/members/{user_id}/roles/{role_id}":
+            parts = url.split("/")
+            user_id, role_id = int(parts[-3]), parts[-1]
+            roles = self.member_roles.setdefault(user_id, [])
+            if role_id not in roles:
+                roles.append(role_id)
+            if self.state._intents.members:
+                # member update events need the members intent
+                self.state.parse_guild_member_update({
+                    "guild_id": str(self.guild_id), "user": user_payload(user_id, self.member_names.get(user_id, str(user_id))),
+                    "roles": list(roles), "joined_at": TIMESTAMP,
+                })
+            return None
+        if method == "GET" and path == "/guilds/{guild_id}/members/{member_id}":
+            user_id = int(url.rsplit("/", 1)[1])
+            return {
+                "user": user_payload(user_id, self.member_names[user_id]), "roles": list(self.member_roles[user_id]),
+                "joined_at": TIMESTAMP, "deaf": False, "mute": False,
+            }
+        if method == "POST" and path == "/channels/{channel_id}/messages":
+            return self._message(route.channel_id, payload)
+        return {}
+
+    # interactions
+    def click(self, user_id:int, custom_id:str, channel_id:int) -> str:
+        """Fire a button click from user_id; returns the interaction token."""
+        interaction_id = self.next_id()
+        token = f"token-{interaction_id}"
+        data = {
+            "id": str(interaction_id), "application_id": str(APPLICATION_ID), "type": 3, "token": token, "version": 1,
+            "guild_id": str(self.guild_id), "channel_id": str(channel_id), "locale": "en-US", "app_permissions": "8",
+            "member": {
+                "user": user_payload(user_id, self.member_names[user_id]), "roles": list(self.member_roles.get(user_id, [])),
+                "joined_at": TIMESTAMP, "deaf": False, "mute": False, "permissions": "8" if user_id == self.admin_id else "0",
+            },
+            "data": {"custom_id": custom_id, "component_type": 2},
+            "message": self._message(channel_id, {"content": ""}),
+        }
+        context = contextvars.copy_context()
+        context.run(_current_token.set, token)
+        context.run(self.state.parse_interaction_create, data)
+        return token
+
+
+def _percentile(values:List[float], q:float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+async def _seed_events(count:int, private:bool):
+    from datetime import datetime, timedelta
+    from src.database.database import init_db, get_db
+    from src.database.model import Event
+    from src.utils.event_snapshot import pack_event
+    from src.utils.event_catalog import event_catalog
+    from src import crud
+
+    await init_db()
+    start = datetime.now() + timedelta(days=7)
+    async with get_db() as session:
+        for event_id in range(1, count + 1):
+            payload = {
+                "id": event_id, "title": f"Bench CTF {event_id}",
+                "start": start.isoformat(), "finish": (start + timedelta(days=2)).isoformat(),
+                "duration": {"days": 2, "hours": 0}, "weight": 0, "organizers": [],
+                "url": "", "ctftime_url": "", "format": "Jeopardy", "logo": "", "description": "",
+            }
+            session.add(Event(
+                event_id=event_id, title=payload["title"], is_private=private,
+                start=start.timestamp(), finish=(start + timedelta(days=2)).timestamp(),
+                snapshot=pack_event(payload),
+            ))
+        await session.commit()
+    event_catalog.load(await crud.read_all_event())
+
+
+async def run(args:argparse.Namespace):
+    from discord.ext import commands
+    from src.cogs.bgtask_interactions import CTFBGTask
+    from src.utils.event_views import register_persistent_views
+    from src.utils.interaction_router import JoinButtonId, AnnouncePrivacyButtonId
+
+    # built like ctfeed.py for --member-cache
+    intents = discord.Intents.default()
+    intents.members = args.member_cache == "full"
+    options = {"intents": intents, "chunk_guilds_at_startup": args.member_cache == "full"}
+    if args.member_cache == "lazy":
+        options["member_cache_flags"] = discord.MemberCacheFlags.none()
+    bot = commands.Bot(**options)
+    fake = FakeDiscord(bot, args.latency_ms / 1000, args.jitter_ms / 1000, args.bucket_limit, args.bucket_window, args.seed)
+    fake.install()
+    guild_create = time.perf_counter()
+    guild = fake.add_guild(args.members, ["announcement", "admin"])
+    guild_create = time.perf_counter() - guild_create
+    announcement = discord.utils.get(guild.text_channels, name="announcement")
+    admin_channel = discord.utils.get(guild.text_channels, name="admin")
+
+    await _seed_events(args.events, private=args.scenario == "approve")
+    bot.add_cog(CTFBGTask(bot))
+    register_persistent_views(bot)
+
+    rng = random.Random(args.seed)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    started:Dict[str, float] = {}
+    finished:Dict[str, float] = {}
+
+    async def fire(user_id:int, custom_id:str, channel_id:int) -> str:
+        async with semaphore:
+            before = asyncio.all_tasks()
+            fired_at = time.perf_counter()
+            token = fake.click(user_id, custom_id, channel_id)
+            started[token] = fired_at
+            tasks = asyncio.all_tasks() - before
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            finished[token] = time.perf_counter()
+            return token
+
+    clicks = []
+    for _ in range(args.interactions):
+        event_id = rng.randint(1, args.events)
+        if args.scenario == "private":
+            clicks.append((fake.admin_id, AnnouncePrivacyButtonId("event", event_id).encode(), announcement.id))
+        else:
+            clicks.append((rng.choice(fake.member_ids), JoinButtonId("event", event_id).encode(), announcement.id))
+
+    wall = time.perf_counter()
+    tokens = await asyncio.gather(*(fire(*click) for click in clicks))
+    if args.scenario == "approve":
+        from src.utils.interaction_router import ApproveJoinId
+        approvals = [
+            (fake.admin_id, ApproveJoinId("event", int(custom_id.split(":")[3]), fake.guild_id, user_id).encode(), admin_channel.id)
+            for user_id, custom_id, _ in clicks
+        ]
+        tokens = await asyncio.gather(*(fire(*click) for click in approvals))
+    wall = time.perf_counter() - wall
+
+    by_token = defaultdict(list)
+    for call in fake.calls:
+        if call.token is not None:
+            by_token[call.token].append(call)
+    acks, completions, api_calls = [], [], []
+    for token in tokens:
+        calls = by_token.get(token, [])
+        callbacks = [call.at for call in calls if call.path.endswith("/callback")]
+        if callbacks:
+            acks.append(min(callbacks) - started[token])
+        completions.append(finished[token] - started[token])
+        api_calls.append(len(calls))
+
+    routes = Counter(f"{call.method} {call.path}" for token in tokens for call in by_token.get(token, []))
+    report = {
+        "scenario": args.scenario,
+        "member_cache": args.member_cache,
+        "guild_create_ms": round(guild_create * 1000, 2),
+        "cached_members": len(guild.members),
+        "interactions": len(tokens),
+        "wall_s": round(wall, 3),
+        "ack_ms": {q: round(_percentile(acks, p) * 1000, 2) for q, p in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0))},
+        "done_ms": {q: round(_percentile(completions, p) * 1000, 2) for q, p in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0))},
+        "unacked": len(tokens) - len(acks),
+        "api_calls_per_interaction": round(statistics.mean(api_calls), 2) if api_calls else 0,
+        "throttled_s": round(sum(call.throttled for call in fake.calls), 3),
+        "routes": dict(routes.most_common()),
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenario", choices=("join", "private", "approve"), default="join")
+    parser.add_argument("--interactions", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument("--members", type=int, default=500)
+    parser.add_argument("--member-cache", choices=("full", "lazy"), default="full", help="MEMBER_CACHE mode of the bot")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--bucket-limit", type=int, default=5, help="requests per bucket per window, 0 disables rate limits")
+    parser.add_argument("--bucket-window", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    args = parser.parse_args()
+    asyncio.run(run(args))